@@ -3,6 +3,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_compress import Compress
+from flask_caching import Cache
 from app.config import Config
 import cloudinary
 import os
@@ -14,15 +15,11 @@ db = SQLAlchemy()
 migrate = Migrate()
 login_manager = LoginManager()
 compress = Compress()
+cache = Cache()
 
 # Timezone Việt Nam
 VN_TZ = pytz.timezone('Asia/Ho_Chi_Minh')
 
-# ===== CACHE GLOBAL (TTL) =====
-_CATEGORIES_CACHE = None
-_CACHE_TIMESTAMP = None
-_CACHE_TTL = 300  # 5 phút
-
 
 def create_app(config_class=Config):
     """Factory function để tạo Flask app - Tối ưu cho Render"""
@@ -51,6 +48,15 @@ def create_app(config_class=Config):
     migrate.init_app(app, db)
     login_manager.init_app(app)
     compress.init_app(app)  # ✅ bật nén HTTP
+    cache.init_app(app)  # Page cache (app/page_cache.py)
+
+    # Đếm query SQL + Server-Timing (đăng ký sớm → after_request chạy sau cùng)
+    from app.instrumentation import init_instrumentation
+    init_instrumentation(app)
+
+    # Bảng tổng hợp thống kê đề thi (chỉ đăng ký event khi QUIZ_STATS_SUMMARY bật)
+    from app.quiz_stats import init_quiz_stats
+    init_quiz_stats(app)
 
     # ==================== CLOUDINARY ====================
     cloudinary.config(
@@ -82,35 +88,28 @@ def create_app(config_class=Config):
     # Khởi tạo cấu hình logging, v.v.
     config_class.init_app(app)
 
-    # ==================== CONTEXT PROCESSOR (TTL + per-request g) ====================
+    # ==================== CONTEXT PROCESSOR (cache registry + per-request g) ====================
     @app.context_processor
     def inject_globals():
         """
-        - TTL cache (process-level) 5 phút để tránh query lặp qua nhiều request
-        - Per-request cache bằng g.* để 1 request không query lại
+        - Danh mục / settings lấy từ cache registry (app/cache_registry.py), tự xóa khi model đổi
+        - Per-request cache bằng g.* để 1 request không đọc lại
         """
-        from app.models.settings import get_setting
-        from app.models.product import Category
+        from app.models.settings import get_setting, get_settings, get_settings_group, get_settings_version
+        from app.models.product import get_active_categories
+        from app.page_cache import fragment_version
         from datetime import datetime
-        import time
-
-        global _CATEGORIES_CACHE, _CACHE_TIMESTAMP
 
         # per-request guard
         if not hasattr(g, 'all_categories'):
-            now = time.time()
-            need_refresh = (
-                    _CATEGORIES_CACHE is None or
-                    _CACHE_TIMESTAMP is None or
-                    (now - _CACHE_TIMESTAMP) > _CACHE_TTL
-            )
-            if need_refresh:
-                _CATEGORIES_CACHE = Category.query.filter_by(is_active=True).all()
-                _CACHE_TIMESTAMP = now
-            g.all_categories = _CATEGORIES_CACHE  # dùng cache process-level
+            g.all_categories = get_active_categories()
 
         return {
             'get_setting': get_setting,
+            'get_settings': get_settings,
+            'get_settings_group': get_settings_group,
+            # Nhóm SEO (meta, favicon, OG) cho <head> của base.html
+            'seo_settings': get_settings_group('seo'),
             'site_name': app.config.get('SITE_NAME', 'Briconvn'),
             'all_categories': g.all_categories,
             'current_year': datetime.now().year,
@@ -123,6 +122,12 @@ def create_app(config_class=Config):
             'hotline': get_setting('hotline', '0901.180.094'),
             'contact_email': get_setting('contact_email', 'info@bricon.vn'),
 
+            # ===== FRAGMENT CACHE ({% cache %} trong base.html) =====
+            # settings_version lấy từ DB (đồng bộ giữa worker), categories theo version token
+            'settings_version': '{}:{}'.format(*get_settings_version()),
+            'fragment_version': fragment_version,
+            'fragment_timeout': app.config.get('FRAGMENT_CACHE_TIMEOUT', 300),
+
                     # ===== CACHE BUSTING =====
             'css_version': app.config.get('CSS_VERSION'),
             'js_version': app.config.get('JS_VERSION'),
@@ -276,8 +281,13 @@ def create_app(config_class=Config):
     # ==================== CUSTOM CLI COMMANDS ====================
     @app.cli.command()
     def clear_cache():
-        """Clear categories cache"""
-        clear_categories_cache()
+        """Clear cache registry (categories, settings, ...) + page cache"""
+        from app.cache_registry import clear_all_caches
+        from app.models.settings import clear_settings_cache
+        from app.page_cache import clear_page_cache
+        clear_all_caches()
+        clear_settings_cache()
+        clear_page_cache()
         print("✅ Cache cleared successfully!")
 
     @app.cli.command()
@@ -303,15 +313,6 @@ def create_app(config_class=Config):
 
 # ==================== CLEAR CACHE FUNCTION ====================
 def clear_categories_cache():
-    """Helper function để clear cache khi cần"""
-    global _CATEGORIES_CACHE, _CACHE_TIMESTAMP
-    _CATEGORIES_CACHE = None
-    _CACHE_TIMESTAMP = None
-
-
-# ==================== USER LOADER ====================
-@login_manager.user_loader
-def load_user(user_id):
-    """Load user by ID for Flask-Login"""
-    from app.models.user import User
-    return User.query.get(int(user_id))
\ No newline at end of file
+    """Helper function để clear cache khi cần (commit vào bảng categories đã tự xóa)"""
+    from app.cache_registry import get_cache
+    get_cache('categories').invalidate()
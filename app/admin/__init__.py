@@ -30,6 +30,7 @@ from app.admin.routes import (
     ckeditor,
     roles,
     settings,
+    performance,
 )
 
 
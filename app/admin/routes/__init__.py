@@ -36,6 +36,7 @@ from . import ckeditor          # ✏️ CKEditor Image Upload API
 # ==================== 6. SYSTEM & PERMISSIONS ====================
 from . import roles             # 🔑 Roles & Permissions RBAC
 from . import settings          # ⚙️ System Settings + Sitemap/Robots
+from . import performance       # 📈 SQL/timing theo endpoint + cache stats
 
 
 # ✅ Export để dễ debug và kiểm tra
@@ -56,4 +57,5 @@ __all__ = [
     'ckeditor',
     'roles',
     'settings',
+    'performance',
 ]
\ No newline at end of file
@@ -45,6 +45,7 @@ from app import db
 from app.models.content import Blog
 from app.forms.content import BlogForm
 from app.decorators import permission_required
+from app.pagination import cached_paginate
 from app.admin import admin_bp
 from app.admin.utils.helpers import get_image_from_form
 from flask_login import login_user, logout_user, login_required, current_user
@@ -62,9 +63,8 @@ def blogs():
     - Hiển thị SEO score badge
     """
     page = request.args.get('page', 1, type=int)
-    blogs = Blog.query.order_by(Blog.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    blogs = cached_paginate(Blog.query.order_by(Blog.created_at.desc()),
+                            page=page, per_page=20, estimate=True)
     return render_template('admin/tin_tuc/blogs.html', blogs=blogs)
 
 
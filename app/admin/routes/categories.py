@@ -33,6 +33,7 @@ from app.models.product import Category
 from app.forms.product import CategoryForm
 from app.utils import save_upload_file
 from app.decorators import permission_required
+from app.pagination import cached_paginate
 from app.admin import admin_bp
 
 
@@ -47,9 +48,8 @@ def categories():
     - Hiển thị số lượng sản phẩm trong mỗi category
     """
     page = request.args.get('page', 1, type=int)
-    categories = Category.query.order_by(Category.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    categories = cached_paginate(Category.query.order_by(Category.created_at.desc()),
+                                 page=page, per_page=20, estimate=True)
     return render_template('admin/danh_muc/categories.html', categories=categories)
 
 
@@ -36,6 +36,7 @@ from flask import render_template, request, flash, redirect, url_for
 from app import db
 from app.models.contact import Contact
 from app.decorators import permission_required
+from app.pagination import keyset_paginate
 from app.admin import admin_bp
 
 
@@ -51,9 +52,8 @@ def contacts():
     - Filter: All / Unread / Read
     """
     page = request.args.get('page', 1, type=int)
-    contacts = Contact.query.order_by(Contact.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    contacts = keyset_paginate(Contact.query, [(Contact.created_at, 'desc'), (Contact.id, 'desc')],
+                               page=page, per_page=20, cursor=request.args.get('cursor'))
     return render_template('admin/lien_he/contacts.html', contacts=contacts)
 
 
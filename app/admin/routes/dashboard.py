@@ -7,12 +7,12 @@
 - view_dashboard: Xem dashboard đầy đủ
 """
 
-from flask import render_template, redirect, url_for
+from flask import render_template, redirect, url_for, jsonify
 from flask_login import login_required, current_user
 
-from app.models.product import Product, Category
-from app.models.content import Blog
+from app.models.product import Product
 from app.models.contact import  Contact
+from app.dashboard_metrics import dashboard_metrics, metrics_reconciled_at
 from app.decorators import permission_required
 from app.admin import admin_bp
 
@@ -28,22 +28,32 @@ def dashboard():
     if not current_user.has_any_permission('manage_users', 'manage_products', 'manage_categories'):
         return redirect(url_for('admin.welcome'))
 
-    # Dashboard cho Admin/Editor
-    total_products = Product.query.count()
-    total_categories = Category.query.count()
-    total_blogs = Blog.query.count()
-    total_contacts = Contact.query.filter_by(is_read=False).count()
+    # Dashboard cho Admin/Editor - số liệu từ bộ đếm trong RAM (app/dashboard_metrics.py)
+    metrics = dashboard_metrics()
     recent_products = Product.query.order_by(Product.created_at.desc()).limit(5).all()
     recent_contacts = Contact.query.order_by(Contact.created_at.desc()).limit(5).all()
 
     return render_template('admin/dashboard.html',
-                           total_products=total_products,
-                           total_categories=total_categories,
-                           total_blogs=total_blogs,
-                           total_contacts=total_contacts,
+                           total_products=metrics['products'],
+                           total_categories=metrics['categories'],
+                           total_blogs=metrics['blogs'],
+                           total_contacts=metrics['unread_contacts'],
                            recent_products=recent_products,
                            recent_contacts=recent_contacts)
 
+
+@admin_bp.route('/api/dashboard-metrics')
+@permission_required('view_dashboard')
+def dashboard_metrics_api():
+    """JSON bộ đếm dashboard để poll (không chạy COUNT(*) trừ lúc đối chiếu định kỳ)"""
+    reconciled_at = metrics_reconciled_at()
+    response = jsonify({
+        'metrics': dashboard_metrics(),
+        'reconciled_at': reconciled_at.isoformat() + 'Z' if reconciled_at else None,
+    })
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 # ==================== WELCOME USER ====================
 @admin_bp.route('/welcome')
 @login_required
@@ -56,6 +66,6 @@ def welcome():
     # Lấy số liên hệ chưa đọc (nếu có quyền xem)
     total_contacts = 0
     if current_user.has_any_permission('view_contacts', 'manage_contacts'):
-        total_contacts = Contact.query.filter_by(is_read=False).count()
+        total_contacts = dashboard_metrics()['unread_contacts']
 
     return render_template('admin/auth/welcome.html', total_contacts=total_contacts)
\ No newline at end of file
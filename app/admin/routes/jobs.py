@@ -48,6 +48,7 @@ from app import db
 from app.models.job import Job
 from app.forms.job import JobForm
 from app.decorators import permission_required
+from app.pagination import cached_paginate
 from app.admin import admin_bp
 
 
@@ -62,9 +63,8 @@ def jobs():
     - Badge: Urgent, Expired, Active
     """
     page = request.args.get('page', 1, type=int)
-    jobs = Job.query.order_by(Job.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    jobs = cached_paginate(Job.query.order_by(Job.created_at.desc()),
+                           page=page, per_page=20, estimate=True)
     return render_template('admin/tuyen_dung/jobs.html', jobs=jobs)
 
 
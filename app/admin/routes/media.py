@@ -24,7 +24,11 @@ from werkzeug.utils import secure_filename
 
 from app import db
 from app.models.media import Media
+from app.models.helpers import clear_media_seo_cache
+from app.media_stats import media_stats, seo_bucket_filter
 from app.models.settings import get_setting
+from app.pagination import keyset_paginate
+from app.search_index import ranked_search
 from app.forms import MediaSEOForm
 from app.utils import save_upload_file, delete_file, get_albums
 from app.decorators import permission_required
@@ -41,39 +45,25 @@ def media():
     query = Media.query
     if album_filter:
         query = query.filter_by(album=album_filter)
+    seo_condition = seo_bucket_filter(seo_filter)
+    if seo_condition is not None:
+        query = query.filter(seo_condition)
 
-    media_files = query.order_by(Media.created_at.desc()).paginate(
-        page=page, per_page=12, error_out=False
-    )
-
-    # File: routes.py - bên trong hàm media()
-    query = Media.query
-    if album_filter:
-        query = query.filter_by(album=album_filter)
+    media_files = keyset_paginate(query, [(Media.created_at, 'desc'), (Media.id, 'desc')],
+                                  page=page, per_page=12, cursor=request.args.get('cursor'))
 
-    media_files = query.order_by(Media.created_at.desc()).paginate(
-        page=page, per_page=12, error_out=False
-    )
-
-    albums = get_albums()
-    total_files = Media.query.count()
-    total_size = db.session.query(db.func.sum(Media.file_size)).scalar() or 0
-    total_size_mb = round(total_size / (1024 * 1024), 2)
-
-    seo_stats = {
-        'excellent': db.session.query(Media).filter(Media.seo_score >= 85).count(),
-        'good': db.session.query(Media).filter(Media.seo_score.between(65, 84)).count(),
-        'fair': db.session.query(Media).filter(Media.seo_score.between(50, 64)).count(),
-        'poor': db.session.query(Media).filter(Media.seo_score < 50).count(),
-    }
+    # Tổng file, dung lượng, điểm SEO, album: 1 aggregate, giữ trong RAM
+    stats = media_stats()
 
     return render_template(
         'admin/media/media.html',
         media_files=media_files,
-        albums=albums,
-        total_files=total_files,
-        total_size_mb=total_size_mb,
-        current_album=album_filter
+        albums=stats['albums'],
+        total_files=stats['files'],
+        total_size_mb=stats['size_mb'],
+        seo_stats=stats['seo'],
+        current_album=album_filter,
+        current_seo=seo_filter if seo_condition is not None else ''
     )
 
 
@@ -353,6 +343,8 @@ def bulk_edit_media():
             synchronize_session=False
         )
         db.session.commit()
+        # Bulk update không bắn ORM events → tự xóa memo Media SEO
+        clear_media_seo_cache()
         return jsonify({'success': True, 'message': f'Đã chuyển {updated} file vào album "{album_name}"'})
 
     return jsonify({'success': False, 'message': 'Action không hợp lệ'})
@@ -370,10 +362,17 @@ def api_media():
     query = Media.query
     if album:
         query = query.filter_by(album=album)
-    if search:
-        query = query.filter(Media.original_filename.ilike(f'%{search}%'))
 
-    media_list = query.order_by(Media.created_at.desc()).limit(100).all()
+    if search:
+        # Không dấu, xếp theo độ liên quan (index trong RAM, lọc album sau)
+        media_list = ranked_search(query, Media, search, 100, candidates=1000 if album else None)
+        if not media_list:
+            # Index chỉ khớp tiền tố từng từ → không có kết quả thì tìm chuỗi con trong tên file như trước
+            # (vd '1234' trong 'IMG_1234.jpg')
+            media_list = (query.filter(Media.original_filename.ilike(f'%{search}%'))
+                          .order_by(Media.created_at.desc()).limit(100).all())
+    else:
+        media_list = query.order_by(Media.created_at.desc()).limit(100).all()
 
     albums_data = get_albums()
     album_names = [a['name'] if isinstance(a, dict) else a for a in albums_data]
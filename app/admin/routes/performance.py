@@ -0,0 +1,83 @@
+"""
+📈 Performance Routes
+- Số query SQL, thời gian DB / render / tổng theo endpoint (app/instrumentation.py)
+- Statement lặp nhiều nhất trong 1 request → tìm N+1
+- Thống kê cache registry (hit/miss/eviction)
+- Sampling profiler (PROFILER_ENABLED): lấy mẫu stack N giây → file collapsed stacks cho flamegraph
+
+🔒 Permissions:
+- manage_settings: Xem & reset thống kê, chạy profiler
+"""
+
+from datetime import datetime
+
+from flask import render_template, request, flash, redirect, url_for, current_app, abort, Response
+
+from app.cache_registry import cache_stats
+from app.instrumentation import endpoint_stats, reset_stats, stats_started_at
+from app.profiler import start_profile, profile_status, collapsed_stacks
+from app.search_index import search_index_stats
+from app.decorators import permission_required
+from app.admin import admin_bp
+
+
+# ==================== PERFORMANCE ====================
+@admin_bp.route('/performance')
+@permission_required('manage_settings')
+def performance():
+    """Bảng thống kê hiệu năng theo endpoint (trong RAM của worker hiện tại)"""
+    sort_by = request.args.get('sort', 'queries')
+
+    return render_template('admin/cai_dat/performance.html',
+                           endpoints=endpoint_stats(sort_by=sort_by),
+                           caches=cache_stats(),
+                           search_indexes=search_index_stats(),
+                           sort_by=sort_by,
+                           started_at=datetime.fromtimestamp(stats_started_at()),
+                           profiler_enabled=current_app.config.get('PROFILER_ENABLED', False),
+                           profiler_max_seconds=current_app.config.get('PROFILER_MAX_SECONDS', 60),
+                           profile=profile_status())
+
+
+@admin_bp.route('/performance/reset', methods=['POST'])
+@permission_required('manage_settings')
+def reset_performance():
+    """🔄 Reset thống kê endpoint"""
+    reset_stats()
+    flash('Đã reset thống kê hiệu năng!', 'success')
+    return redirect(url_for('admin.performance'))
+
+
+# ==================== SAMPLING PROFILER ====================
+@admin_bp.route('/performance/profile', methods=['POST'])
+@permission_required('manage_settings')
+def start_profiler():
+    """▶️ Bắt đầu lấy mẫu stack trong N giây"""
+    if not current_app.config.get('PROFILER_ENABLED', False):
+        abort(404)
+
+    max_seconds = current_app.config.get('PROFILER_MAX_SECONDS', 60)
+    seconds = min(max(request.form.get('seconds', 10, type=int), 1), max_seconds)
+    interval_ms = min(max(request.form.get('interval_ms', 10, type=int), 1), 1000)
+
+    if start_profile(duration=seconds, interval=interval_ms / 1000,
+                     all_threads=bool(request.form.get('all_threads'))):
+        flash(f'Đang lấy mẫu {seconds} giây (mỗi {interval_ms}ms)...', 'info')
+    else:
+        flash('Profiler đang chạy, vui lòng đợi phiên hiện tại kết thúc!', 'warning')
+    return redirect(url_for('admin.performance'))
+
+
+@admin_bp.route('/performance/profile.txt')
+@permission_required('manage_settings')
+def download_profile():
+    """⬇️ Collapsed stacks của phiên gần nhất (flamegraph.pl / speedscope.app)"""
+    if not current_app.config.get('PROFILER_ENABLED', False):
+        abort(404)
+
+    started_at = profile_status()['started_at']
+    filename = 'profile-{}.txt'.format(
+        datetime.fromtimestamp(started_at).strftime('%Y%m%d-%H%M%S') if started_at else 'empty'
+    )
+    return Response(collapsed_stacks(), mimetype='text/plain',
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
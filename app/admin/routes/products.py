@@ -14,6 +14,7 @@ from app import db
 from app.models.product import Product
 from app.forms.product import ProductForm
 from app.decorators import permission_required
+from app.pagination import cached_paginate
 from app.admin import admin_bp
 from app.admin.utils.helpers import get_image_from_form
 
@@ -23,9 +24,8 @@ from app.admin.utils.helpers import get_image_from_form
 def products():
     """Danh sách sản phẩm"""
     page = request.args.get('page', 1, type=int)
-    products = Product.query.order_by(Product.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    products = cached_paginate(Product.query.order_by(Product.created_at.desc()),
+                               page=page, per_page=20, estimate=True)
     return render_template('admin/san_pham/products.html', products=products)
 
 
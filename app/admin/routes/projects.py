@@ -33,6 +33,7 @@ from app import db
 from app.models.media import Project
 from app.forms.media import ProjectForm
 from app.decorators import permission_required
+from app.pagination import cached_paginate
 from app.admin import admin_bp
 from app.admin.utils.helpers import get_image_from_form
 
@@ -48,9 +49,8 @@ def projects():
     - Badge "Featured" cho dự án nổi bật
     """
     page = request.args.get('page', 1, type=int)
-    projects = Project.query.order_by(Project.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    projects = cached_paginate(Project.query.order_by(Project.created_at.desc()),
+                               page=page, per_page=20, estimate=True)
     return render_template('admin/du_an/projects.html', projects=projects)
 
 
@@ -15,6 +15,8 @@ from flask_login import current_user
 from app import db
 from app.models.quiz import Quiz, Question, Answer, QuizAttempt, UserAnswer
 from app.decorators import permission_required
+from app.pagination import cached_paginate, keyset_paginate
+from app.quiz_stats import quiz_stats as get_quiz_stats
 from app.admin import admin_bp
 from datetime import datetime
 from sqlalchemy import func
@@ -38,11 +40,10 @@ def quizzes():
     if search:
         query = query.filter(Quiz.title.ilike(f'%{search}%'))
 
-    quizzes = query.order_by(Quiz.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    quizzes = cached_paginate(query.order_by(Quiz.created_at.desc()), page=page, per_page=20)
 
-    # Thống kê cho mỗi quiz
+    # Thống kê cả trang trong 1 query GROUP BY (app/quiz_stats.py)
+    stats_by_quiz = get_quiz_stats([quiz.id for quiz in quizzes.items])
     quiz_stats = []
     for quiz in quizzes.items:
         # ✨ QR_CACHE: QUAN TRỌNG - Tạo/Update QR code cache tại đây
@@ -51,15 +52,7 @@ def quizzes():
         quiz_url = url_for('main.quiz_take', slug=quiz.slug, _external=True)
         quiz.generate_or_get_qr_code(quiz_url)
 
-        stats = {
-            'quiz': quiz,
-            'total_questions': quiz.questions.count(),
-            'total_attempts': quiz.attempts.count(),
-            'completed_attempts': quiz.attempts.filter_by(is_completed=True).count(),
-            'pass_rate': quiz.get_pass_percentage(),
-            'avg_score': quiz.get_average_score()
-        }
-        quiz_stats.append(stats)
+        quiz_stats.append({'quiz': quiz, **stats_by_quiz[quiz.id]})
 
     return render_template('admin/trac_nghiem/quizzes.html',
                            quizzes=quizzes,
@@ -349,9 +342,8 @@ def results():
     elif status == 'failed':
         query = query.filter_by(passed=False)
 
-    attempts = query.order_by(QuizAttempt.completed_at.desc()).paginate(
-        page=page, per_page=30, error_out=False
-    )
+    attempts = keyset_paginate(query, [(QuizAttempt.completed_at, 'desc'), (QuizAttempt.id, 'desc')],
+                               page=page, per_page=30, cursor=request.args.get('cursor'))
 
     quizzes = Quiz.query.filter_by(is_active=True).all()
 
@@ -200,6 +200,8 @@ def edit_role_permissions(id):
             if perm:
                 role.add_permission(perm)
 
+        # Bỏ hết quyền cũng phải bump updated_at để cache quyền được làm mới
+        role.touch_permissions()
         db.session.commit()
 
         flash(f'Đã cập nhật quyền cho vai trò "{role.display_name}"', 'success')
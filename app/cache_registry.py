@@ -0,0 +1,232 @@
+"""
+Registry các cache process-level có tên (TTL + LRU + invalidation theo model)
+
+- Mỗi cache: TTL, số entry tối đa (LRU), bộ đếm hit/miss/eviction/invalidation
+- Gắn với bảng (model): session commit có ghi vào bảng → cache bị xóa ngay trong process
+- Worker khác tự đồng bộ khi hết TTL
+
+Usage:
+    featured_products_cache = register_cache('featured_products', ttl=300, models=(Product,))
+
+    products = featured_products_cache.get_or_load(
+        'home', lambda: load_detached(lambda s: s.query(Product).filter_by(...).all())
+    )
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+
+_REGISTRY = {}
+_REGISTRY_LOCK = threading.Lock()
+
+# Callback nhận set tên bảng sau mỗi commit (page cache, ...)
+_COMMIT_LISTENERS = []
+
+_DIRTY_TABLES_KEY = 'cache_registry_dirty_tables'
+_MISSING = object()
+
+
+class NamedCache:
+    """Cache dict có TTL + LRU, an toàn giữa các thread"""
+
+    def __init__(self, name, ttl=300, max_size=128, tables=(), ttl_config=None):
+        self.name = name
+        self.default_ttl = ttl
+        self.ttl_config = ttl_config
+        self.max_size = max_size
+        self.tables = frozenset(tables)
+
+        self._entries = OrderedDict()  # {key: (expires_at, value)}
+        self._lock = threading.Lock()
+        # Tăng mỗi lần invalidate → loader chạy trước đó không được ghi đè giá trị cũ vào
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def ttl(self):
+        """TTL (giây), đọc từ app.config nếu có ttl_config"""
+        if self.ttl_config:
+            from flask import current_app, has_app_context
+            if has_app_context():
+                return current_app.config.get(self.ttl_config, self.default_ttl)
+        return self.default_ttl
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        """Lấy từ cache, miss thì gọi loader() (ngoài lock) rồi lưu lại"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        generation = self._generation
+        value = loader()
+        self.set(key, value, generation=generation)
+        return value
+
+    def invalidate(self, key=None):
+        """Xóa 1 key hoặc toàn bộ cache"""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'name': self.name,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'tables': sorted(self.tables),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits * 100 / total, 1) if total else 0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+
+# ==================== REGISTRY ====================
+def register_cache(name, ttl=300, max_size=128, models=(), ttl_config=None):
+    """
+    Tạo (hoặc lấy lại) cache có tên
+
+    Args:
+        name: Tên duy nhất (hiển thị trong thống kê)
+        ttl: Số giây giữ entry (mặc định nếu không có ttl_config)
+        max_size: Số entry tối đa, vượt thì bỏ entry ít dùng nhất (LRU)
+        models: Model class hoặc tên bảng; commit ghi vào bảng → xóa cache
+        ttl_config: Key trong app.config để override ttl
+    """
+    tables = {getattr(model, '__tablename__', model) for model in models}
+    with _REGISTRY_LOCK:
+        cache = _REGISTRY.get(name)
+        if cache is None:
+            cache = _REGISTRY[name] = NamedCache(name, ttl=ttl, max_size=max_size,
+                                                 tables=tables, ttl_config=ttl_config)
+        return cache
+
+
+def get_cache(name):
+    return _REGISTRY[name]
+
+
+def clear_all_caches():
+    """Xóa toàn bộ cache trong registry (CLI clear-cache)"""
+    for cache in list(_REGISTRY.values()):
+        cache.invalidate()
+
+
+def cache_stats():
+    """Thống kê tất cả cache (sắp theo tên)"""
+    return [cache.stats() for _, cache in sorted(_REGISTRY.items())]
+
+
+def invalidate_tables(tables):
+    """Xóa các cache gắn với bất kỳ bảng nào trong `tables`"""
+    tables = set(tables)
+    for cache in list(_REGISTRY.values()):
+        if cache.tables & tables:
+            cache.invalidate()
+
+
+def on_tables_committed(callback):
+    """Đăng ký callback(tables) chạy sau mỗi commit có ghi dữ liệu"""
+    _COMMIT_LISTENERS.append(callback)
+    return callback
+
+
+def uncommitted_tables(session=None):
+    """Bảng đã flush nhưng chưa commit trong session - dữ liệu đọc từ đó không nên đưa vào cache"""
+    session = session if session is not None else db.session()
+    return session.info.get(_DIRTY_TABLES_KEY, set())
+
+
+def load_detached(query_fn):
+    """
+    Chạy query trong Session riêng rồi đóng → object đã load đủ, detached,
+    dùng chung giữa các request mà không bị expire khi request sau commit
+
+    Usage:
+        load_detached(lambda s: s.query(Category).filter_by(is_active=True).all())
+    """
+    session = db.session.session_factory()
+    try:
+        return query_fn(session)
+    finally:
+        session.close()
+
+
+# ==================== MODEL-CHANGE EVENTS ====================
+def _mark_dirty(session, tables):
+    session.info.setdefault(_DIRTY_TABLES_KEY, set()).update(tables)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    tables = {
+        obj.__table__.name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if hasattr(obj, '__table__')
+    }
+    if tables:
+        _mark_dirty(session, tables)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_tables(orm_execute_state):
+    """Bulk UPDATE/INSERT/DELETE (Query.update, db.update(Model) executemany...)"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_insert or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        _mark_dirty(orm_execute_state.session, {mapper.local_table.name})
+
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch_committed_tables(session):
+    tables = session.info.pop(_DIRTY_TABLES_KEY, None)
+    if not tables:
+        return
+    invalidate_tables(tables)
+    for callback in _COMMIT_LISTENERS:
+        callback(tables)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_dirty_tables(session):
+    session.info.pop(_DIRTY_TABLES_KEY, None)
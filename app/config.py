@@ -55,6 +55,12 @@ class Config:
     # ===== PAGINATION =====
     POSTS_PER_PAGE = 12
     BLOGS_PER_PAGE = 9
+    # Tổng số dòng của trang danh sách (app/counts.py): cache theo (bảng, filter), xóa khi bảng đổi
+    COUNT_CACHE_TTL = int(os.environ.get('COUNT_CACHE_TTL', 300))
+    # PostgreSQL: bảng không filter dùng ước lượng pg_class.reltuples thay cho COUNT(*)
+    # khi ước lượng >= COUNT_ESTIMATE_MIN_ROWS (bảng nhỏ vẫn đếm chính xác)
+    COUNT_ESTIMATE_ENABLED = os.environ.get('COUNT_ESTIMATE_ENABLED', 'false').lower() == 'true'
+    COUNT_ESTIMATE_MIN_ROWS = int(os.environ.get('COUNT_ESTIMATE_MIN_ROWS', 100000))
 
     # ===== SEO =====
     SITE_NAME = 'Briconvn'
@@ -85,6 +91,52 @@ class Config:
     # ===== CACHING =====
     CACHE_TYPE = 'simple'
     CACHE_DEFAULT_TIMEOUT = 300
+    # Số entry tối đa của SimpleCache (trang + fragment), vượt → xóa bớt entry cũ / hết hạn
+    CACHE_THRESHOLD = int(os.environ.get('CACHE_THRESHOLD', 500))
+    # Settings snapshot: số giây giữa 2 lần so version với DB (đồng bộ giữa các worker)
+    SETTINGS_CACHE_CHECK_INTERVAL = int(os.environ.get('SETTINGS_CACHE_CHECK_INTERVAL', 5))
+    # Flask-Login identity cache (user + role + permissions): số giây giữ trong RAM
+    LOGIN_IDENTITY_CACHE_TTL = int(os.environ.get('LOGIN_IDENTITY_CACHE_TTL', 30))
+    # Memo image URL → Media SEO (alt/title/caption), xóa ngay khi Media đổi trong process
+    MEDIA_SEO_CACHE_TTL = int(os.environ.get('MEDIA_SEO_CACHE_TTL', 300))
+    # Thống kê thư viện media (app/media_stats.py): cập nhật tăng dần, load lại từ DB sau N giây
+    MEDIA_STATS_TTL = int(os.environ.get('MEDIA_STATS_TTL', 600))
+    # Bộ đếm dashboard (app/dashboard_metrics.py): cộng dồn theo event, đối chiếu COUNT(*) mỗi N giây
+    DASHBOARD_METRICS_RECONCILE = int(os.environ.get('DASHBOARD_METRICS_RECONCILE', 300))
+    # Thống kê đề thi (app/quiz_stats.py): true → danh sách quiz đọc bảng tổng hợp quiz_stats
+    # (cập nhật sau mỗi lần nộp bài) thay cho GROUP BY trên quiz_attempts; false → không ghi bảng này
+    QUIZ_STATS_SUMMARY = os.environ.get('QUIZ_STATS_SUMMARY', 'false').lower() == 'true'
+    # Lượt xem gom trong RAM, flush xuống DB mỗi N giây (<= 0: ghi ngay trong request)
+    VIEW_COUNTER_FLUSH_INTERVAL = int(os.environ.get('VIEW_COUNTER_FLUSH_INTERVAL', 5))
+    # Full-page cache cho khách chưa đăng nhập (app/page_cache.py), tự xóa khi model đổi
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', 'true').lower() == 'true'
+    PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 300))
+    # ETag / Last-Modified + 304 cho trang public có validator (@cached_page(validator=...))
+    CONDITIONAL_GET_ENABLED = os.environ.get('CONDITIONAL_GET_ENABLED', 'true').lower() == 'true'
+    # {% cache %} cho topbar/header/footer của base.html, xóa theo version Settings/Category
+    FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', 300))
+
+    # ===== TÌM KIẾM =====
+    # Inverted index trong RAM (app/search_index.py) cho /tim-kiem + thư viện media
+    # auto: chỉ bảng không có full-text index trong DB | true: mọi bảng | false: tắt
+    SEARCH_MEMORY_INDEX = os.environ.get('SEARCH_MEMORY_INDEX', 'auto').lower()
+    # Rebuild nền sau N giây (đồng bộ thay đổi từ worker khác), 0 → chỉ cập nhật theo event
+    SEARCH_MEMORY_INDEX_TTL = int(os.environ.get('SEARCH_MEMORY_INDEX_TTL', 600))
+    # Gợi ý khi gõ (/api/suggest, app/suggest.py): số giây trước khi build lại từ DB
+    SUGGEST_INDEX_TTL = int(os.environ.get('SUGGEST_INDEX_TTL', 600))
+
+    # ===== INSTRUMENTATION =====
+    # Đếm query SQL / thời gian DB + render theo request (xem /admin/performance)
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+    # Header Server-Timing chỉ gửi cho user đã đăng nhập (khách không thấy thời gian DB / số query)
+    SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    # Ghi vào SLOW_LOG_FILE query / request chậm hơn ngưỡng (ms), 0 → tắt
+    SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 200))
+    SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 1000))
+    SLOW_LOG_FILE = os.environ.get('SLOW_LOG_FILE', 'logs/slow.log')
+    # Sampling profiler trong /admin/performance (opt-in)
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'false').lower() == 'true'
+    PROFILER_MAX_SECONDS = int(os.environ.get('PROFILER_MAX_SECONDS', 60))
 
     # ===== SECURITY / RATE LIMIT =====
     RATELIMIT_ENABLED = True
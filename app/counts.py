@@ -0,0 +1,82 @@
+"""
+Tổng số dòng cho trang danh sách (COUNT(*) có cache)
+
+- Key = SQL đã chuẩn hóa của query (bỏ ORDER BY) + tham số → cùng filter dùng chung 1 entry
+- Mỗi tập bảng 1 cache trong registry ('row_count:<bảng>') → commit ghi vào bảng là xóa ngay,
+  worker khác tự đồng bộ sau COUNT_CACHE_TTL giây
+- Session đang có thay đổi chưa commit trên bảng đó → đếm trực tiếp, không lưu cache
+- PostgreSQL + COUNT_ESTIMATE_ENABLED: query không filter trên 1 bảng lớn dùng pg_class.reltuples
+  (cập nhật bởi VACUUM / ANALYZE) thay cho quét cả bảng
+
+Usage:
+    total = cached_count(Product.query.filter_by(is_active=True))
+    total_files = table_count(Media, estimate=True)
+"""
+from sqlalchemy import Table, text
+from sqlalchemy.sql import visitors
+
+from app import db
+from app.cache_registry import register_cache, uncommitted_tables
+
+
+def _statement_tables(statement):
+    """Tên các bảng mà statement đọc (kể cả subquery / join)"""
+    return frozenset(element.name for element in visitors.iterate(statement) if isinstance(element, Table))
+
+
+def _count_cache(tables):
+    return register_cache('row_count:' + ','.join(sorted(tables)), ttl=300, max_size=256,
+                          models=tables, ttl_config='COUNT_CACHE_TTL')
+
+
+def _is_unfiltered(statement, tables):
+    return (len(tables) == 1 and statement.whereclause is None and not statement._group_by_clauses
+            and not statement._having_criteria and not statement._distinct)
+
+
+def _estimate(table_name):
+    """Ước lượng số dòng từ catalog PostgreSQL, None nếu không dùng được"""
+    from flask import current_app
+
+    if not current_app.config.get('COUNT_ESTIMATE_ENABLED') or db.engine.dialect.name != 'postgresql':
+        return None
+    estimate = db.session.execute(
+        text('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)'),
+        {'name': table_name}
+    ).scalar()
+    # -1: bảng chưa ANALYZE lần nào (PostgreSQL 14+)
+    if estimate is None or estimate < current_app.config.get('COUNT_ESTIMATE_MIN_ROWS', 100000):
+        return None
+    return int(estimate)
+
+
+def cached_count(query, estimate=False):
+    """
+    COUNT(*) của query (ORDER BY / LIMIT bị bỏ qua), có cache
+
+    Args:
+        query: Query đã filter
+        estimate: True → cho phép ước lượng reltuples khi query không filter (xem COUNT_ESTIMATE_*)
+    """
+    query = query.order_by(None).limit(None).offset(None)
+    statement = query.statement
+    tables = _statement_tables(statement)
+
+    def _load():
+        if estimate and _is_unfiltered(statement, tables):
+            approximate = _estimate(next(iter(tables)))
+            if approximate is not None:
+                return approximate
+        return query.count()
+
+    if not tables or tables & uncommitted_tables():
+        return query.count()
+
+    compiled = statement.compile(dialect=db.engine.dialect)
+    key = (str(compiled), repr(sorted(compiled.params.items())), estimate)
+    return _count_cache(tables).get_or_load(key, _load)
+
+
+def table_count(model, estimate=False):
+    """Tổng số dòng của bảng (không filter)"""
+    return cached_count(model.query, estimate=estimate)
@@ -0,0 +1,194 @@
+"""
+Bộ đếm cho dashboard admin (sản phẩm, danh mục, bài viết, liên hệ chưa đọc, lượt làm bài)
+
+- Giữ trong RAM, cộng / trừ theo mapper events insert / update / delete (áp dụng sau commit)
+- Đối chiếu với DB mỗi DASHBOARD_METRICS_RECONCILE giây bằng 1 query (các COUNT(*) là scalar subquery)
+  → sửa lệch do worker khác / ghi ngoài ORM
+- Bulk UPDATE/DELETE trên bảng được đếm hoặc không đọc được giá trị cũ → đối chiếu lại ngay lần đọc sau
+- /admin/api/dashboard-metrics trả JSON để dashboard poll
+
+Usage:
+    metrics = dashboard_metrics()   # {'products': 120, 'unread_contacts': 3, ...}
+"""
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import event, func, inspect, or_, select
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models.contact import Contact
+from app.models.content import Blog
+from app.models.product import Category, Product
+from app.models.quiz import QuizAttempt
+
+# {tên: (model, (cột, giá trị) hoặc None)} - dòng được đếm khi bool(cột) == giá trị
+METRICS = {
+    'products': (Product, None),
+    'categories': (Category, None),
+    'blogs': (Blog, None),
+    'unread_contacts': (Contact, ('is_read', False)),
+    'quiz_attempts': (QuizAttempt, ('is_completed', True)),
+}
+
+_DELTAS_KEY = 'dashboard_metrics_deltas'
+_MODEL_METRICS = {}  # {model: [tên metric]}
+for _name, (_model, _) in METRICS.items():
+    _MODEL_METRICS.setdefault(_model, []).append(_name)
+
+_STATE = {'values': None, 'reconciled_at': None, 'checked_at': 0.0, 'generation': 0}
+_LOCK = threading.Lock()
+
+
+# ==================== ĐỐI CHIẾU VỚI DB ====================
+def _count_statement(name):
+    model, condition = METRICS[name]
+    statement = select(func.count()).select_from(model)
+    if condition is not None:
+        column = getattr(model, condition[0])
+        # NULL được tính như False (giống bool() phía Python)
+        statement = statement.where(column == True if condition[1] else or_(column == False, column.is_(None)))
+    return statement.scalar_subquery()
+
+
+def _reconcile():
+    """Đếm lại toàn bộ bằng 1 query, trả về dict giá trị"""
+    names = list(METRICS)
+    with _LOCK:
+        generation = _STATE['generation']
+    with db.engine.connect() as connection:
+        row = connection.execute(select(*(_count_statement(name) for name in names))).one()
+    values = dict(zip(names, (int(value or 0) for value in row)))
+
+    with _LOCK:
+        # Có commit trong lúc đếm → vẫn trả kết quả nhưng để lần đọc sau đối chiếu lại
+        if generation == _STATE['generation']:
+            _STATE['values'] = values
+            _STATE['reconciled_at'] = datetime.utcnow()
+            _STATE['checked_at'] = time.monotonic()
+    return values
+
+
+def dashboard_metrics():
+    """
+    Returns:
+        dict: {'products', 'categories', 'blogs', 'unread_contacts', 'quiz_attempts'}
+    """
+    from flask import current_app
+
+    interval = current_app.config.get('DASHBOARD_METRICS_RECONCILE', 300)
+    with _LOCK:
+        values = _STATE['values']
+        if values is not None and (interval <= 0 or time.monotonic() - _STATE['checked_at'] < interval):
+            return dict(values)
+    return _reconcile()
+
+
+def metrics_reconciled_at():
+    """Thời điểm (UTC) đối chiếu DB gần nhất"""
+    return _STATE['reconciled_at']
+
+
+# ==================== CẬP NHẬT TĂNG DẦN ====================
+def _session_deltas(session):
+    """{'stale': bool, 'counts': {metric: chênh lệch}} của transaction hiện tại"""
+    return session.info.setdefault(_DELTAS_KEY, {'stale': False, 'counts': {}})
+
+
+def _matches(name, value):
+    condition = METRICS[name][1]
+    return condition is None or bool(value) == condition[1]
+
+
+def _add(session, name, delta):
+    counts = _session_deltas(session)['counts']
+    counts[name] = counts.get(name, 0) + delta
+
+
+def _column_value(target, column, old):
+    """Giá trị cũ / mới của cột, (False, None) nếu không biết (chưa load)"""
+    added, unchanged, deleted = inspect(target).attrs[column].history
+    if unchanged:
+        return True, unchanged[0]
+    if old and deleted:
+        return True, deleted[0]
+    if not old and added:
+        return True, added[0]
+    return False, None
+
+
+def _row_changed(target, sign):
+    """Insert (sign=1) / delete (sign=-1): cộng / trừ các metric mà dòng thuộc về"""
+    session = object_session(target)
+    if session is None:
+        return
+    for name in _MODEL_METRICS[type(target)]:
+        condition = METRICS[name][1]
+        if condition is None:
+            _add(session, name, sign)
+            continue
+        if sign > 0:
+            known, value = True, inspect(target).dict.get(condition[0])
+        else:
+            known, value = _column_value(target, condition[0], old=True)
+        if not known:
+            _session_deltas(session)['stale'] = True
+        elif _matches(name, value):
+            _add(session, name, sign)
+
+
+def _row_updated(target):
+    """Update: chỉ metric có điều kiện, khi cột điều kiện đổi"""
+    session = object_session(target)
+    if session is None:
+        return
+    for name in _MODEL_METRICS[type(target)]:
+        condition = METRICS[name][1]
+        if condition is None:
+            continue
+        known_old, old = _column_value(target, condition[0], old=True)
+        known_new, new = _column_value(target, condition[0], old=False)
+        if not (known_old and known_new):
+            _session_deltas(session)['stale'] = True
+            continue
+        _add(session, name, int(_matches(name, new)) - int(_matches(name, old)))
+
+
+for _model in _MODEL_METRICS:
+    event.listen(_model, 'after_insert', lambda mapper, connection, target: _row_changed(target, 1))
+    event.listen(_model, 'after_delete', lambda mapper, connection, target: _row_changed(target, -1))
+    event.listen(_model, 'after_update', lambda mapper, connection, target: _row_updated(target))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bulk_changed(orm_execute_state):
+    """Query.update / delete / bulk insert không qua mapper events → đối chiếu lại"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in _MODEL_METRICS:
+        _session_deltas(orm_execute_state.session)['stale'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_deltas(session):
+    deltas = session.info.pop(_DELTAS_KEY, None)
+    if not deltas:
+        return
+    with _LOCK:
+        _STATE['generation'] += 1
+        if _STATE['values'] is None:
+            return
+        if deltas['stale']:
+            _STATE['values'] = None
+            return
+        values = dict(_STATE['values'])
+        for name, delta in deltas['counts'].items():
+            values[name] += delta
+        _STATE['values'] = values
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_deltas(session):
+    session.info.pop(_DELTAS_KEY, None)
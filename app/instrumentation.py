@@ -0,0 +1,298 @@
+"""
+Đo số query SQL + thời gian DB / render cho từng request
+
+- SQLAlchemy before/after_cursor_execute → đếm statement + cộng thời gian DB vào g
+- Signal before_render_template / template_rendered → thời gian render Jinja
+- Response có header Server-Timing: db;dur=..;desc="N queries", render;dur=.., total;dur=..
+  (chỉ khi đã đăng nhập admin)
+- Gộp theo endpoint trong RAM (xem ở /admin/performance), URL không khớp route gộp vào '<unmatched>'
+- Statement lặp nhiều nhất trong 1 request được ghi lại → dấu hiệu N+1
+
+SLOW LOG (logs/slow.log, xoay vòng):
+- Query chậm hơn SLOW_QUERY_MS: SQL, tham số, thời gian, endpoint,
+  dòng code trong app/ và dòng template đang render đã gọi query
+- Request chậm hơn SLOW_REQUEST_MS: tổng/DB/render + toàn bộ danh sách query của request
+
+Config:
+    INSTRUMENTATION_ENABLED: bật/tắt toàn bộ (mặc định True)
+    SERVER_TIMING_ENABLED: gửi header Server-Timing cho user đã đăng nhập (mặc định True)
+    SLOW_QUERY_MS / SLOW_REQUEST_MS: ngưỡng (ms), <= 0 → tắt
+    SLOW_LOG_FILE: file log (mặc định logs/slow.log)
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Key thống kê chung cho mọi request không khớp route nào
+UNMATCHED_ENDPOINT = '<unmatched>'
+
+# {endpoint: {...}} - xem _record_request
+_ENDPOINT_STATS = {}
+_STATS_LOCK = threading.Lock()
+_STARTED_AT = {'time': time.time()}
+
+_STATEMENT_PREVIEW = 300  # ký tự
+_PARAMS_PREVIEW = 500  # ký tự
+_MAX_LOGGED_QUERIES = 500  # / request, tránh phình RAM khi có vòng lặp query
+
+_APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+slow_logger = logging.getLogger('app.slow')
+
+
+def init_instrumentation(app):
+    """Gắn hook request + template cho app (engine hook đăng ký 1 lần ở module level)"""
+    if not app.config.get('INSTRUMENTATION_ENABLED', True):
+        return
+
+    _init_slow_log(app)
+
+    @app.before_request
+    def _start_request_timer():
+        g.perf = {
+            'started': time.perf_counter(),
+            'sql_count': 0,
+            'sql_ms': 0.0,
+            'render_ms': 0.0,
+            'statements': Counter(),
+            'slow_query_ms': app.config.get('SLOW_QUERY_MS', 0),
+            # Chỉ giữ danh sách query khi có ngưỡng request chậm
+            'queries': [] if app.config.get('SLOW_REQUEST_MS', 0) > 0 else None,
+        }
+
+    @app.after_request
+    def _finish_request_timer(response):
+        perf = g.get('perf')
+        if perf is None:
+            return response
+
+        total_ms = (time.perf_counter() - perf['started']) * 1000
+        # Chỉ gửi cho người đã đăng nhập (admin) - khách không thấy thời gian DB / số query
+        if app.config.get('SERVER_TIMING_ENABLED', True) and _is_staff_request():
+            response.headers['Server-Timing'] = ', '.join((
+                f'db;dur={perf["sql_ms"]:.1f};desc="{perf["sql_count"]} queries"',
+                f'render;dur={perf["render_ms"]:.1f}',
+                f'total;dur={total_ms:.1f}',
+            ))
+
+        # URL không khớp route (404 của scanner...) gộp 1 dòng → bảng thống kê không phình theo path lạ
+        _record_request(request.endpoint or UNMATCHED_ENDPOINT, perf, total_ms)
+
+        slow_request_ms = app.config.get('SLOW_REQUEST_MS', 0)
+        if 0 < slow_request_ms <= total_ms:
+            _log_slow_request(perf, total_ms, response.status_code)
+        return response
+
+    before_render_template.connect(_start_render, app)
+    template_rendered.connect(_finish_render, app)
+
+
+def _is_staff_request():
+    from flask_login import current_user
+    return current_user.is_authenticated
+
+
+# ==================== SQL HOOKS ====================
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Lưu trên execution context (sống theo từng statement): statement lỗi không để lại gì trên connection
+    if context is not None and has_request_context() and 'perf' in g:
+        context._perf_query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_perf_query_start', None)
+    if started is None or not has_request_context():
+        return
+    perf = g.get('perf')
+    if perf is None:
+        return
+
+    duration_ms = (time.perf_counter() - started) * 1000
+    perf['sql_ms'] += duration_ms
+    perf['sql_count'] += 1
+    perf['statements'][statement] += 1
+
+    slow_query_ms = perf['slow_query_ms']
+    is_slow = 0 < slow_query_ms <= duration_ms
+    queries = perf['queries']
+    if not is_slow and (queries is None or len(queries) >= _MAX_LOGGED_QUERIES):
+        return
+
+    app_line, template_line = _call_site()
+    if is_slow:
+        slow_logger.warning(
+            'SLOW QUERY %.1fms %s %s [%s]\n  at %s%s\n  %s\n  params: %s',
+            duration_ms, request.method, request.full_path.rstrip('?'), request.endpoint,
+            app_line or '?', f'\n  template {template_line}' if template_line else '',
+            statement.strip(), _preview_params(parameters),
+        )
+    if queries is not None and len(queries) < _MAX_LOGGED_QUERIES:
+        queries.append((duration_ms, statement, app_line, template_line))
+
+
+def _call_site():
+    """
+    Dòng code trong app/ (trong cùng) và dòng template đang render đã phát query
+
+    Returns: ('main/routes/products.py:42 in product_detail', 'templates/public/index.html:88')
+    """
+    app_line = template_line = None
+    frame = sys._getframe(2)
+    while frame is not None and (app_line is None or template_line is None):
+        template = frame.f_globals.get('__jinja_template__')
+        if template is not None:
+            if template_line is None:
+                lineno = template.get_corresponding_lineno(frame.f_lineno)
+                template_line = f'{_relative_path(template.filename or template.name)}:{lineno}'
+        elif app_line is None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(_APP_ROOT) and filename != __file__:
+                app_line = f'{_relative_path(filename)}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return app_line, template_line
+
+
+def _relative_path(filename):
+    if filename and filename.startswith(_APP_ROOT):
+        return os.path.relpath(filename, _APP_ROOT)
+    return filename
+
+
+def _preview_params(parameters):
+    text = repr(parameters)
+    if len(text) > _PARAMS_PREVIEW:
+        text = text[:_PARAMS_PREVIEW] + '...'
+    return text
+
+
+# ==================== TEMPLATE HOOKS ====================
+def _start_render(sender, template, context, **extra):
+    perf = g.get('perf')
+    if perf is not None:
+        # render_template lồng nhau (macro/email) → chỉ đo lớp ngoài cùng
+        perf.setdefault('render_depth', 0)
+        if perf['render_depth'] == 0:
+            perf['render_started'] = time.perf_counter()
+        perf['render_depth'] += 1
+
+
+def _finish_render(sender, template, context, **extra):
+    perf = g.get('perf')
+    if perf is not None and perf.get('render_depth'):
+        perf['render_depth'] -= 1
+        if perf['render_depth'] == 0:
+            perf['render_ms'] += (time.perf_counter() - perf['render_started']) * 1000
+
+
+# ==================== SLOW LOG ====================
+def _init_slow_log(app):
+    """RotatingFileHandler riêng cho slow log (không lẫn với log ERROR của app)"""
+    if app.config.get('SLOW_QUERY_MS', 0) <= 0 and app.config.get('SLOW_REQUEST_MS', 0) <= 0:
+        return
+    if slow_logger.handlers:
+        return
+
+    log_file = app.config.get('SLOW_LOG_FILE', 'logs/slow.log')
+    log_dir = os.path.dirname(log_file)
+    if log_dir and not os.path.exists(log_dir):
+        os.makedirs(log_dir, exist_ok=True)
+
+    handler = RotatingFileHandler(log_file, maxBytes=1024 * 1024, backupCount=3, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+    slow_logger.addHandler(handler)
+    slow_logger.setLevel(logging.WARNING)
+    slow_logger.propagate = False
+
+
+def _log_slow_request(perf, total_ms, status_code):
+    lines = [
+        f'SLOW REQUEST {total_ms:.1f}ms {request.method} {request.full_path.rstrip("?")} '
+        f'[{request.endpoint}] status={status_code} '
+        f'db={perf["sql_ms"]:.1f}ms/{perf["sql_count"]} queries render={perf["render_ms"]:.1f}ms'
+    ]
+    for index, (duration_ms, statement, app_line, template_line) in enumerate(perf['queries'] or (), 1):
+        location = ' | '.join(part for part in (app_line, template_line) if part) or '?'
+        preview = ' '.join(statement.split())[:_STATEMENT_PREVIEW]
+        lines.append(f'  #{index} {duration_ms:.1f}ms @ {location}\n     {preview}')
+    if perf['sql_count'] > len(perf['queries'] or ()):
+        lines.append(f'  ... ({perf["sql_count"] - len(perf["queries"] or ())} query không được ghi)')
+    slow_logger.warning('\n'.join(lines))
+
+
+# ==================== AGGREGATE ====================
+def _record_request(endpoint, perf, total_ms):
+    repeated, repeat_count = (perf['statements'].most_common(1) or [(None, 0)])[0]
+
+    with _STATS_LOCK:
+        stats = _ENDPOINT_STATS.get(endpoint)
+        if stats is None:
+            stats = _ENDPOINT_STATS[endpoint] = {
+                'endpoint': endpoint,
+                'requests': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'sql_ms': 0.0,
+                'render_ms': 0.0,
+                'queries': 0,
+                'max_queries': 0,
+                'max_repeat': 0,
+                'repeated_statement': None,
+            }
+        stats['requests'] += 1
+        stats['total_ms'] += total_ms
+        stats['max_ms'] = max(stats['max_ms'], total_ms)
+        stats['sql_ms'] += perf['sql_ms']
+        stats['render_ms'] += perf['render_ms']
+        stats['queries'] += perf['sql_count']
+        stats['max_queries'] = max(stats['max_queries'], perf['sql_count'])
+        if repeat_count > stats['max_repeat']:
+            stats['max_repeat'] = repeat_count
+            stats['repeated_statement'] = repeated[:_STATEMENT_PREVIEW]
+
+
+def endpoint_stats(sort_by='queries'):
+    """
+    Thống kê theo endpoint (kèm giá trị trung bình)
+
+    Args:
+        sort_by: 'queries' (trung bình query/request), 'time', 'sql', 'requests', 'repeat'
+    """
+    with _STATS_LOCK:
+        rows = [dict(stats) for stats in _ENDPOINT_STATS.values()]
+
+    for row in rows:
+        count = row['requests'] or 1
+        row['avg_ms'] = round(row['total_ms'] / count, 1)
+        row['avg_sql_ms'] = round(row['sql_ms'] / count, 1)
+        row['avg_render_ms'] = round(row['render_ms'] / count, 1)
+        row['avg_queries'] = round(row['queries'] / count, 1)
+
+    sort_keys = {
+        'queries': 'avg_queries',
+        'time': 'avg_ms',
+        'sql': 'avg_sql_ms',
+        'requests': 'requests',
+        'repeat': 'max_repeat',
+    }
+    rows.sort(key=lambda row: row[sort_keys.get(sort_by, 'avg_queries')], reverse=True)
+    return rows
+
+
+def reset_stats():
+    with _STATS_LOCK:
+        _ENDPOINT_STATS.clear()
+        _STARTED_AT['time'] = time.time()
+
+
+def stats_started_at():
+    return _STARTED_AT['time']
@@ -1,13 +1,24 @@
 from flask import render_template, request, redirect, url_for
 from app.main import main_bp
-from app import db
 from app.models.content import Blog, FAQ
 from app.models.settings import get_setting
-from sqlalchemy import or_
+from app.models.helpers import preload_media_seo
+from app.models.view_counter import record_view
+from app.page_cache import cached_page, row_stamp, table_stamp
+from app.pagination import cached_paginate, keyset_paginate
+from app.search import apply_search
 from sqlalchemy.orm import joinedload, load_only
+from app.cache_registry import register_cache, load_detached
+
+# Sidebar bài nổi bật + FAQ: cache registry, xóa khi bảng tương ứng có commit
+_featured_blogs_cache = register_cache('featured_blogs', ttl=300, max_size=8, models=(Blog,))
+_faq_cache = register_cache('faqs', ttl=300, max_size=4, models=(FAQ,))
 
 
 @main_bp.route('/tin-tuc')
+@cached_page('blogs', 'users', 'media',
+             validator=lambda: table_stamp(Blog),
+             params=('page', 'cursor', 'search'))
 def blog():
     """Trang danh sách blog"""
     page = request.args.get('page', 1, type=int)
@@ -19,40 +30,35 @@ def blog():
         joinedload(Blog.author_obj),
         load_only(
             Blog.id, Blog.slug, Blog.title, Blog.excerpt, Blog.image,
-            Blog.created_at, Blog.updated_at, Blog.views, Blog.author, Blog.is_featured
+            Blog.created_at, Blog.updated_at, Blog.views, Blog.author, Blog.is_featured,
+            # Legacy SEO fields - fallback của get_media_seo_info() khi ảnh không có trong Media
+            Blog.image_alt_text, Blog.image_title, Blog.image_caption
         )
     )
              .filter_by(is_active=True)
              )
 
-    # Search
-    if search:
-        query = query.filter(
-            or_(
-                Blog.title.ilike(f'%{search}%'),
-                Blog.excerpt.ilike(f'%{search}%')
-            )
-        )
-
-    # Sắp xếp mới nhất
-    query = query.order_by(Blog.created_at.desc())
-
     # Phân trang
     per_page = int(get_setting('default_posts_per_page', '9'))
 
-    pagination = query.paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False
-    )
+    if search:
+        # Search không dấu (full-text), xếp theo độ liên quan rồi mới đến ngày đăng (OFFSET)
+        query = apply_search(query, Blog, search)
+        pagination = cached_paginate(query.order_by(Blog.created_at.desc()),
+                                     page=page, per_page=per_page)
+    else:
+        # Mới nhất trước, phân trang keyset
+        pagination = keyset_paginate(query, [(Blog.created_at, 'desc'), (Blog.id, 'desc')],
+                                     page=page, per_page=per_page,
+                                     cursor=request.args.get('cursor'))
 
     blogs = pagination.items
 
     # Bài viết nổi bật sidebar
-    featured_blogs = (Blog.query
-                      .options(load_only(Blog.slug, Blog.title, Blog.created_at, Blog.views, Blog.image))
-                      .filter_by(is_featured=True, is_active=True)
-                      ).limit(5).all()
+    featured_blogs = _featured_blogs_cache.get_or_load('sidebar', lambda: load_detached(
+        lambda session: session.query(Blog).filter_by(is_featured=True, is_active=True).limit(5).all()
+    ))
+    preload_media_seo(blogs, featured_blogs)
 
     return render_template('public/tin_tuc/blogs.html',
                            blogs=blogs,
@@ -62,6 +68,8 @@ def blog():
 
 
 @main_bp.route('/tin-tuc/<slug>')
+@cached_page('blogs', 'users', 'media',
+             validator=lambda slug: row_stamp(Blog, slug=slug))
 def blog_detail(slug):
     """Trang chi tiết blog"""
     blog = (Blog.query
@@ -69,16 +77,19 @@ def blog_detail(slug):
             .filter_by(slug=slug, is_active=True)
             ).first_or_404()
 
-    # Tăng lượt xem
-    blog.views += 1
-    db.session.commit()
+    # Tăng lượt xem (ghi DB theo lô, không commit trong request)
+    record_view(blog)
 
     # Bài viết liên quan
     related_blogs = (Blog.query
-                     .options(load_only(Blog.slug, Blog.title, Blog.created_at, Blog.image))
+                     .options(load_only(Blog.slug, Blog.title, Blog.created_at, Blog.image,
+                                       Blog.excerpt, Blog.views, Blog.author, Blog.is_featured,
+                                       Blog.updated_at, Blog.image_alt_text, Blog.image_title,
+                                       Blog.image_caption))
                      .filter(Blog.id != blog.id, Blog.is_active == True)
                      .order_by(Blog.created_at.desc())
                      ).limit(3).all()
+    preload_media_seo(blog, related_blogs)
 
     return render_template('public/tin_tuc/blog_detail.html',
                            blog=blog,
@@ -86,7 +97,10 @@ def blog_detail(slug):
 
 
 @main_bp.route('/cau-hoi-thuong-gap')
+@cached_page('faqs')
 def faq():
     """Trang câu hỏi thường gặp"""
-    faqs = FAQ.query.filter_by(is_active=True).order_by(FAQ.order).all()
+    faqs = _faq_cache.get_or_load('active', lambda: load_detached(
+        lambda session: session.query(FAQ).filter_by(is_active=True).order_by(FAQ.order).all()
+    ))
     return render_template('public/faq.html', faqs=faqs)
@@ -2,9 +2,14 @@ from flask import render_template, request, redirect, url_for
 from app.main import main_bp
 from app import db
 from app.models.job import Job
+from app.models.view_counter import record_view
+from app.page_cache import cached_page, row_stamp, table_stamp
 
 
 @main_bp.route('/tuyen-dung')
+@cached_page('jobs',
+             validator=lambda: table_stamp(Job),
+             params=('dept', 'loc'))
 def careers():
     """Trang tuyển dụng"""
     department = request.args.get('dept', '')
@@ -30,13 +35,14 @@ def careers():
 
 
 @main_bp.route('/tuyen-dung/<slug>')
+@cached_page('jobs',
+             validator=lambda slug: row_stamp(Job, slug=slug))
 def job_detail(slug):
     """Trang chi tiết tuyển dụng"""
     job = Job.query.filter_by(slug=slug, is_active=True).first_or_404()
 
-    # Tăng lượt xem
-    job.view_count += 1
-    db.session.commit()
+    # Tăng lượt xem (ghi DB theo lô, không commit trong request)
+    record_view(job, 'view_count')
 
     # Các vị trí khác
     other_jobs = Job.query.filter(
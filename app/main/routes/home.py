@@ -3,34 +3,54 @@ from app.main import main_bp
 from app.models.product import Product
 from app.models.media import Banner, Project
 from app.models.content import Blog
-from sqlalchemy.orm import load_only
+from app.models.helpers import preload_media_seo
+from app.page_cache import cached_page, table_stamp
+from app.cache_registry import register_cache, load_detached
+
+# Danh sách ít đổi của trang chủ: cache registry, xóa khi bảng tương ứng có commit
+_banner_cache = register_cache('banners', ttl=300, max_size=4, models=(Banner,))
+_featured_products_cache = register_cache('featured_products', ttl=300, max_size=8, models=(Product,))
+_featured_blogs_cache = register_cache('featured_blogs', ttl=300, max_size=8, models=(Blog,))
+_featured_projects_cache = register_cache('featured_projects', ttl=300, max_size=8, models=(Project,))
 
 
 @main_bp.route('/')
+@cached_page('banners', 'products', 'blogs', 'projects', 'media',
+             validator=lambda: table_stamp(Product, Blog, Project))
 def index():
     """Trang chủ"""
     # Lấy banners đang active
-    banners = Banner.query.filter_by(is_active=True).order_by(Banner.order).all()
+    banners = _banner_cache.get_or_load('active', lambda: load_detached(
+        lambda session: session.query(Banner).filter_by(is_active=True).order_by(Banner.order).all()
+    ))
 
     # Lấy sản phẩm nổi bật (featured)
-    featured_products = Product.query.filter_by(
-        is_featured=True,
-        is_active=True
-    ).limit(3).all()
+    featured_products = _featured_products_cache.get_or_load('home', lambda: load_detached(
+        lambda session: session.query(Product).filter_by(
+            is_featured=True,
+            is_active=True
+        ).limit(3).all()
+    ))
 
     # Lấy sản phẩm mới nhất
-    latest_products = Product.query.filter_by(
-        is_active=True
-    ).order_by(Product.created_at.desc()).limit(3).all()
+    latest_products = _featured_products_cache.get_or_load('latest', lambda: load_detached(
+        lambda session: session.query(Product).filter_by(
+            is_active=True
+        ).order_by(Product.created_at.desc()).limit(3).all()
+    ))
+
+    # Lấy tin tức nổi bật (load đủ cột: object detached không lazy-load được)
+    featured_blogs = _featured_blogs_cache.get_or_load('home', lambda: load_detached(
+        lambda session: session.query(Blog).filter_by(is_featured=True, is_active=True).limit(3).all()
+    ))
 
-    # Lấy tin tức nổi bật
-    featured_blogs = (Blog.query
-                      .options(load_only(Blog.slug, Blog.title, Blog.created_at, Blog.image))
-                      .filter_by(is_featured=True, is_active=True)
-                      ).limit(3).all()
+    featured_projects = _featured_projects_cache.get_or_load('home', lambda: load_detached(
+        lambda session: session.query(Project).filter_by(is_featured=True, is_active=True).order_by(
+            Project.created_at.desc()).limit(6).all()
+    ))
 
-    featured_projects = Project.query.filter_by(is_featured=True, is_active=True).order_by(
-        Project.created_at.desc()).limit(6).all()
+    # SEO ảnh của tất cả card trong 1 query (thay vì mỗi card 1-3 query)
+    preload_media_seo(banners, featured_products, latest_products, featured_blogs, featured_projects)
 
     return render_template('public/index.html',
                            banners=banners,
@@ -41,12 +61,14 @@ def index():
 
 
 @main_bp.route('/gioi-thieu')
+@cached_page()
 def about():
     """Trang giới thiệu"""
     return render_template('public/about.html')
 
 
 @main_bp.route('/chinh-sach')
+@cached_page()
 def policy():
     """Trang chính sách"""
     return render_template('public/policy.html')
@@ -1,8 +1,11 @@
-from flask import render_template, request, redirect, url_for, send_from_directory, current_app, abort
+from flask import render_template, request, redirect, url_for, send_from_directory, current_app, abort, jsonify
 from app.main import main_bp
 from app.models.product import Product
 from app.models.content import Blog
-from sqlalchemy import or_
+from app.models.media import Project
+from app.models.job import Job
+from app.search_index import ranked_search
+from app.suggest import suggest
 import os
 
 
@@ -14,25 +17,47 @@ def search():
     if not keyword:
         return redirect(url_for('main.index'))
 
-    # Tìm sản phẩm
-    products = Product.query.filter(
-        Product.name.ilike(f'%{keyword}%'),
-        Product.is_active == True
-    ).limit(10).all()
-
-    # Tìm blog
-    blogs = Blog.query.filter(
-        or_(
-            Blog.title.ilike(f'%{keyword}%'),
-            Blog.excerpt.ilike(f'%{keyword}%')
-        ),
-        Blog.is_active == True
-    ).limit(5).all()
+    # Không dấu, xếp theo độ liên quan (full-text index của DB hoặc index trong RAM)
+    products = ranked_search(Product.query.filter(Product.is_active == True), Product, keyword, 10)
+    blogs = ranked_search(Blog.query.filter(Blog.is_active == True), Blog, keyword, 5)
+    projects = ranked_search(Project.query.filter(Project.is_active == True), Project, keyword, 4)
+    jobs = ranked_search(Job.query.filter(Job.is_active == True), Job, keyword, 4)
 
     return render_template('public/search.html',
                            keyword=keyword,
                            products=products,
-                           blogs=blogs)
+                           blogs=blogs,
+                           projects=projects,
+                           jobs=jobs)
+
+
+# Endpoint + tham số URL theo loại gợi ý
+_SUGGEST_URLS = {
+    'category': ('main.products', 'category_slug'),
+    'product': ('main.product_detail', 'slug'),
+    'blog': ('main.blog_detail', 'slug'),
+    'project': ('main.project_detail', 'slug'),
+}
+
+
+@main_bp.route('/api/suggest')
+def search_suggest():
+    """Gợi ý khi gõ ô tìm kiếm (index trong RAM, không query DB mỗi phím)"""
+    keyword = request.args.get('q', '')[:100]
+    limit = max(1, min(request.args.get('limit', 8, type=int), 20))
+
+    suggestions = []
+    for item in suggest(keyword, limit):
+        endpoint, arg = _SUGGEST_URLS[item['type']]
+        suggestions.append({
+            'text': item['text'],
+            'type': item['type'],
+            'url': url_for(endpoint, **{arg: item['slug']}),
+        })
+
+    response = jsonify({'query': keyword, 'suggestions': suggestions})
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
 
 
 # Route cũ redirect sang mới
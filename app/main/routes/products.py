@@ -1,15 +1,35 @@
 from flask import render_template, request, redirect, url_for, flash
 from app.main import main_bp
-from app import db
 from app.models.product import Product, Category
-from app.models.settings import get_setting
+from app.models.settings import get_setting, get_settings
+from app.models.helpers import preload_media_seo
+from app.models.view_counter import record_view
+from app.page_cache import cached_page, row_stamp, table_stamp
+from app.pagination import cached_paginate, keyset_paginate
+from app.search import apply_search
+from sqlalchemy import func, literal_column
 from sqlalchemy.orm import joinedload, load_only
 from jinja2 import Template
 from datetime import datetime, timedelta
 
 
+# Khóa keyset theo ?sort= (id cuối cùng để thứ tự duy nhất)
+# coalesce(..., 0) viết literal để khớp index biểu thức ix_products_price_id / ix_products_views_id
+_PRICE_KEY = func.coalesce(Product.price, literal_column('0'))
+_VIEWS_KEY = func.coalesce(Product.views, literal_column('0'))
+_PRODUCT_SORT_KEYS = {
+    'latest': [(Product.created_at, 'desc'), (Product.id, 'desc')],
+    'price_asc': [(_PRICE_KEY, 'asc'), (Product.id, 'asc')],
+    'price_desc': [(_PRICE_KEY, 'desc'), (Product.id, 'desc')],
+    'popular': [(_VIEWS_KEY, 'desc'), (Product.id, 'desc')],
+}
+
+
 @main_bp.route('/san-pham')
 @main_bp.route('/loai-san-pham/<category_slug>')
+@cached_page('products', 'media',
+             validator=lambda category_slug=None: table_stamp(Product),
+             params=('page', 'cursor', 'search', 'sort', 'category'))
 def products(category_slug=None):
     """Trang danh sách sản phẩm với filter"""
     page = request.args.get('page', 1, type=int)
@@ -64,31 +84,26 @@ def products(category_slug=None):
         ).first_or_404()
         query = query.filter_by(category_id=current_category.id)
 
-    # Search theo tên
-    if search:
-        query = query.filter(Product.name.ilike(f'%{search}%'))
-
-    # Sắp xếp
-    if sort == 'latest':
-        query = query.order_by(Product.created_at.desc())
-    elif sort == 'price_asc':
-        query = query.order_by(Product.price.asc())
-    elif sort == 'price_desc':
-        query = query.order_by(Product.price.desc())
-    elif sort == 'popular':
-        query = query.order_by(Product.views.desc())
-
     # Phân trang
     per_page = int(get_setting('default_posts_per_page', '12'))
 
-    pagination = query.paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False
-    )
+    # Search không dấu (full-text), không chọn kiểu sắp xếp → xếp theo độ liên quan (OFFSET)
+    ranked = bool(search) and 'sort' not in request.args
+    if search:
+        query = apply_search(query, Product, search, ranked=ranked)
+
+    if ranked:
+        pagination = cached_paginate(query.order_by(Product.created_at.desc()),
+                                     page=page, per_page=per_page)
+    else:
+        # Sắp xếp + phân trang keyset (trang sâu tốn như trang 1)
+        pagination = keyset_paginate(query, _PRODUCT_SORT_KEYS.get(sort, _PRODUCT_SORT_KEYS['latest']),
+                                     page=page, per_page=per_page,
+                                     cursor=request.args.get('cursor'))
 
     products = pagination.items
     categories = Category.query.filter_by(is_active=True).all()
+    preload_media_seo(products)
 
     return render_template('public/san_pham/products.html',
                            products=products,
@@ -100,14 +115,15 @@ def products(category_slug=None):
 
 
 @main_bp.route('/san-pham/<slug>')
+@cached_page('products', 'media',
+             validator=lambda slug: row_stamp(Product, slug=slug))
 def product_detail(slug):
     """Trang chi tiết sản phẩm với render động meta description"""
     product = Product.query.options(joinedload(Product.category)) \
         .filter_by(slug=slug, is_active=True).first_or_404()
 
-    # Tăng lượt xem
-    product.views += 1
-    db.session.commit()
+    # Tăng lượt xem (ghi DB theo lô, không commit trong request)
+    record_view(product)
 
     # Lấy sản phẩm liên quan (cùng danh mục)
     related_products = Product.query.options(joinedload(Product.category)) \
@@ -116,12 +132,18 @@ def product_detail(slug):
         Product.id != product.id,
         Product.is_active == True
     ).limit(4).all()
+    preload_media_seo(product, related_products)
 
     # ✅ XỬ LÝ META DESCRIPTION ĐỘNG
     rendered_meta_description = None
 
-    # Lấy template từ settings
-    meta_template = get_setting('product_meta_description', '')
+    # Lấy template + tên website từ settings (1 lần đọc)
+    meta_settings = get_settings({
+        'product_meta_description': '',
+        'website_name': 'BRICON VIỆT NAM',
+    })
+    meta_template = meta_settings['product_meta_description']
+    website_name = meta_settings['website_name']
 
     if meta_template and ('{{' in meta_template or '{%' in meta_template):
         try:
@@ -137,13 +159,13 @@ def product_detail(slug):
             rendered_meta_description = meta_template.replace('{{ product.name }}', product.name or '')
             rendered_meta_description = rendered_meta_description.replace(
                 '{{ get_setting(\'website_name\', \'BRICON VIỆT NAM\') }}',
-                get_setting('website_name', 'BRICON VIỆT NAM'))
+                website_name)
     elif meta_template:
         # Template không có biến động
         rendered_meta_description = meta_template
     else:
         # Fallback mặc định nếu không có template
-        rendered_meta_description = f"Mua {product.name} chất lượng cao từ {get_setting('website_name', 'BRICON VIỆT NAM')} với giá tốt nhất."
+        rendered_meta_description = f"Mua {product.name} chất lượng cao từ {website_name} với giá tốt nhất."
 
     return render_template('public/san_pham/product_detail.html',
                            product=product,
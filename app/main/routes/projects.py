@@ -1,12 +1,22 @@
 from flask import render_template, request, redirect, url_for
 from app.main import main_bp
-from app import db
 from app.models.media import Project
 from app.project_config import PROJECT_TYPES
+from app.models.view_counter import record_view
+from app.page_cache import cached_page, row_stamp, table_stamp
+from app.pagination import keyset_paginate
+from sqlalchemy import func
 from sqlalchemy.orm import load_only
+from app.cache_registry import register_cache, load_detached
+
+# Dự án nổi bật: cache registry, xóa khi bảng projects có commit
+_featured_projects_cache = register_cache('featured_projects', ttl=300, max_size=8, models=(Project,))
 
 
 @main_bp.route('/du-an')
+@cached_page('projects',
+             validator=lambda: table_stamp(Project),
+             params=('page', 'cursor', 'type'))
 def projects():
     """Trang danh sách dự án"""
     page = request.args.get('page', 1, type=int)
@@ -17,7 +27,8 @@ def projects():
         load_only(
             Project.id, Project.slug, Project.title, Project.image,
             Project.description, Project.location, Project.year,
-            Project.project_type, Project.is_featured
+            Project.project_type, Project.is_featured,
+            Project.client, Project.products_used
         )
     )
              .filter_by(is_active=True)
@@ -26,14 +37,12 @@ def projects():
     if project_type:
         query = query.filter_by(project_type=project_type)
 
-    projects = query.order_by(Project.year.desc()).paginate(
-        page=page, per_page=12, error_out=False
-    )
+    projects = keyset_paginate(query, [(func.coalesce(Project.year, 0), 'desc'), (Project.id, 'desc')],
+                               page=page, per_page=12, cursor=request.args.get('cursor'))
 
-    featured_projects = (Project.query
-                         .options(load_only(Project.slug, Project.title, Project.image))
-                         .filter_by(is_featured=True, is_active=True)
-                         ).limit(6).all()
+    featured_projects = _featured_projects_cache.get_or_load('list', lambda: load_detached(
+        lambda session: session.query(Project).filter_by(is_featured=True, is_active=True).limit(6).all()
+    ))
 
     return render_template('public/du_an/projects.html',
                            projects=projects,
@@ -43,13 +52,14 @@ def projects():
 
 
 @main_bp.route('/du-an/<slug>')
+@cached_page('projects',
+             validator=lambda slug: row_stamp(Project, slug=slug))
 def project_detail(slug):
     """Trang chi tiết dự án"""
     project = Project.query.filter_by(slug=slug, is_active=True).first_or_404()
 
-    # Tăng lượt xem
-    project.view_count += 1
-    db.session.commit()
+    # Tăng lượt xem (ghi DB theo lô, không commit trong request)
+    record_view(project, 'view_count')
 
     # Dự án liên quan
     related = (Project.query
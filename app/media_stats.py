@@ -0,0 +1,229 @@
+"""
+Thống kê thư viện media: tổng file, dung lượng, phân bố điểm SEO, số file mỗi album
+
+- 1 query GROUP BY album + SUM(CASE ...) thay cho count() + sum(file_size) + 4 count() điểm SEO
+  + GROUP BY album riêng của get_albums()
+- Giữ trong RAM, cập nhật tăng dần khi upload / sửa / xóa Media (mapper events, cộng vào sau commit)
+- Bulk UPDATE/DELETE hoặc không đọc được giá trị cũ → load lại từ DB lần sau
+- Worker khác tự đồng bộ sau MEDIA_STATS_TTL giây
+
+Usage:
+    stats = media_stats()
+    stats['files'], stats['size_mb'], stats['seo']['excellent'], stats['albums']
+"""
+import threading
+import time
+
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models.media import Media, media_seo_score
+
+_FIELDS = ('files', 'size', 'excellent', 'good', 'fair', 'poor')
+_SCORE_FIELDS = ('album', 'file_size', 'alt_text', 'title', 'caption')
+_DELTAS_KEY = 'media_stats_deltas'
+
+# albums: {album: {field: giá trị}} (album None / '' = chưa phân loại)
+_STATE = {'albums': None, 'loaded_at': 0.0, 'generation': 0}
+_LOCK = threading.Lock()
+
+
+def seo_bucket(score):
+    """Điểm SEO → nhóm hiển thị (excellent ≥ 85, good 65-84, fair 50-64, poor < 50)"""
+    if score >= 85:
+        return 'excellent'
+    if score >= 65:
+        return 'good'
+    if score >= 50:
+        return 'fair'
+    return 'poor'
+
+
+def seo_bucket_filter(bucket):
+    """Điều kiện SQL của 1 nhóm điểm SEO (?seo= của thư viện media), None nếu tên không hợp lệ"""
+    score = Media.seo_score
+    return {
+        'excellent': score >= 85,
+        'good': score.between(65, 84),
+        'fair': score.between(50, 64),
+        'poor': score < 50,
+    }.get(bucket)
+
+
+# ==================== LOAD ====================
+def _query_albums():
+    rows = select(Media.album, Media.file_size, Media.seo_score.label('score')).subquery()
+    buckets = case(
+        (rows.c.score >= 85, 'excellent'),
+        (rows.c.score >= 65, 'good'),
+        (rows.c.score >= 50, 'fair'),
+        else_='poor'
+    )
+    statement = select(
+        rows.c.album,
+        func.count(),
+        func.coalesce(func.sum(rows.c.file_size), 0),
+        *(func.sum(case((buckets == name, 1), else_=0)) for name in _FIELDS[2:])
+    ).group_by(rows.c.album)
+
+    with db.engine.connect() as connection:
+        result = connection.execute(statement).all()
+    return {row[0]: dict(zip(_FIELDS, (int(value or 0) for value in row[1:]))) for row in result}
+
+
+def _current_albums():
+    from flask import current_app
+
+    ttl = current_app.config.get('MEDIA_STATS_TTL', 600)
+    with _LOCK:
+        albums, generation = _STATE['albums'], _STATE['generation']
+        if albums is not None and (ttl <= 0 or time.monotonic() - _STATE['loaded_at'] < ttl):
+            return albums
+
+    albums = _query_albums()
+    with _LOCK:
+        # Có commit Media trong lúc load → không ghi đè (lần sau load lại)
+        if generation == _STATE['generation']:
+            _STATE['albums'] = albums
+            _STATE['loaded_at'] = time.monotonic()
+    return albums
+
+
+def media_stats():
+    """
+    Returns:
+        dict: {'files', 'size', 'size_mb', 'seo': {'excellent', 'good', 'fair', 'poor'},
+               'albums': [{'name', 'count'}] (sắp theo tên, bỏ album rỗng)}
+    """
+    albums = _current_albums()
+    totals = dict.fromkeys(_FIELDS, 0)
+    for values in albums.values():
+        for field in _FIELDS:
+            totals[field] += values[field]
+
+    return {
+        'files': totals['files'],
+        'size': totals['size'],
+        'size_mb': round(totals['size'] / (1024 * 1024), 2),
+        'seo': {field: totals[field] for field in _FIELDS[2:]},
+        'albums': sorted(({'name': name, 'count': values['files']}
+                          for name, values in albums.items() if name and values['files'] > 0),
+                         key=lambda album: album['name']),
+    }
+
+
+def invalidate_media_stats():
+    """Bỏ số liệu trong RAM, request sau load lại từ DB"""
+    with _LOCK:
+        _STATE['albums'] = None
+        _STATE['generation'] += 1
+
+
+# ==================== CẬP NHẬT TĂNG DẦN ====================
+def _session_deltas(session):
+    """{'stale': bool, 'albums': {album: {field: chênh lệch}}} của transaction hiện tại"""
+    return session.info.setdefault(_DELTAS_KEY, {'stale': False, 'albums': {}})
+
+
+def _add_row(session, values, sign):
+    """Cộng (sign=1) / trừ (sign=-1) đóng góp của 1 dòng Media vào delta của session"""
+    deltas = _session_deltas(session)
+    if deltas['stale']:
+        return
+    album = deltas['albums'].setdefault(values['album'], dict.fromkeys(_FIELDS, 0))
+    album['files'] += sign
+    album['size'] += sign * (values['file_size'] or 0)
+    score = media_seo_score(values['alt_text'], values['title'], values['caption'], values['album'])
+    album[seo_bucket(score)] += sign
+
+
+def _mark_stale(session):
+    session.info[_DELTAS_KEY] = {'stale': True, 'albums': {}}
+
+
+def _snapshot(target, old):
+    """Giá trị cũ (old=True) / mới của các cột thống kê, None nếu không biết (chưa load)"""
+    state = inspect(target)
+    values = {}
+    for name in _SCORE_FIELDS:
+        added, unchanged, deleted = state.attrs[name].history
+        if unchanged:
+            values[name] = unchanged[0]
+        elif old and deleted:
+            values[name] = deleted[0]
+        elif not old and added:
+            values[name] = added[0]
+        else:
+            return None  # cột chưa load → không biết giá trị
+    return values
+
+
+@event.listens_for(Media, 'after_insert')
+def _media_inserted(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        values = inspect(target).dict
+        _add_row(session, {name: values.get(name) for name in _SCORE_FIELDS}, 1)
+
+
+@event.listens_for(Media, 'after_update')
+def _media_updated(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+    old, new = _snapshot(target, old=True), _snapshot(target, old=False)
+    if old is None or new is None:
+        _mark_stale(session)
+        return
+    _add_row(session, old, -1)
+    _add_row(session, new, 1)
+
+
+@event.listens_for(Media, 'after_delete')
+def _media_deleted(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+    old = _snapshot(target, old=True)
+    if old is None:
+        _mark_stale(session)
+    else:
+        _add_row(session, old, -1)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _media_bulk_changed(orm_execute_state):
+    """Query.update / delete trên Media không qua mapper events"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is Media:
+        _mark_stale(orm_execute_state.session)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_deltas(session):
+    deltas = session.info.pop(_DELTAS_KEY, None)
+    if not deltas:
+        return
+    with _LOCK:
+        _STATE['generation'] += 1
+        albums = _STATE['albums']
+        if albums is None:
+            return
+        if deltas['stale']:
+            _STATE['albums'] = None
+            return
+        # Copy-on-write: request khác đang đọc dict cũ
+        albums = {name: dict(values) for name, values in albums.items()}
+        for name, delta in deltas['albums'].items():
+            values = albums.setdefault(name, dict.fromkeys(_FIELDS, 0))
+            for field in _FIELDS:
+                values[field] += delta[field]
+        _STATE['albums'] = albums
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_deltas(session):
+    session.info.pop(_DELTAS_KEY, None)
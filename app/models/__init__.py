@@ -7,9 +7,10 @@ from app.models.content import Blog, FAQ
 from app.models.product import Category, Product
 from app.models.media import Banner, Media, Project
 from app.models.job import Job
-from app.models.quiz import Quiz, Question, Answer, QuizAttempt, UserAnswer
+from app.models.quiz import Quiz, Question, Answer, QuizAttempt, UserAnswer, QuizStats
 from app.models.contact import Contact
-from app.models.settings import Settings, get_setting, set_setting
+from app.models.helpers import preload_media_seo
+from app.models.settings import Settings, get_setting, set_setting, set_settings_bulk, get_settings, get_settings_group
 
 __all__ = [
     # Auth
@@ -23,9 +24,11 @@ __all__ = [
     # Job
     'Job',
     # Quiz
-    'Quiz', 'Question', 'Answer', 'QuizAttempt', 'UserAnswer',
+    'Quiz', 'Question', 'Answer', 'QuizAttempt', 'UserAnswer', 'QuizStats',
     # Contact
     'Contact',
+    # Helpers
+    'preload_media_seo',
     # Settings
-    'Settings', 'get_setting', 'set_setting'
+    'Settings', 'get_setting', 'set_setting', 'set_settings_bulk', 'get_settings', 'get_settings_group'
 ]
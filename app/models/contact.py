@@ -6,6 +6,7 @@ from datetime import datetime
 class Contact(db.Model):
     """Model lưu thông tin liên hệ từ khách hàng"""
     __tablename__ = 'contacts'
+    __table_args__ = (db.Index('ix_contacts_created_at_id', 'created_at', 'id'),)  # phân trang keyset
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -1,11 +1,14 @@
 from app import db
+from app.search import register_search_index, search_fields
 from datetime import datetime
+from sqlalchemy import event
 
 
 # ==================== BLOG MODEL ====================
 class Blog(db.Model):
     """Model tin tức / blog với SEO optimization"""
     __tablename__ = 'blogs'
+    __table_args__ = (db.Index('ix_blogs_created_at_id', 'created_at', 'id'),)  # phân trang keyset
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -31,6 +34,10 @@ class Blog(db.Model):
     meta_description = db.Column(db.String(160))  # Meta description (120-160 ký tự)
     meta_keywords = db.Column(db.String(255))  # Keywords (optional, ít quan trọng)
 
+    # Tìm kiếm không dấu (app/search.py) - tự cập nhật khi lưu
+    search_title = db.Column(db.String(255))
+    search_body = db.Column(db.Text)
+
     def __repr__(self):
         return f'<Blog {self.title}>'
 
@@ -58,8 +65,8 @@ class Blog(db.Model):
         if not self.image:
             return None
 
-        from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image)
+        from app.models.helpers import get_media_seo_by_url
+        media = get_media_seo_by_url(self.image)
 
         if media:
             return {
@@ -76,6 +83,17 @@ class Blog(db.Model):
         }
 
 
+@event.listens_for(Blog, 'before_insert')
+@event.listens_for(Blog, 'before_update')
+def _fill_blog_search(mapper, connection, target):
+    """Đổi tiêu đề / tóm tắt / nội dung → cập nhật cột tìm kiếm không dấu"""
+    for key, value in search_fields(target.title, target.excerpt, target.content).items():
+        setattr(target, key, value)
+
+
+register_search_index(Blog)
+
+
 # ==================== FAQ MODEL ====================
 class FAQ(db.Model):
     """Model câu hỏi thường gặp"""
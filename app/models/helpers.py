@@ -1,7 +1,29 @@
 """
 Helper functions cho models
 """
-from app.models.media import Media
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import event
+
+from app import db
+from app.models.media import Media, media_url_key
+
+# Thông tin SEO lấy từ Media Library (dùng được như Media: media.alt_text, media.title, ...)
+MediaSEO = namedtuple('MediaSEO', ['id', 'alt_text', 'title', 'caption'])
+
+# ==================== MEDIA SEO MEMO (process-level) ====================
+# {image_url: MediaSEO hoặc None (không có trong Media Library)}
+# - Media thêm/sửa/xóa → xóa toàn bộ (event listeners bên dưới)
+# - Tự hết hạn sau MEDIA_SEO_CACHE_TTL giây để đồng bộ với worker khác
+_MEDIA_SEO_CACHE = {
+    'entries': {},
+    'created_at': time.monotonic(),
+}
+_MEDIA_SEO_LOCK = threading.Lock()
+_DEFAULT_MEDIA_SEO_TTL = 300  # giây
+_MEDIA_SEO_MAX_ENTRIES = 5000
 
 
 def get_media_by_image_url(image_url):
@@ -13,33 +35,115 @@ def get_media_by_image_url(image_url):
     - /static/uploads/products/image.jpg (Local)
     - uploads/products/image.jpg (Local không có /)
 
+    1 lookup có index theo Media.url_key (filepath đã chuẩn hóa, migration 3f1c9a7d2b64 đã backfill)
+
     Returns: Media object hoặc None
     """
+    url_key = media_url_key(image_url)
+    if not url_key:
+        return None
+
+    return Media.query.filter_by(url_key=url_key).order_by(Media.id).first()
+
+
+def _media_seo_ttl():
+    from flask import current_app, has_app_context
+    if has_app_context():
+        return current_app.config.get('MEDIA_SEO_CACHE_TTL', _DEFAULT_MEDIA_SEO_TTL)
+    return _DEFAULT_MEDIA_SEO_TTL
+
+
+def _memo_entries():
+    """Dict memo hiện tại (reset nếu đã hết TTL)"""
+    if time.monotonic() - _MEDIA_SEO_CACHE['created_at'] > _media_seo_ttl():
+        clear_media_seo_cache()
+    return _MEDIA_SEO_CACHE['entries']
+
+
+def clear_media_seo_cache():
+    """Xóa memo URL → Media SEO (gọi khi Media thay đổi)"""
+    with _MEDIA_SEO_LOCK:
+        _MEDIA_SEO_CACHE['entries'] = {}
+        _MEDIA_SEO_CACHE['created_at'] = time.monotonic()
+
+
+def resolve_media_seo(image_urls):
+    """
+    Resolve nhiều image URL → MediaSEO trong 1 query IN theo url_key
+    (cùng thứ tự ưu tiên với get_media_by_image_url)
+
+    Args:
+        image_urls: Iterable các URL ảnh (bỏ qua None/rỗng)
+
+    Returns:
+        dict: {image_url: MediaSEO hoặc None}
+    """
+    entries = _memo_entries()
+    urls = {url for url in image_urls if url}
+    result = {url: entries[url] for url in urls if url in entries}
+    missing = urls - result.keys()
+    if not missing:
+        return result
+
+    keys = {url: media_url_key(url) for url in missing}
+    rows = (db.session.query(Media.id, Media.url_key, Media.alt_text, Media.title, Media.caption)
+            .filter(Media.url_key.in_({key for key in keys.values() if key}))
+            .order_by(Media.id)
+            .all())
+
+    # Giữ bản ghi đầu tiên (id nhỏ nhất) cho mỗi url_key, giống .first()
+    by_key = {}
+    for row in rows:
+        by_key.setdefault(row.url_key, MediaSEO(row.id, row.alt_text, row.title, row.caption))
+
+    resolved = {url: by_key.get(key) for url, key in keys.items()}
+
+    with _MEDIA_SEO_LOCK:
+        if len(entries) + len(resolved) > _MEDIA_SEO_MAX_ENTRIES:
+            entries.clear()
+        entries.update(resolved)
+
+    result.update(resolved)
+    return result
+
+
+def get_media_seo_by_url(image_url):
+    """
+    Lấy MediaSEO cho 1 image URL (đọc memo trước, chỉ query khi chưa có)
+
+    Returns: MediaSEO hoặc None
+    """
     if not image_url:
         return None
+    return resolve_media_seo([image_url]).get(image_url)
 
-    # Case 1: URL Cloudinary đầy đủ - tìm theo filepath
-    if image_url.startswith('http://') or image_url.startswith('https://'):
-        return Media.query.filter_by(filepath=image_url).first()
 
-    # Case 2: Local path - tìm theo filename
-    # Lấy tên file: /static/uploads/products/abc.jpg → abc.jpg
-    filename = image_url.split('/')[-1]
+def preload_media_seo(*collections):
+    """
+    Resolve trước SEO info của ảnh cho nhiều entity (Product, Blog, Banner, Project)
+    trong 1 query, để get_media_seo_info() trong template không query từng card
 
-    # Tìm theo filename (ưu tiên)
-    media = Media.query.filter_by(filename=filename).first()
+    Args:
+        *collections: Các list entity (hoặc 1 entity), None được bỏ qua
 
-    if media:
-        return media
+    Usage:
+        preload_media_seo(banners, featured_products, latest_products)
+    """
+    urls = set()
+    for collection in collections:
+        if collection is None:
+            continue
+        if not isinstance(collection, (list, tuple, set)):
+            collection = [collection]
+        for entity in collection:
+            urls.add(getattr(entity, 'image', None))
+            urls.add(getattr(entity, 'image_mobile', None))
+    resolve_media_seo(urls)
 
-    # Case 3: Nếu không tìm thấy, thử chuẩn hóa path và tìm lại
-    normalized_path = image_url
-    if not normalized_path.startswith('/'):
-        normalized_path = '/' + normalized_path
-    if not normalized_path.startswith('/static/'):
-        if normalized_path.startswith('/uploads/'):
-            normalized_path = '/static' + normalized_path
-        else:
-            normalized_path = '/static/' + normalized_path.lstrip('/')
 
-    return Media.query.filter_by(filepath=normalized_path).first()
\ No newline at end of file
+@event.listens_for(Media, 'after_insert')
+@event.listens_for(Media, 'after_update')
+@event.listens_for(Media, 'after_delete')
+def _media_changed(mapper, connection, target):
+    """Media thêm/sửa/xóa → memo có thể sai (kể cả các URL trước đó không tìm thấy)"""
+    clear_media_seo_cache()
@@ -1,5 +1,7 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import case, event, func
+from sqlalchemy.ext.hybrid import hybrid_property
 
 
 # ==================== BANNER MODEL ====================
@@ -26,8 +28,8 @@ class Banner(db.Model):
         if not self.image:
             return None
 
-        from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image)
+        from app.models.helpers import get_media_seo_by_url
+        media = get_media_seo_by_url(self.image)
 
         if media:
             return {
@@ -46,8 +48,8 @@ class Banner(db.Model):
         if not self.image_mobile:
             return self.get_media_seo_info()  # Fallback về ảnh desktop
 
-        from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image_mobile)
+        from app.models.helpers import get_media_seo_by_url
+        media = get_media_seo_by_url(self.image_mobile)
 
         if media:
             return {
@@ -60,14 +62,68 @@ class Banner(db.Model):
 
 
 # ==================== MEDIA MODEL ====================
+def media_url_key(image_url):
+    """
+    Chuẩn hóa URL ảnh thành key dùng cho cột Media.url_key
+
+    - https://res.cloudinary.com/.../image.jpg → giữ nguyên
+    - /static/uploads/products/image.jpg → giữ nguyên
+    - /uploads/products/image.jpg, uploads/products/image.jpg → /static/uploads/products/image.jpg
+
+    Returns: str hoặc None
+    """
+    if not image_url:
+        return None
+
+    image_url = image_url.strip()
+    if image_url.startswith('http://') or image_url.startswith('https://'):
+        return image_url
+
+    normalized_path = image_url
+    if not normalized_path.startswith('/'):
+        normalized_path = '/' + normalized_path
+    if not normalized_path.startswith('/static/'):
+        if normalized_path.startswith('/uploads/'):
+            normalized_path = '/static' + normalized_path
+        else:
+            normalized_path = '/static/' + normalized_path.lstrip('/')
+    return normalized_path
+
+
+def media_seo_score(alt_text, title, caption, album):
+    """
+    Điểm SEO 0-100 của 1 ảnh (khớp Media.seo_score phía SQL)
+    - Alt text 30-125 ký tự: 50, 10-29: 30, có nhưng quá ngắn/dài: 10 (xem validate_seo_alt_text)
+    - Title: 25, caption: 15, album: 10
+    """
+    # strip(' ') như TRIM() của SQL
+    alt_length = len(alt_text.strip(' ')) if alt_text else 0
+    if 30 <= alt_length <= 125:
+        score = 50
+    elif 10 <= alt_length < 30:
+        score = 30
+    else:
+        score = 10 if alt_length else 0
+    score += 25 if title and title.strip(' ') else 0
+    score += 15 if caption and caption.strip(' ') else 0
+    score += 10 if album and album.strip(' ') else 0
+    return score
+
+
+def _filled(column, points):
+    return case((func.length(func.trim(func.coalesce(column, ''))) > 0, points), else_=0)
+
+
 class Media(db.Model):
     """Model quản lý hình ảnh/media files với SEO optimization"""
     __tablename__ = 'media'
 
     id = db.Column(db.Integer, primary_key=True)
-    filename = db.Column(db.String(255), nullable=False)
+    filename = db.Column(db.String(255), nullable=False, index=True)
     original_filename = db.Column(db.String(255))
-    filepath = db.Column(db.String(500), nullable=False)
+    filepath = db.Column(db.String(500), nullable=False, index=True)
+    # Key chuẩn hóa từ filepath (xem media_url_key) → tra ảnh bằng 1 lookup có index
+    url_key = db.Column(db.String(500), index=True)
     file_type = db.Column(db.String(50))
     file_size = db.Column(db.Integer)
     width = db.Column(db.Integer)
@@ -79,11 +135,11 @@ class Media(db.Model):
     caption = db.Column(db.Text)
 
     # Organization
-    album = db.Column(db.String(100))
+    album = db.Column(db.String(100), index=True)
 
     # Metadata
     uploaded_by = db.Column(db.Integer, db.ForeignKey('users.id'))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
@@ -97,6 +153,29 @@ class Media(db.Model):
             return round(self.file_size / (1024 * 1024), 2)
         return 0
 
+    @hybrid_property
+    def seo_score(self):
+        return media_seo_score(self.alt_text, self.title, self.caption, self.album)
+
+    @seo_score.inplace.expression
+    @classmethod
+    def _seo_score_expression(cls):
+        alt_length = func.length(func.trim(func.coalesce(cls.alt_text, '')))
+        alt_points = case(
+            (alt_length.between(30, 125), 50),
+            (alt_length.between(10, 29), 30),
+            (alt_length > 0, 10),
+            else_=0
+        )
+        return alt_points + _filled(cls.title, 25) + _filled(cls.caption, 15) + _filled(cls.album, 10)
+
+
+@event.listens_for(Media, 'before_insert')
+@event.listens_for(Media, 'before_update')
+def _fill_media_url_key(mapper, connection, target):
+    """Upload / đổi filepath → cập nhật url_key"""
+    target.url_key = media_url_key(target.filepath)
+
 
 # ==================== PROJECT MODEL ====================
 class Project(db.Model):
@@ -152,8 +231,8 @@ class Project(db.Model):
         if not self.image:
             return None
 
-        from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image)
+        from app.models.helpers import get_media_seo_by_url
+        media = get_media_seo_by_url(self.image)
 
         if media:
             return {
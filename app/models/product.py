@@ -1,5 +1,8 @@
 from app import db
+from app.cache_registry import register_cache, load_detached
+from app.search import register_search_index, search_fields
 from datetime import datetime
+from sqlalchemy import event
 
 
 # ==================== CATEGORY MODEL ====================
@@ -22,10 +25,28 @@ class Category(db.Model):
         return f'<Category {self.name}>'
 
 
+# Danh mục active cho menu/footer: cache registry, xóa ngay khi bảng categories có commit
+_CATEGORY_CACHE = register_cache('categories', ttl=300, max_size=4, models=(Category,))
+
+
+def get_active_categories():
+    """Danh sách Category active (object detached, dùng chung giữa các request)"""
+    return _CATEGORY_CACHE.get_or_load(
+        'active',
+        lambda: load_detached(lambda session: session.query(Category).filter_by(is_active=True).all())
+    )
+
+
 # ==================== PRODUCT MODEL ====================
 class Product(db.Model):
     """Model sản phẩm"""
     __tablename__ = 'products'
+    # Phân trang keyset theo ?sort= (app/pagination.py, main/routes/products.py)
+    __table_args__ = (
+        db.Index('ix_products_created_at_id', 'created_at', 'id'),
+        db.Index('ix_products_price_id', db.text('coalesce(price, 0)'), 'id'),
+        db.Index('ix_products_views_id', db.text('coalesce(views, 0)'), 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -57,6 +78,10 @@ class Product(db.Model):
     technical_specs = db.Column(db.JSON)  # Thông số kỹ thuật: dict
     standards = db.Column(db.String(200))  # Tiêu chuẩn
 
+    # Tìm kiếm không dấu (app/search.py) - tự cập nhật khi lưu
+    search_title = db.Column(db.String(255))
+    search_body = db.Column(db.Text)
+
     def __repr__(self):
         return f'<Product {self.name}>'
 
@@ -73,10 +98,10 @@ class Product(db.Model):
             return None
 
         # Import helper function
-        from app.models.helpers import get_media_by_image_url
+        from app.models.helpers import get_media_seo_by_url
 
-        # Tìm Media record
-        media = get_media_by_image_url(self.image)
+        # Tìm Media record (memo + batch, xem preload_media_seo)
+        media = get_media_seo_by_url(self.image)
 
         if media:
             return {
@@ -90,4 +115,15 @@ class Product(db.Model):
             'alt_text': self.image_alt_text or self.name,
             'title': self.image_title or self.name,
             'caption': self.image_caption
-        }
\ No newline at end of file
+        }
+
+
+@event.listens_for(Product, 'before_insert')
+@event.listens_for(Product, 'before_update')
+def _fill_product_search(mapper, connection, target):
+    """Đổi tên / mô tả → cập nhật cột tìm kiếm không dấu"""
+    for key, value in search_fields(target.name, target.description).items():
+        setattr(target, key, value)
+
+
+register_search_index(Product)
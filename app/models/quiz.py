@@ -58,31 +58,22 @@ class Quiz(db.Model):
     def __repr__(self):
         return f'<Quiz {self.title}>'
 
+    def get_stats(self):
+        """Thống kê của đề (1 query, xem app/quiz_stats.py) - danh sách nhiều đề dùng quiz_stats(ids)"""
+        from app.quiz_stats import quiz_stats
+        return quiz_stats([self.id])[self.id]
+
     def get_pass_percentage(self):
         """Tính % người đạt"""
-        total = self.attempts.filter_by(is_completed=True).count()
-        if total == 0:
-            return 0
-        passed = self.attempts.filter(
-            QuizAttempt.is_completed == True,
-            QuizAttempt.score >= self.pass_score
-        ).count()
-        return round((passed / total) * 100, 1)
+        return self.get_stats()['pass_rate']
 
     def get_average_score(self):
         """Điểm trung bình"""
-        attempts = self.attempts.filter_by(is_completed=True).all()
-        if not attempts:
-            return 0
-        return round(sum(a.score for a in attempts) / len(attempts), 1)
+        return self.get_stats()['avg_score']
 
     def get_completion_rate(self):
         """Tỷ lệ hoàn thành"""
-        total = self.attempts.count()
-        if total == 0:
-            return 0
-        completed = self.attempts.filter_by(is_completed=True).count()
-        return round((completed / total) * 100, 1)
+        return self.get_stats()['completion_rate']
 
     def generate_or_get_qr_code(self, quiz_url):
         """
@@ -149,7 +140,7 @@ class Question(db.Model):
     __tablename__ = 'questions'
 
     id = db.Column(db.Integer, primary_key=True)
-    quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), nullable=False)
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), nullable=False, index=True)
 
     question_text = db.Column(db.Text, nullable=False)  # Nội dung câu hỏi
     question_type = db.Column(db.String(50), default='multiple_choice')  # 'multiple_choice', 'true_false'
@@ -214,9 +205,10 @@ class QuizAttempt(db.Model):
     Không cần đăng nhập - chỉ lưu tên
     """
     __tablename__ = 'quiz_attempts'
+    __table_args__ = (db.Index('ix_quiz_attempts_completed_at_id', 'completed_at', 'id'),)  # phân trang keyset
 
     id = db.Column(db.Integer, primary_key=True)
-    quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), nullable=False)
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), nullable=False, index=True)
 
     # Thông tin người làm bài (KHÔNG CẦN ĐĂNG NHẬP)
     user_name = db.Column(db.String(200), nullable=False)  # Tên người làm
@@ -309,4 +301,24 @@ class UserAnswer(db.Model):
     answer = db.relationship('Answer', backref='user_answers')
 
     def __repr__(self):
-        return f'<UserAnswer Attempt:{self.attempt_id} Q:{self.question_id}>'
\ No newline at end of file
+        return f'<UserAnswer Attempt:{self.attempt_id} Q:{self.question_id}>'
+
+
+# ==================== QUIZ STATS MODEL (TỔNG HỢP THỐNG KÊ) ====================
+class QuizStats(db.Model):
+    """
+    Thống kê tổng hợp của 1 đề - cập nhật sau mỗi commit có nộp bài / sửa câu hỏi / sửa đề
+    (app/quiz_stats.py), đọc thay cho aggregate khi QUIZ_STATS_SUMMARY bật
+    """
+    __tablename__ = 'quiz_stats'
+
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id', ondelete='CASCADE'), primary_key=True)
+    total_questions = db.Column(db.Integer, default=0)
+    total_attempts = db.Column(db.Integer, default=0)
+    completed_attempts = db.Column(db.Integer, default=0)
+    passed_attempts = db.Column(db.Integer, default=0)  # điểm >= pass_score hiện tại của đề
+    avg_score = db.Column(db.Float)  # trung bình điểm các lượt đã hoàn thành
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<QuizStats Quiz {self.quiz_id}: {self.completed_attempts}/{self.total_attempts}>'
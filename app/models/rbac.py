@@ -1,5 +1,11 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import event
+
+# ==================== PERMISSION CACHE (process-level) ====================
+# {role_id: (role.updated_at, frozenset(tên permission active))}
+# Key theo updated_at: đổi quyền của role → updated_at đổi → worker nào cũng tự load lại
+_ROLE_PERMISSIONS_CACHE = {}
 
 # ==================== BẢNG TRUNG GIAN ====================
 role_permissions = db.Table('role_permissions',
@@ -34,19 +40,65 @@ class Role(db.Model):
     def __repr__(self):
         return f'<Role {self.name}>'
 
+    def get_permission_names(self):
+        """
+        Tập tên các permission active của role (frozenset)
+
+        - Per-request: lưu trong g, 1 request chỉ tính 1 lần
+        - Per-process: lưu theo (role_id, updated_at), chỉ query lại khi role thay đổi
+        """
+        from flask import g, has_app_context
+
+        request_cache = g.setdefault('_role_permission_names', {}) if has_app_context() else {}
+        names = request_cache.get(self.id)
+        if names is not None:
+            return names
+
+        cached = _ROLE_PERMISSIONS_CACHE.get(self.id)
+        if cached and cached[0] == self.updated_at:
+            names = cached[1]
+        else:
+            rows = self.permissions.filter_by(is_active=True).with_entities(Permission.name).all()
+            names = frozenset(name for (name,) in rows)
+            _ROLE_PERMISSIONS_CACHE[self.id] = (self.updated_at, names)
+
+        request_cache[self.id] = names
+        return names
+
     def has_permission(self, permission_name):
-        """Kiểm tra role có permission cụ thể không"""
+        """Kiểm tra role có permission cụ thể không (set lookup, không query)"""
+        return permission_name in self.get_permission_names()
+
+    def _has_permission_row(self, permission_name):
+        """Kiểm tra trực tiếp trong DB (dùng khi đang sửa quyền, không tin cache)"""
         return self.permissions.filter_by(name=permission_name, is_active=True).first() is not None
 
+    def touch_permissions(self):
+        """
+        Đánh dấu quyền của role đã đổi: bump updated_at + xóa cache
+        (các worker khác nhận ra qua updated_at mới)
+        """
+        from flask import g, has_app_context
+
+        from app.models.user import clear_identity_cache
+
+        self.updated_at = datetime.utcnow()
+        _ROLE_PERMISSIONS_CACHE.pop(self.id, None)
+        clear_identity_cache(role_id=self.id)
+        if has_app_context():
+            g.setdefault('_role_permission_names', {}).pop(self.id, None)
+
     def add_permission(self, permission):
         """Thêm permission vào role"""
-        if not self.has_permission(permission.name):
+        if not self._has_permission_row(permission.name):
             self.permissions.append(permission)
+            self.touch_permissions()
 
     def remove_permission(self, permission):
         """Xóa permission khỏi role"""
-        if self.has_permission(permission.name):
+        if self._has_permission_row(permission.name):
             self.permissions.remove(permission)
+            self.touch_permissions()
 
     def get_permissions_by_category(self):
         """Lấy permissions nhóm theo category"""
@@ -65,6 +117,14 @@ class Role(db.Model):
         return self.users.filter_by(is_active=True).count()
 
 
+@event.listens_for(Role, 'after_update')
+@event.listens_for(Role, 'after_delete')
+def _role_changed(mapper, connection, target):
+    """Role đổi (tên, is_active, ...) → bỏ identity cache của các user thuộc role"""
+    from app.models.user import clear_identity_cache
+    clear_identity_cache(role_id=target.id)
+
+
 # ==================== PERMISSION MODEL ====================
 class Permission(db.Model):
     """Model cho quyền hạn chi tiết"""
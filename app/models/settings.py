@@ -1,4 +1,5 @@
 from app import db
+from app.cache_registry import register_cache
 from datetime import datetime
 
 
@@ -18,15 +19,128 @@ class Settings(db.Model):
         return f'<Settings {self.key}: {self.value}>'
 
 
+# ==================== SETTINGS SNAPSHOT CACHE (cache registry) ====================
+# Toàn bộ bảng settings được load 1 lần vào dict, get_setting chỉ còn là dict lookup.
+# Snapshot = {'values': {key: value}, 'groups': {group: {key: value}}, 'version': (MAX(updated_at), COUNT(*))}
+# - Entry 'settings' trong cache registry sống SETTINGS_CACHE_CHECK_INTERVAL giây,
+#   commit ghi vào bảng settings → xóa ngay (trong process)
+# - Hết hạn: so version với DB (1 query aggregate), chỉ reload cả bảng khi đã thay đổi
+# → worker khác lưu settings thì worker này tự reload ở lần check kế tiếp
+_SETTINGS_SNAPSHOTS = register_cache('settings', ttl=5, max_size=1, models=(Settings,),
+                                     ttl_config='SETTINGS_CACHE_CHECK_INTERVAL')
+_LAST_SNAPSHOT = {'snapshot': None}
+
+
+def _settings_version():
+    """Version stamp rẻ của bảng settings: 1 query aggregate trên bảng nhỏ"""
+    max_updated, total = db.session.query(
+        db.func.max(Settings.updated_at),
+        db.func.count(Settings.id)
+    ).one()
+    return max_updated, total
+
+
+def _load_settings_snapshot():
+    """Snapshot lần trước còn đúng version thì dùng lại, không thì load cả bảng bằng 1 query"""
+    previous = _LAST_SNAPSHOT['snapshot']
+    if previous is not None and _settings_version() == previous['version']:
+        return previous
+
+    rows = db.session.query(Settings.key, Settings.value, Settings.group, Settings.updated_at).all()
+
+    values = {}
+    groups = {}
+    for row in rows:
+        values[row.key] = row.value
+        groups.setdefault(row.group, {})[row.key] = row.value
+    stamps = [row.updated_at for row in rows if row.updated_at is not None]
+
+    snapshot = {
+        'values': values,
+        'groups': groups,
+        'version': (max(stamps) if stamps else None, len(rows)),
+    }
+    _LAST_SNAPSHOT['snapshot'] = snapshot
+    return snapshot
+
+
+def _get_snapshot():
+    return _SETTINGS_SNAPSHOTS.get_or_load('snapshot', _load_settings_snapshot)
+
+
+def get_settings_snapshot():
+    """
+    Lấy snapshot dict {key: value} của toàn bộ settings
+
+    - Trong check interval: trả dict trong RAM, không query
+    - Hết interval: so version với DB, chỉ reload khi bảng đã thay đổi
+    """
+    return _get_snapshot()['values']
+
+
+def get_settings_version():
+    """(MAX(updated_at), COUNT(*)) của snapshot hiện tại - dùng làm validator (ETag, Last-Modified)"""
+    return _get_snapshot()['version']
+
+
+def clear_settings_cache():
+    """Xóa snapshot settings, lần đọc kế tiếp sẽ load lại từ DB"""
+    _LAST_SNAPSHOT['snapshot'] = None
+    _SETTINGS_SNAPSHOTS.invalidate()
+
+
 # ==================== HELPER FUNCTIONS ====================
 def get_setting(key, default=None):
-    """Lấy giá trị setting từ DB"""
-    setting = Settings.query.filter_by(key=key).first()
-    return setting.value if setting else default
+    """Lấy giá trị setting (đọc từ snapshot cache, không query mỗi lần)"""
+    return get_settings_snapshot().get(key, default)
 
 
-def set_setting(key, value, group='general', description=''):
-    """Lưu hoặc cập nhật setting"""
+def get_settings(*keys, defaults=None):
+    """
+    Lấy nhiều settings cùng lúc (1 lần đọc snapshot)
+
+    Args:
+        *keys: Các key cần lấy, hoặc 1 list/tuple key,
+               hoặc 1 dict {key: default}
+        defaults (dict): Giá trị mặc định theo key (optional)
+
+    Returns:
+        dict: {key: value}
+
+    Usage:
+        get_settings('website_name', 'hotline')
+        get_settings({'website_name': 'BRICON VIỆT NAM', 'hotline': ''})
+    """
+    defaults = dict(defaults or {})
+    if len(keys) == 1 and isinstance(keys[0], dict):
+        defaults = {**keys[0], **defaults}
+        keys = tuple(keys[0])
+    elif len(keys) == 1 and isinstance(keys[0], (list, tuple, set)):
+        keys = tuple(keys[0])
+
+    snapshot = get_settings_snapshot()
+    return {key: snapshot.get(key, defaults.get(key)) for key in keys}
+
+
+def get_settings_group(group, defaults=None):
+    """
+    Lấy toàn bộ settings của 1 nhóm (general, theme, seo, contact, ...)
+
+    Args:
+        group (str): Tên nhóm
+        defaults (dict): Giá trị mặc định cho key chưa có trong DB (optional)
+
+    Returns:
+        dict: {key: value} - bản copy, sửa thoải mái không ảnh hưởng cache
+    """
+    values = dict(defaults or {})
+    values.update(_get_snapshot()['groups'].get(group, {}))
+    return values
+
+
+def _normalize_setting_value(value, description=''):
+    """Chuẩn hóa value về string (xử lý cả tuple (filepath, metadata) từ save_upload_file)"""
+    description = description or ''
 
     # BƯỚC 1: XỬ LÝ TUPLE TRƯỚC KHI GÁN (chỉ 1 lần duy nhất)
     if isinstance(value, tuple):
@@ -42,6 +156,13 @@ def set_setting(key, value, group='general', description=''):
     if not isinstance(value, str):
         value = str(value) if value is not None else ''
 
+    return value, description
+
+
+def set_setting(key, value, group='general', description=''):
+    """Lưu hoặc cập nhật setting"""
+    value, description = _normalize_setting_value(value, description)
+
     # BƯỚC 3: TÌM HOẶC TẠO SETTING
     setting = Settings.query.filter_by(key=key).first()
 
@@ -53,6 +174,59 @@ def set_setting(key, value, group='general', description=''):
         setting = Settings(key=key, value=value, group=group, description=description)
         db.session.add(setting)
 
-    # BƯỚC 4: COMMIT
+    # BƯỚC 4: COMMIT + LÀM MỚI SNAPSHOT CACHE
+    db.session.commit()
+    clear_settings_cache()
+    return setting
+
+
+def set_settings_bulk(items):
+    """
+    Lưu nhiều settings trong 1 lần: 1 SELECT + batch UPDATE/INSERT (executemany) + 1 commit
+
+    Args:
+        items (dict): {key: (value, group, description)}
+                      group/description có thể bỏ (mặc định 'general', '')
+
+    Returns:
+        int: Số settings đã lưu
+
+    Usage:
+        set_settings_bulk({
+            'website_name': (form.website_name.data, 'general', 'Tên website'),
+            'hotline': (form.hotline.data, 'general', 'Số hotline'),
+        })
+    """
+    if not items:
+        return 0
+
+    # BƯỚC 1: 1 SELECT (chỉ lấy id, key) cho tất cả key đã tồn tại
+    existing_ids = dict(
+        db.session.query(Settings.key, Settings.id).filter(Settings.key.in_(list(items))).all()
+    )
+
+    # BƯỚC 2: Chia thành 2 batch executemany: UPDATE theo id + INSERT
+    now = datetime.utcnow()
+    to_update = []
+    to_insert = []
+    for key, spec in items.items():
+        if not isinstance(spec, (tuple, list)):
+            spec = (spec,)
+        value, group, description = (tuple(spec) + ('general', ''))[:3]
+        value, description = _normalize_setting_value(value, description)
+
+        row = {'value': value, 'group': group, 'description': description, 'updated_at': now}
+        if key in existing_ids:
+            to_update.append({'id': existing_ids[key], **row})
+        else:
+            to_insert.append({'key': key, **row})
+
+    if to_update:
+        db.session.execute(db.update(Settings), to_update)
+    if to_insert:
+        db.session.execute(db.insert(Settings), to_insert)
+
+    # BƯỚC 3: 1 COMMIT + LÀM MỚI SNAPSHOT CACHE
     db.session.commit()
-    return setting
\ No newline at end of file
+    clear_settings_cache()
+    return len(items)
@@ -73,6 +73,17 @@ class User(db.Model, UserMixin):
         """Lấy màu badge role (danger, primary, info, secondary)"""
         return self.role_obj.color if self.role_obj else 'secondary'
 
+    def get_permission_names(self):
+        """
+        Tập tên permissions của user (frozenset, cache theo role)
+
+        Returns:
+            frozenset: Rỗng nếu user không có role hoặc bị khóa
+        """
+        if not self.role_obj or not self.is_active:
+            return frozenset()
+        return self.role_obj.get_permission_names()
+
     def has_permission(self, permission_name):
         """
         Kiểm tra user có quyền cụ thể không
@@ -83,9 +94,7 @@ class User(db.Model, UserMixin):
         Returns:
             bool: True nếu có quyền
         """
-        if not self.role_obj or not self.is_active:
-            return False
-        return self.role_obj.has_permission(permission_name)
+        return permission_name in self.get_permission_names()
 
     def has_any_permission(self, *permission_names):
         """
@@ -97,7 +106,7 @@ class User(db.Model, UserMixin):
         Returns:
             bool: True nếu có ít nhất 1 quyền
         """
-        return any(self.has_permission(perm) for perm in permission_names)
+        return not self.get_permission_names().isdisjoint(permission_names)
 
     def has_all_permissions(self, *permission_names):
         """
@@ -109,7 +118,7 @@ class User(db.Model, UserMixin):
         Returns:
             bool: True nếu có đủ tất cả quyền
         """
-        return all(self.has_permission(perm) for perm in permission_names)
+        return self.get_permission_names().issuperset(permission_names)
 
     def get_permissions(self):
         """
@@ -138,10 +147,146 @@ class User(db.Model, UserMixin):
 
 
 # ==================== USER LOADER ====================
+# Identity cache (process-level, sống ngắn): {user_id: entry}
+# entry = {user, role: dict cột, role_id, permissions: frozenset, expires_at}
+# - Hit: 1 query nhẹ SELECT users.updated_at, role_id, roles.updated_at để đối chiếu
+#   → khớp: dựng lại User/Role vào session hiện tại; lệch (worker khác sửa user / role / quyền): load lại
+# - Miss/hết TTL: 1 query join users + roles + permissions
+# - User/Role bị sửa trong process này → xóa entry ngay (event listeners bên dưới)
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 from app import login_manager
 
+_IDENTITY_CACHE = {}
+_IDENTITY_LOCK = threading.Lock()
+_DEFAULT_IDENTITY_TTL = 30  # giây
+
+
+def _identity_ttl():
+    from flask import current_app, has_app_context
+    if has_app_context():
+        return current_app.config.get('LOGIN_IDENTITY_CACHE_TTL', _DEFAULT_IDENTITY_TTL)
+    return _DEFAULT_IDENTITY_TTL
+
+
+def _column_values(obj):
+    """Lấy giá trị các cột của 1 model instance thành dict"""
+    return {attr.key: getattr(obj, attr.key) for attr in obj.__mapper__.column_attrs}
+
+
+def _attach(model, values):
+    """Dựng lại instance từ dict cột và gắn vào session như vừa load từ DB (không query)"""
+    obj = model(**values)
+    make_transient_to_detached(obj)
+    return db.session.merge(obj, load=False)
+
+
+def _load_identity(user_id):
+    """1 query duy nhất: user + role + tên các permission active"""
+    from app.models.rbac import Role, Permission, role_permissions
+
+    rows = (db.session.query(User, Role, Permission.name)
+            .outerjoin(Role, User.role_id == Role.id)
+            .outerjoin(role_permissions, role_permissions.c.role_id == Role.id)
+            .outerjoin(Permission, db.and_(Permission.id == role_permissions.c.permission_id,
+                                           Permission.is_active == True))
+            .filter(User.id == user_id)
+            .all())
+    if not rows:
+        return None, None, frozenset()
+
+    user, role = rows[0][0], rows[0][1]
+    set_committed_value(user, 'role_obj', role)
+    permissions = frozenset(name for _, _, name in rows if name)
+    return user, role, permissions
+
+
+def _identity_version(user_id):
+    """(users.updated_at, users.role_id, roles.updated_at) hiện tại trong DB, None nếu user không còn"""
+    from app.models.rbac import Role
+
+    return (db.session.query(User.updated_at, User.role_id, Role.updated_at)
+            .outerjoin(Role, User.role_id == Role.id)
+            .filter(User.id == user_id)
+            .first())
+
+
+def _entry_version(entry):
+    role = entry['role']
+    return (entry['user']['updated_at'], entry['role_id'], role['updated_at'] if role is not None else None)
+
+
+def _prime_permission_cache(role, permissions):
+    """Đưa permissions vừa load vào cache của role (per-request + per-process)"""
+    from flask import g, has_app_context
+    from app.models.rbac import _ROLE_PERMISSIONS_CACHE
+
+    _ROLE_PERMISSIONS_CACHE[role.id] = (role.updated_at, permissions)
+    if has_app_context():
+        g.setdefault('_role_permission_names', {})[role.id] = permissions
+
+
+def clear_identity_cache(user_id=None, role_id=None):
+    """Xóa identity cache: theo user, theo role, hoặc toàn bộ"""
+    with _IDENTITY_LOCK:
+        if user_id is None and role_id is None:
+            _IDENTITY_CACHE.clear()
+            return
+        for uid, entry in list(_IDENTITY_CACHE.items()):
+            if uid == user_id or (role_id is not None and entry['role_id'] == role_id):
+                _IDENTITY_CACHE.pop(uid, None)
+
 
 @login_manager.user_loader
 def load_user(user_id):
-    """Load user cho Flask-Login"""
-    return User.query.get(int(user_id))
\ No newline at end of file
+    """Load user cho Flask-Login (user + role + permissions trong tối đa 1 query)"""
+    from app.models.rbac import Role
+
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    entry = _IDENTITY_CACHE.get(user_id)
+    if entry and entry['expires_at'] > time.monotonic():
+        version = _identity_version(user_id)
+        if version is None:
+            clear_identity_cache(user_id=user_id)
+            return None
+        if tuple(version) == _entry_version(entry):
+            user = _attach(User, entry['user'])
+            role = _attach(Role, entry['role']) if entry['role'] is not None else None
+            # Gán sẵn role_obj (không tạo history) → truy cập role_obj không lazy-load
+            set_committed_value(user, 'role_obj', role)
+            if role is not None:
+                # Đã đối chiếu roles.updated_at với DB → permissions trong entry còn đúng
+                _prime_permission_cache(role, entry['permissions'])
+            return user
+
+    user, role, permissions = _load_identity(user_id)
+    if user is None:
+        clear_identity_cache(user_id=user_id)
+        return None
+
+    if role is not None:
+        _prime_permission_cache(role, permissions)
+
+    with _IDENTITY_LOCK:
+        _IDENTITY_CACHE[user_id] = {
+            'user': _column_values(user),
+            'role': _column_values(role) if role is not None else None,
+            'role_id': role.id if role is not None else None,
+            'permissions': permissions,
+            'expires_at': time.monotonic() + _identity_ttl(),
+        }
+    return user
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    """User đổi (role, is_active, ...) → bỏ identity cache của user đó"""
+    clear_identity_cache(user_id=target.id)
@@ -0,0 +1,157 @@
+"""
+Bộ đếm lượt xem trì hoãn (deferred, coalesced)
+
+Trang chi tiết (product, blog, project, job) không còn UPDATE + commit mỗi GET:
+- record_view() chỉ cộng vào bộ đếm trong RAM
+- Thread nền gom lại và flush mỗi VIEW_COUNTER_FLUSH_INTERVAL giây:
+  UPDATE <table> SET views = views + n WHERE id = ? (executemany theo từng bảng)
+- Flush lần cuối khi worker thoát (atexit)
+
+VIEW_COUNTER_FLUSH_INTERVAL <= 0 → flush ngay trong request (dùng cho test/dev)
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+
+from sqlalchemy import bindparam, func
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_FLUSH_INTERVAL = 5  # giây
+
+# {(Model, field, id): số lượt xem chưa ghi DB}
+_PENDING_VIEWS = Counter()
+_VIEWS_LOCK = threading.Lock()
+_FLUSHER = {'thread': None, 'pid': None, 'app': None, 'stop': threading.Event()}
+
+
+def _flush_interval(app):
+    return app.config.get('VIEW_COUNTER_FLUSH_INTERVAL', _DEFAULT_FLUSH_INTERVAL)
+
+
+def record_view(obj, field='views'):
+    """
+    Ghi nhận 1 lượt xem cho entity (không ghi DB ngay)
+
+    Giá trị trên object được tăng luôn (không đánh dấu dirty) để template hiển thị đúng.
+
+    Args:
+        obj: Product, Blog, Project, Job...
+        field: Tên cột đếm ('views' hoặc 'view_count')
+
+    Usage:
+        record_view(product)
+        record_view(job, 'view_count')
+    """
+    from flask import g
+
+    set_committed_value(obj, field, (getattr(obj, field) or 0) + 1)
+    record_view_id(type(obj), obj.id, field)
+
+    # Page cache (app/page_cache.py) lưu lại để cộng lượt xem khi trả trang từ cache
+    g.setdefault('recorded_views', []).append((type(obj), obj.id, field))
+
+
+def record_view_id(model, obj_id, field='views'):
+    """Ghi nhận 1 lượt xem theo (Model, id) - không cần load object"""
+    from flask import current_app
+
+    app = current_app._get_current_object()
+    with _VIEWS_LOCK:
+        _PENDING_VIEWS[(model, field, obj_id)] += 1
+
+    if _flush_interval(app) <= 0:
+        flush_view_counts(app)
+    else:
+        _ensure_flusher(app)
+
+
+def flush_view_counts(app=None):
+    """
+    Ghi các lượt xem đang chờ xuống DB (mỗi bảng/cột 1 executemany)
+
+    Lỗi DB → trả lại bộ đếm để lần flush sau ghi tiếp.
+
+    Returns:
+        int: Số lượt xem đã ghi
+    """
+    with _VIEWS_LOCK:
+        pending = dict(_PENDING_VIEWS)
+        _PENDING_VIEWS.clear()
+    if not pending:
+        return 0
+
+    grouped = {}
+    for (model, field, obj_id), count in pending.items():
+        grouped.setdefault((model, field), []).append({'_id': obj_id, '_n': count})
+
+    try:
+        if app is None:
+            _write_views(grouped)
+        else:
+            with app.app_context():
+                _write_views(grouped)
+    except Exception:
+        logger.exception('Flush view counters thất bại, giữ lại để thử lại')
+        with _VIEWS_LOCK:
+            _PENDING_VIEWS.update(pending)
+        return 0
+
+    return sum(pending.values())
+
+
+def _write_views(grouped):
+    with db.engine.begin() as conn:
+        for (model, field), rows in grouped.items():
+            table = model.__table__
+            column = table.c[field]
+            values = {field: func.coalesce(column, 0) + bindparam('_n')}
+            # Giữ nguyên updated_at (tránh onupdate) - lượt xem không phải là sửa nội dung
+            if 'updated_at' in table.c:
+                values['updated_at'] = table.c.updated_at
+            stmt = (table.update()
+                    .where(table.c.id == bindparam('_id'))
+                    .values(values))
+            conn.execute(stmt, rows)
+
+
+def _ensure_flusher(app):
+    """Khởi động thread flush (lazy, 1 thread / process - an toàn sau fork của gunicorn)"""
+    if _FLUSHER['thread'] is not None and _FLUSHER['pid'] == os.getpid():
+        return
+
+    with _VIEWS_LOCK:
+        if _FLUSHER['thread'] is not None and _FLUSHER['pid'] == os.getpid():
+            return
+        if _FLUSHER['pid'] not in (None, os.getpid()):
+            # Process con sau fork: bộ đếm kế thừa từ process cha không thuộc về worker này
+            _PENDING_VIEWS.clear()
+
+        _FLUSHER['app'] = app
+        _FLUSHER['pid'] = os.getpid()
+        _FLUSHER['stop'] = threading.Event()
+        thread = threading.Thread(target=_flush_loop, args=(app, _FLUSHER['stop']),
+                                  name='view-counter-flush', daemon=True)
+        _FLUSHER['thread'] = thread
+        thread.start()
+
+
+def _flush_loop(app, stop):
+    interval = _flush_interval(app)
+    while not stop.wait(interval):
+        flush_view_counts(app)
+
+
+@atexit.register
+def _flush_on_exit():
+    """Worker thoát → ghi nốt lượt xem còn trong RAM"""
+    app = _FLUSHER['app']
+    if app is None or _FLUSHER['pid'] != os.getpid():
+        return
+    _FLUSHER['stop'].set()
+    flush_view_counts(app)
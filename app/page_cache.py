@@ -0,0 +1,283 @@
+"""
+Full-page response cache cho trang public (khách chưa đăng nhập)
+
+- Key: host + path + các query param mà view đọc (@cached_page(params=...), sort, bỏ giá trị rỗng)
+  → param lạ (?x=1, utm_*, fbclid...) dùng chung 1 entry, không làm đầy cache
+- Bỏ qua: không phải GET, user đã đăng nhập, session đang có flash message
+- Không lưu: status != 200, response làm thay đổi session (vd: CSRF token, flash)
+
+CONDITIONAL GET (validator=...):
+- validator(**view_kwargs) → (last_modified, seed) từ 1 query nhỏ (row_stamp / table_stamp)
+- ETag mạnh = hash(path, query, seed, version token các bảng, settings version, STATIC_VERSION)
+- If-None-Match / If-Modified-Since khớp → 304 trước khi chạy view/render
+
+INVALIDATION (model-driven):
+- Mỗi trang khai báo các bảng nó phụ thuộc: @cached_page('products', 'media')
+- settings + categories (header/footer/menu) là phụ thuộc chung của mọi trang
+- Mỗi bảng có 1 version token trong RAM của process (không nằm trong cache → không bị prune khi
+  cache vượt CACHE_THRESHOLD); key của trang chứa token các bảng phụ thuộc
+- Commit ghi vào bảng (theo dõi bởi app/cache_registry.py) → đổi token các bảng đó
+  → trang cũ không còn khớp key
+
+Usage:
+    @main_bp.route('/san-pham/<slug>')
+    @cached_page('products', 'media',
+                 validator=lambda slug: row_stamp(Product, slug=slug))
+    def product_detail(slug):
+        ...
+
+    @cached_page('products', params=('page', 'cursor', 'search', 'sort'))
+    def products():
+        ...
+"""
+import hashlib
+import threading
+import time
+from datetime import timezone
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, g, request, session
+from flask_login import current_user
+from sqlalchemy import func, select
+
+from app import cache, db
+from app.cache_registry import on_tables_committed
+
+# Bảng mà mọi trang public đều đọc (base.html: settings, menu danh mục)
+GLOBAL_DEPENDENCIES = ('settings', 'categories')
+
+# {tên bảng: version token} - riêng từng process
+_VERSION_TOKENS = {}
+_VERSION_LOCK = threading.Lock()
+
+# Header không được phát lại từ cache
+_SKIPPED_HEADERS = {'set-cookie', 'content-length', 'vary', 'x-page-cache', 'etag', 'last-modified'}
+
+# Flask-Compress thêm hậu tố thuật toán vào ETag: "abc" → "abc:gzip"
+_COMPRESS_SUFFIXES = ('gzip', 'br', 'deflate', 'zstd')
+
+
+# ==================== KEY ====================
+def _normalized_query_string(params):
+    """Query string chỉ gồm các param view đọc (params), đã sort"""
+    return urlencode(sorted(
+        (key, value) for key, value in request.args.items(multi=True)
+        if key in params and value != ''
+    ))
+
+
+def _version_tokens(tables):
+    """Token hiện tại của từng bảng (bảng chưa có token → tạo mới)"""
+    with _VERSION_LOCK:
+        return [_VERSION_TOKENS.setdefault(table, time.time_ns()) for table in tables]
+
+
+def _page_key(tokens, params):
+    versions = '.'.join(str(token) for token in tokens)
+    return f'page:{request.host}{request.path}?{_normalized_query_string(params)}:{versions}'
+
+
+def _is_cacheable_request():
+    if not current_app.config.get('PAGE_CACHE_ENABLED', True):
+        return False
+    if request.method != 'GET':
+        return False
+    if session.get('_flashes'):
+        return False
+    return not current_user.is_authenticated
+
+
+# ==================== DECORATOR ====================
+def cached_page(*tables, validator=None, params=()):
+    """
+    Cache toàn bộ response của view cho khách chưa đăng nhập (+ conditional GET nếu có validator)
+
+    Args:
+        *tables: Tên bảng (__tablename__) mà trang đọc, ngoài GLOBAL_DEPENDENCIES
+        validator: Hàm nhận kwargs của view, trả (last_modified, seed) hoặc None
+                   (None → bỏ qua ETag, vd: slug không tồn tại → để view trả 404)
+        params: Query param mà view (và template) đọc - chỉ các param này tạo key / ETag riêng
+    """
+    dependencies = tuple(dict.fromkeys(GLOBAL_DEPENDENCIES + tables))
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not _is_cacheable_request():
+                return f(*args, **kwargs)
+
+            tokens = _version_tokens(dependencies)
+
+            validators = None
+            if validator is not None and current_app.config.get('CONDITIONAL_GET_ENABLED', True):
+                stamp = validator(**kwargs)
+                if stamp is not None:
+                    validators = _make_validators(stamp, tokens, params)
+                    matched_etag = _matched_etag(validators[0])
+                    if matched_etag or _not_modified_since(validators[1]):
+                        return _not_modified(matched_etag or validators[0], validators[1])
+
+            key = _page_key(tokens, params)
+            entry = cache.get(key)
+            if entry is not None:
+                response = _replay(entry)
+            else:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code == 200 and not session.modified and not response.direct_passthrough:
+                    cache.set(key, _snapshot(response),
+                              timeout=current_app.config.get('PAGE_CACHE_TIMEOUT', 300))
+                response.headers['X-Page-Cache'] = 'MISS'
+
+            if validators is not None and response.status_code == 200:
+                _set_validators(response, *validators)
+            return response
+
+        return decorated_function
+
+    return decorator
+
+
+def _snapshot(response):
+    return {
+        'body': response.get_data(),
+        'status': response.status_code,
+        'headers': [(name, value) for name, value in response.headers
+                    if name.lower() not in _SKIPPED_HEADERS],
+        # Lượt xem ghi trong lần render đầu (record_view) → phát lại khi HIT
+        'views': [(model, obj_id, field) for model, obj_id, field in g.get('recorded_views', [])],
+    }
+
+
+def _replay(entry):
+    from app.models.view_counter import record_view_id
+
+    for model, obj_id, field in entry['views']:
+        record_view_id(model, obj_id, field)
+
+    response = current_app.response_class(entry['body'], status=entry['status'],
+                                          headers=entry['headers'])
+    response.headers['X-Page-Cache'] = 'HIT'
+    return response
+
+
+# ==================== CONDITIONAL GET ====================
+def row_stamp(model, **filters):
+    """
+    Validator cho trang chi tiết: 1 lookup theo index (slug unique)
+
+    Returns: (updated_at, id) hoặc None nếu không có bản ghi active
+    """
+    row = (db.session.query(model.id, model.updated_at)
+           .filter_by(is_active=True, **filters)
+           .first())
+    if row is None or row.updated_at is None:
+        return None
+    return row.updated_at, row.id
+
+
+def table_stamp(*models):
+    """
+    Validator cho trang danh sách: MAX(updated_at) + COUNT(*) các bản ghi active
+    của nhiều bảng trong 1 query (scalar subqueries)
+
+    Returns: (max updated_at, (count, ...)) hoặc None nếu bảng rỗng
+    """
+    columns = []
+    for model in models:
+        active = model.is_active == True  # noqa: E712
+        columns.append(select(func.max(model.updated_at)).where(active).scalar_subquery())
+        columns.append(select(func.count(model.id)).where(active).scalar_subquery())
+    row = db.session.execute(select(*columns)).one()
+
+    stamps = [value for value in row[0::2] if value is not None]
+    if not stamps:
+        return None
+    return max(stamps), tuple(row[1::2])
+
+
+def _make_validators(stamp, tokens, params):
+    """(ETag, Last-Modified) từ validator của view + settings + version token các bảng"""
+    from app.models.settings import get_settings_version
+
+    last_modified, seed = stamp
+    settings_updated, settings_count = get_settings_version()
+    if settings_updated is not None:
+        last_modified = max(last_modified, settings_updated)
+
+    raw = '|'.join(str(part) for part in (
+        request.host, request.path, _normalized_query_string(params), seed,
+        last_modified.isoformat(), settings_count, '.'.join(str(token) for token in tokens),
+        current_app.config.get('STATIC_VERSION'),
+    ))
+    etag = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return etag, last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+
+
+def _matched_etag(etag):
+    """ETag client gửi (kể cả bản có hậu tố :gzip/:br của Flask-Compress) khớp → trả lại đúng tag đó"""
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return None
+    for candidate in (etag, *(f'{etag}:{suffix}' for suffix in _COMPRESS_SUFFIXES)):
+        if if_none_match.contains(candidate):
+            return candidate
+    return None
+
+
+def _not_modified_since(last_modified):
+    # If-None-Match có mặt thì If-Modified-Since bị bỏ qua (RFC 9110)
+    if request.if_none_match or request.if_modified_since is None:
+        return False
+    return last_modified <= request.if_modified_since
+
+
+def _set_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    # Cho phép lưu nhưng luôn hỏi lại server (rẻ nhờ 304)
+    response.cache_control.no_cache = True
+
+
+def _not_modified(etag, last_modified):
+    response = current_app.response_class(status=304)
+    _set_validators(response, etag, last_modified)
+    response.headers['X-Page-Cache'] = 'NOT-MODIFIED'
+    return response
+
+
+# ==================== FRAGMENT CACHE ====================
+def fragment_version(*tables):
+    """
+    Key cho {% cache %} (Flask-Caching jinja2ext) trong template: đổi ngay khi các bảng có commit
+
+    Usage:
+        {% cache fragment_timeout, 'layout_footer', settings_version, fragment_version('categories') %}
+    """
+    return '.'.join(str(token) for token in _version_tokens(tables))
+
+
+# ==================== INVALIDATION ====================
+def invalidate_tables(*tables):
+    """Đổi version token → mọi trang phụ thuộc các bảng này bị bỏ qua (hết hạn tự nhiên)"""
+    if not tables:
+        return
+    now = time.time_ns()
+    with _VERSION_LOCK:
+        for table in tables:
+            # Luôn tăng (2 lần invalidate trong cùng 1 tick đồng hồ vẫn ra token mới)
+            _VERSION_TOKENS[table] = max(now, _VERSION_TOKENS.get(table, 0) + 1)
+
+
+def clear_page_cache():
+    """Xóa toàn bộ page cache (CLI clear-cache)"""
+    invalidate_tables(*_known_tables())
+
+
+def _known_tables():
+    return [mapper.local_table.name for mapper in db.Model.registry.mappers]
+
+
+@on_tables_committed
+def _invalidate_committed_tables(tables):
+    invalidate_tables(*tables)
@@ -0,0 +1,250 @@
+"""
+Phân trang keyset (seek) thay cho OFFSET + COUNT(*)
+
+- Trang sau / trang trước lọc theo khóa sắp xếp của dòng cuối / đầu trang hiện tại:
+    WHERE (created_at, id) < (:created_at, :id) ORDER BY created_at DESC, id DESC LIMIT per_page + 1
+  → trang 500 tốn như trang 1 (không quét bỏ 6000 dòng), dòng thừa cho biết còn trang sau
+- Cursor mờ (base64 JSON) trong query string ?cursor=..., trang hiện tại vẫn giữ ?page=N để hiển thị
+- URL cũ ?page=N không có cursor → OFFSET 1 lần, các link tiếp theo đều có cursor
+- COUNT(*) chỉ chạy khi template đọc .total / .pages, qua cache của app/counts.py
+- cached_paginate(): OFFSET như query.paginate() (xếp theo độ liên quan...) nhưng tổng lấy từ cache
+- Tương thích components/pagination.html (has_prev, has_next, prev_num, next_num, iter_pages)
+
+Usage:
+    pagination = keyset_paginate(
+        query, [(Product.created_at, 'desc'), (Product.id, 'desc')],
+        page=request.args.get('page', 1, type=int),
+        cursor=request.args.get('cursor'),
+        per_page=12,
+    )
+"""
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import and_, literal, or_, tuple_
+
+from app.counts import cached_count
+
+_DIRECTIONS = ('asc', 'desc')
+
+
+# ==================== CURSOR ====================
+def _encode_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_cursor(direction, values):
+    """('after' | 'before', [giá trị khóa]) → chuỗi an toàn cho URL"""
+    payload = json.dumps([direction, [_encode_value(value) for value in values]], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _decode_value(column, value):
+    """Giá trị JSON → giá trị đúng kiểu cột khóa, ValueError nếu sai kiểu (cursor bị sửa tay)"""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    # bool là int trong Python nhưng không phải giá trị hợp lệ của cột số
+    if isinstance(value, bool) and python_type is not bool:
+        raise ValueError(value)
+    if python_type is int:
+        if isinstance(value, int):
+            return value
+    elif python_type in (float, Decimal):
+        if isinstance(value, (int, float)) and math.isfinite(value):
+            return value
+    elif python_type is str:
+        if isinstance(value, str):
+            return value
+    elif isinstance(value, (int, float, str)):
+        return value
+    raise ValueError(value)
+
+
+def decode_cursor(cursor, keys):
+    """Chuỗi cursor → (direction, values), None nếu hỏng / không khớp khóa (số lượng hoặc kiểu giá trị)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if direction not in ('after', 'before') or len(values) != len(keys):
+            return None
+        return direction, [_decode_value(column, value) for (column, _), value in zip(keys, values)]
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+# ==================== PAGINATION ====================
+class KeysetPagination:
+    """Kết quả 1 trang keyset - cùng thuộc tính với flask_sqlalchemy Pagination mà template dùng"""
+
+    def __init__(self, query, items, page, per_page, has_prev, has_next, cursor=None,
+                 prev_cursor=None, next_cursor=None):
+        self._count_query = query
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.has_prev = has_prev
+        self.has_next = has_next
+        self.cursor = cursor
+        self.prev_cursor = prev_cursor
+        self.next_cursor = next_cursor
+        self._total = None
+
+    @property
+    def prev_num(self):
+        return max(self.page - 1, 1) if self.has_prev else None
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+    @property
+    def total(self):
+        """COUNT(*) lazy - chỉ chạy khi template cần"""
+        if self._total is None:
+            self._total = cached_count(self._count_query, estimate=True)
+        return self._total
+
+    @property
+    def pages(self):
+        return max(1, math.ceil(self.total / self.per_page)) if self.per_page else 1
+
+    def cursor_for(self, page_num):
+        """Cursor của các trang iter_pages() trả về (trang 1 không cần cursor)"""
+        if page_num == self.page:
+            return self.cursor
+        if page_num == self.prev_num and page_num != 1:
+            return self.prev_cursor
+        if page_num == self.next_num:
+            return self.next_cursor
+        return None
+
+    def iter_pages(self, left_edge=1, right_edge=1, left_current=1, right_current=2):
+        """Trang 1, ..., trang trước, trang hiện tại, trang sau (không biết tổng số trang)"""
+        pages = [1]
+        if self.has_prev and self.prev_num > 1:
+            if self.prev_num > 2:
+                pages.append(None)
+            pages.append(self.prev_num)
+        if self.page > 1:
+            pages.append(self.page)
+        if self.has_next:
+            pages.append(self.next_num)
+        return iter(pages)
+
+
+def _seek_condition(keys, values, forward):
+    """Điều kiện "sau" (forward) / "trước" bộ giá trị khóa theo thứ tự sắp xếp"""
+    columns = [column for column, _ in keys]
+    directions = {direction for _, direction in keys}
+    # Bind theo kiểu cột (DateTime của SQLite lưu dạng chuỗi '%Y-%m-%d %H:%M:%S.%f')
+    values = [literal(value, column.type) for column, value in zip(columns, values)]
+
+    def _after(column, direction, value):
+        return column > value if (direction == 'asc') == forward else column < value
+
+    # Cận của khóa đầu (thừa về logic) → planner seek thẳng vào index thay vì quét từ đầu
+    first_column, first_direction = keys[0]
+    bound = first_column >= values[0] if (first_direction == 'asc') == forward else first_column <= values[0]
+
+    if len(directions) == 1:
+        # Cùng chiều → so sánh row value
+        row, target = tuple_(*columns), tuple_(*values)
+        return and_(bound, _after(row, directions.pop(), target))
+
+    clauses = []
+    for position, (column, direction) in enumerate(keys):
+        equal = [keys[i][0] == values[i] for i in range(position)]
+        clauses.append(and_(*equal, _after(column, direction, values[position])))
+    return and_(bound, or_(*clauses))
+
+
+def _order_clauses(keys, forward):
+    clauses = []
+    for column, direction in keys:
+        ascending = (direction == 'asc') == forward
+        clauses.append(column.asc() if ascending else column.desc())
+    return clauses
+
+
+def keyset_paginate(query, keys, page=1, per_page=20, cursor=None):
+    """
+    Phân trang keyset
+
+    Args:
+        query: Query đã filter, CHƯA order_by
+        keys: [(cột, 'asc' | 'desc'), ...] - khóa cuối phải duy nhất (id);
+              cột có thể NULL → truyền func.coalesce(cột, giá trị mặc định)
+        page: Số trang để hiển thị (?page=), dùng OFFSET khi không có cursor
+        per_page: Số dòng / trang
+        cursor: Chuỗi ?cursor= của link trước / sau
+
+    Returns:
+        KeysetPagination
+    """
+    for _, direction in keys:
+        if direction not in _DIRECTIONS:
+            raise ValueError(f'Chiều sắp xếp không hợp lệ: {direction}')
+
+    page = max(page or 1, 1)
+    decoded = decode_cursor(cursor, keys)
+    key_columns = [column.label(f'_k{position}') for position, (column, _) in enumerate(keys)]
+    rows_query = query.add_columns(*key_columns)
+
+    if decoded is None:
+        # Không có cursor: trang 1 hoặc link ?page=N cũ → OFFSET 1 lần
+        rows = (rows_query.order_by(*_order_clauses(keys, True))
+                .offset((page - 1) * per_page).limit(per_page + 1).all())
+        has_prev, has_next = page > 1, len(rows) > per_page
+        rows = rows[:per_page]
+        cursor = None
+    else:
+        direction, values = decoded
+        forward = direction == 'after'
+        rows = (rows_query.filter(_seek_condition(keys, values, forward))
+                .order_by(*_order_clauses(keys, forward))
+                .limit(per_page + 1).all())
+        more = len(rows) > per_page
+        rows = rows[:per_page]
+        if forward:
+            has_prev, has_next = True, more
+        else:
+            rows.reverse()
+            has_prev, has_next = more, True
+
+    items = [row[0] for row in rows]
+    prev_cursor = next_cursor = None
+    if rows:
+        first_values = list(rows[0][1:])
+        last_values = list(rows[-1][1:])
+        if has_prev:
+            prev_cursor = encode_cursor('before', first_values)
+        if has_next:
+            next_cursor = encode_cursor('after', last_values)
+
+    return KeysetPagination(query, items, page, per_page, has_prev, has_next,
+                            cursor=cursor, prev_cursor=prev_cursor, next_cursor=next_cursor)
+
+
+def cached_paginate(query, page=1, per_page=20, estimate=False):
+    """
+    query.paginate() (OFFSET) với tổng số dòng lấy từ cached_count() thay cho COUNT(*) mỗi lần
+
+    Args:
+        query: Query đã filter + order_by
+        estimate: True → cho phép ước lượng reltuples khi query không filter
+    """
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False, count=False)
+    pagination.total = cached_count(query, estimate=estimate)
+    return pagination
@@ -0,0 +1,128 @@
+"""
+Sampling profiler chạy trong process (không cần cài profiler ngoài)
+
+- Thread nền lấy stack Python của mọi thread (sys._current_frames) mỗi `interval` giây
+  trong `duration` giây
+- Mặc định chỉ giữ thread đang xử lý request (có frame Flask.wsgi_app) → bỏ thread gthread rảnh
+- Gộp thành collapsed stacks: "frame_gốc;...;frame_lá <số mẫu>"
+  → đưa thẳng vào flamegraph.pl / speedscope.app
+
+Mỗi process chỉ chạy 1 phiên; kết quả phiên gần nhất giữ trong RAM.
+
+Config:
+    PROFILER_ENABLED: bật route profiler trong admin (mặc định False)
+    PROFILER_MAX_SECONDS: thời gian tối đa 1 phiên
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+_APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_PROFILE_LOCK = threading.Lock()
+_PROFILE = {
+    'running': False,
+    'started_at': None,
+    'duration': 0,
+    'interval': 0,
+    'all_threads': False,
+    'samples': 0,
+    'stacks': Counter(),
+}
+
+
+def start_profile(duration=10, interval=0.01, all_threads=False):
+    """
+    Bắt đầu 1 phiên lấy mẫu ở thread nền
+
+    Args:
+        duration: Số giây lấy mẫu
+        interval: Khoảng cách giữa 2 lần lấy mẫu (giây)
+        all_threads: True → giữ cả thread rảnh / thread nền (view counter...)
+
+    Returns:
+        bool: False nếu đang có phiên khác chạy
+    """
+    with _PROFILE_LOCK:
+        if _PROFILE['running']:
+            return False
+        _PROFILE.update({
+            'running': True,
+            'started_at': time.time(),
+            'duration': duration,
+            'interval': interval,
+            'all_threads': all_threads,
+            'samples': 0,
+            'stacks': Counter(),
+        })
+
+    thread = threading.Thread(target=_sample_loop, args=(duration, interval, all_threads),
+                              name='sampling-profiler', daemon=True)
+    thread.start()
+    return True
+
+
+def profile_status():
+    """Thông tin phiên gần nhất (không kèm stacks)"""
+    with _PROFILE_LOCK:
+        status = {key: value for key, value in _PROFILE.items() if key != 'stacks'}
+        status['unique_stacks'] = len(_PROFILE['stacks'])
+    return status
+
+
+def collapsed_stacks():
+    """Kết quả dạng collapsed (mỗi dòng: 'a;b;c 42'), nhiều mẫu nhất lên trước"""
+    with _PROFILE_LOCK:
+        stacks = _PROFILE['stacks'].most_common()
+    return '\n'.join(f'{stack} {count}' for stack, count in stacks) + ('\n' if stacks else '')
+
+
+# ==================== SAMPLING ====================
+def _sample_loop(duration, interval, all_threads):
+    own_id = threading.get_ident()
+    deadline = time.monotonic() + duration
+    try:
+        while time.monotonic() < deadline:
+            batch = Counter()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = _collapse(frame, all_threads)
+                if stack:
+                    batch[stack] += 1
+            with _PROFILE_LOCK:
+                _PROFILE['stacks'].update(batch)
+                _PROFILE['samples'] += 1
+            time.sleep(interval)
+    finally:
+        with _PROFILE_LOCK:
+            _PROFILE['running'] = False
+
+
+def _collapse(frame, all_threads):
+    """Stack gốc → lá, None nếu thread không xử lý request (khi all_threads=False)"""
+    labels = []
+    in_request = all_threads
+    while frame is not None:
+        code = frame.f_code
+        if not in_request and code.co_name == 'wsgi_app' and os.sep + 'flask' + os.sep in code.co_filename:
+            in_request = True
+        labels.append(f'{code.co_name} ({_short_path(code.co_filename)})')
+        frame = frame.f_back
+    if not in_request:
+        return None
+    labels.reverse()
+    return ';'.join(labels)
+
+
+def _short_path(filename):
+    """app/... cho code của project, 'package/module.py' cho thư viện, tên file cho stdlib"""
+    if filename.startswith(_APP_ROOT):
+        return 'app/' + os.path.relpath(filename, _APP_ROOT)
+    marker = 'site-packages' + os.sep
+    index = filename.rfind(marker)
+    if index != -1:
+        return filename[index + len(marker):]
+    return os.path.basename(filename)
@@ -0,0 +1,228 @@
+"""
+Thống kê đề thi theo lô (danh sách quiz trong admin)
+
+- 1 query cho cả trang: quizzes LEFT JOIN (GROUP BY quiz_id trên quiz_attempts: COUNT / SUM(CASE) / AVG)
+  LEFT JOIN (GROUP BY quiz_id trên questions) thay cho 6 query / đề (questions.count(), attempts.count(),
+  completed, 2 count của % đạt, load toàn bộ lượt làm bài để tính điểm trung bình)
+- QUIZ_STATS_SUMMARY bật → bảng tổng hợp quiz_stats: sau mỗi commit có nộp bài / thêm-xóa câu hỏi /
+  sửa đề → upsert lại dòng của các đề đó (khóa dòng quizzes, tránh 2 worker ghi đè nhau),
+  danh sách đọc thẳng từ bảng này (không quét quiz_attempts). Tắt → không đăng ký event, không ghi gì
+
+Usage:
+    stats = quiz_stats([quiz.id for quiz in quizzes.items])
+    stats[quiz.id]['pass_rate'], stats[quiz.id]['avg_score']
+"""
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import and_, case, delete, event, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.models.quiz import Question, Quiz, QuizAttempt, QuizStats
+
+logger = logging.getLogger(__name__)
+
+_TOUCHED_KEY = 'quiz_stats_touched'
+_COLUMNS = ('total_questions', 'total_attempts', 'completed_attempts', 'passed_attempts', 'avg_score')
+
+# Đề đã tính lại dòng tổng hợp trong process này (dòng cũ có thể lệch nếu từng tắt QUIZ_STATS_SUMMARY)
+_VERIFIED = set()
+_VERIFIED_LOCK = threading.Lock()
+_LISTENERS = {'installed': False}
+
+
+# ==================== AGGREGATE ====================
+def _aggregate(quiz_ids):
+    """SELECT quiz_id, total_questions, total_attempts, completed_attempts, passed_attempts, avg_score"""
+    completed = QuizAttempt.is_completed == True
+    attempts = (
+        select(
+            QuizAttempt.quiz_id,
+            func.count().label('total_attempts'),
+            func.sum(case((completed, 1), else_=0)).label('completed_attempts'),
+            func.sum(case((and_(completed, QuizAttempt.score >= Quiz.pass_score), 1), else_=0))
+            .label('passed_attempts'),
+            func.avg(case((completed, QuizAttempt.score))).label('avg_score'),
+        )
+        .join(Quiz, Quiz.id == QuizAttempt.quiz_id)
+        .where(QuizAttempt.quiz_id.in_(quiz_ids))
+        .group_by(QuizAttempt.quiz_id)
+        .subquery()
+    )
+    questions = (
+        select(Question.quiz_id, func.count().label('total_questions'))
+        .where(Question.quiz_id.in_(quiz_ids))
+        .group_by(Question.quiz_id)
+        .subquery()
+    )
+    return (
+        select(
+            Quiz.id.label('quiz_id'),
+            func.coalesce(questions.c.total_questions, 0).label('total_questions'),
+            func.coalesce(attempts.c.total_attempts, 0).label('total_attempts'),
+            func.coalesce(attempts.c.completed_attempts, 0).label('completed_attempts'),
+            func.coalesce(attempts.c.passed_attempts, 0).label('passed_attempts'),
+            attempts.c.avg_score,
+        )
+        .outerjoin(attempts, attempts.c.quiz_id == Quiz.id)
+        .outerjoin(questions, questions.c.quiz_id == Quiz.id)
+        .where(Quiz.id.in_(quiz_ids))
+    )
+
+
+def _summarize(row):
+    total, completed, passed = row['total_attempts'], row['completed_attempts'], row['passed_attempts']
+    return {
+        'total_questions': row['total_questions'],
+        'total_attempts': total,
+        'completed_attempts': completed,
+        'passed_attempts': passed,
+        'pass_rate': round(passed * 100 / completed, 1) if completed else 0,
+        'completion_rate': round(completed * 100 / total, 1) if total else 0,
+        'avg_score': round(row['avg_score'], 1) if row['avg_score'] is not None else 0,
+    }
+
+
+def _empty():
+    return _summarize(dict.fromkeys(_COLUMNS, 0) | {'avg_score': None})
+
+
+def quiz_stats(quiz_ids):
+    """
+    Thống kê của nhiều đề trong 1 query
+
+    Returns:
+        dict: {quiz_id: {'total_questions', 'total_attempts', 'completed_attempts', 'passed_attempts',
+                         'pass_rate', 'completion_rate', 'avg_score'}} (đủ mọi id truyền vào)
+    """
+    from flask import current_app
+
+    quiz_ids = sorted(set(quiz_ids))
+    if not quiz_ids:
+        return {}
+
+    rows = {}
+    if current_app.config.get('QUIZ_STATS_SUMMARY'):
+        summary = select(QuizStats.quiz_id, *(getattr(QuizStats, column) for column in _COLUMNS))
+        for row in db.session.execute(summary.where(QuizStats.quiz_id.in_(quiz_ids))).mappings():
+            rows[row['quiz_id']] = row
+        with _VERIFIED_LOCK:
+            missing = [quiz_id for quiz_id in quiz_ids if quiz_id not in rows or quiz_id not in _VERIFIED]
+        if missing:
+            # Chưa có dòng / chưa đối chiếu từ lúc process chạy → tính lại và lưu
+            refresh_quiz_stats(missing)
+            rows = {quiz_id: row for quiz_id, row in rows.items() if quiz_id not in missing}
+            for row in db.session.execute(_aggregate(missing)).mappings():
+                rows[row['quiz_id']] = row
+    else:
+        for row in db.session.execute(_aggregate(quiz_ids)).mappings():
+            rows[row['quiz_id']] = row
+
+    return {quiz_id: _summarize(rows[quiz_id]) if quiz_id in rows else _empty() for quiz_id in quiz_ids}
+
+
+# ==================== BẢNG TỔNG HỢP ====================
+def _upsert(dialect_name, rows):
+    """INSERT ... SELECT ... ON CONFLICT (quiz_id) DO UPDATE, None nếu dialect không hỗ trợ"""
+    dialect_insert = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}.get(dialect_name)
+    if dialect_insert is None:
+        return None
+    statement = dialect_insert(QuizStats).from_select(['quiz_id', *_COLUMNS, 'updated_at'], rows)
+    return statement.on_conflict_do_update(
+        index_elements=[QuizStats.quiz_id],
+        set_={column: statement.excluded[column] for column in (*_COLUMNS, 'updated_at')}
+    )
+
+
+def refresh_quiz_stats(quiz_ids):
+    """
+    Tính lại dòng quiz_stats của các đề trong 1 transaction riêng (đề đã xóa → xóa dòng)
+
+    Khóa dòng quizzes (FOR UPDATE) trước khi aggregate: 2 lượt nộp bài cùng đề ở 2 worker chạy lần lượt,
+    lượt sau luôn đọc được bài của lượt trước → không ghi đè bằng số cũ
+    """
+    quiz_ids = sorted(set(quiz_ids))
+    if not quiz_ids:
+        return
+    with db.engine.begin() as connection:
+        existing = connection.execute(
+            select(Quiz.id).where(Quiz.id.in_(quiz_ids)).order_by(Quiz.id).with_for_update()
+        ).scalars().all()
+        connection.execute(delete(QuizStats).where(
+            QuizStats.quiz_id.in_(quiz_ids), QuizStats.quiz_id.not_in(existing)
+        ))
+        if existing:
+            rows = _aggregate(existing).add_columns(literal(datetime.utcnow(), QuizStats.updated_at.type))
+            upsert = _upsert(connection.dialect.name, rows)
+            if upsert is None:
+                # Dialect khác: xóa + chèn trong cùng transaction (vẫn giữ khóa dòng quizzes)
+                connection.execute(delete(QuizStats).where(QuizStats.quiz_id.in_(existing)))
+                upsert = insert(QuizStats).from_select(['quiz_id', *_COLUMNS, 'updated_at'], rows)
+            connection.execute(upsert)
+    with _VERIFIED_LOCK:
+        _VERIFIED.update(quiz_ids)
+
+
+def _touch(target, quiz_id):
+    session = object_session(target)
+    if session is None or quiz_id is None:
+        return
+    touched = session.info.setdefault(_TOUCHED_KEY, set())
+    if touched is not None:  # None: đã đánh dấu tính lại toàn bộ
+        touched.add(quiz_id)
+
+
+def _attempt_changed(mapper, connection, target):
+    _touch(target, target.quiz_id)
+
+
+def _quiz_changed(mapper, connection, target):
+    _touch(target, target.id)
+
+
+def _bulk_changed(orm_execute_state):
+    """Bulk UPDATE/DELETE trên lượt làm bài / câu hỏi → không biết đề nào, tính lại toàn bộ bảng"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (QuizAttempt, Question, Quiz):
+        orm_execute_state.session.info[_TOUCHED_KEY] = None
+
+
+def _refresh_touched(session):
+    if _TOUCHED_KEY not in session.info:
+        return
+    touched = session.info.pop(_TOUCHED_KEY)
+    try:
+        if touched is None:
+            with db.engine.connect() as connection:
+                touched = connection.execute(select(QuizStats.quiz_id).union(select(Quiz.id))).scalars().all()
+        refresh_quiz_stats(touched)
+    except Exception:
+        # Lỗi không làm hỏng request đã commit - bỏ đánh dấu đã đối chiếu, lần đọc sau tính lại
+        with _VERIFIED_LOCK:
+            if touched is None:
+                _VERIFIED.clear()
+            else:
+                _VERIFIED.difference_update(touched)
+        logger.exception('Cập nhật quiz_stats thất bại: %s', touched)
+
+
+def _discard_touched(session):
+    session.info.pop(_TOUCHED_KEY, None)
+
+
+def init_quiz_stats(app):
+    """Đăng ký event cập nhật bảng quiz_stats - chỉ khi QUIZ_STATS_SUMMARY bật"""
+    if not app.config.get('QUIZ_STATS_SUMMARY') or _LISTENERS['installed']:
+        return
+    _LISTENERS['installed'] = True
+    for model, handler in ((QuizAttempt, _attempt_changed), (Question, _attempt_changed), (Quiz, _quiz_changed)):
+        for event_name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, event_name, handler)
+    event.listen(Session, 'do_orm_execute', _bulk_changed)
+    event.listen(Session, 'after_commit', _refresh_touched)
+    event.listen(Session, 'after_rollback', _discard_touched)
@@ -0,0 +1,190 @@
+"""
+Tìm kiếm full-text không dấu cho sản phẩm / bài viết
+
+- Mỗi model có 2 cột đã chuẩn hóa (fold_text: lowercase, bỏ dấu):
+    search_title: tiêu đề / tên (trọng số cao)
+    search_body:  mô tả / nội dung (đã bỏ HTML, cắt ngắn)
+  được cập nhật khi ghi (mapper event before_insert / before_update trong model)
+- Backend chọn theo dialect:
+    postgresql: GIN index trên setweight(to_tsvector(title), A) || setweight(to_tsvector(body), B),
+                xếp hạng bằng ts_rank
+    sqlite:     bảng FTS5 <table>_search (external content + trigger), xếp hạng bằng bm25
+    khác / chưa có index: LIKE trên cột đã bỏ dấu (vẫn khớp "keo dan gach" ↔ "keo dán gạch")
+- Từ cuối của từ khóa được match theo tiền tố (gõ dở "gac" vẫn ra "gạch")
+
+Usage:
+    query = apply_search(Product.query.filter_by(is_active=True), Product, 'keo dan gach')
+"""
+import html
+import re
+
+from sqlalchemy import case, column, event, false, func, literal_column, or_, select, table, text
+
+from app import db
+from app.utils import fold_text
+
+_BODY_LIMIT = 2000  # ký tự, đủ cho tìm kiếm mà index không phình
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Trọng số bm25 (sqlite) cho (search_title, search_body)
+_FTS_WEIGHTS = (10.0, 1.0)
+
+# {(engine url, bảng FTS): có tồn tại không}
+_FTS_AVAILABLE = {}
+
+
+# ==================== GHI (CẬP NHẬT CỘT TÌM KIẾM) ====================
+def search_fields(title, *bodies):
+    """
+    Giá trị cho search_title / search_body
+
+    Usage:
+        for key, value in search_fields(product.name, product.description).items():
+            setattr(product, key, value)
+        row.update(search_fields(name, description))   # insert hàng loạt
+    """
+    body = ' '.join(html.unescape(_TAG_RE.sub(' ', part)) for part in bodies if part)
+    return {
+        'search_title': fold_text(title)[:255],
+        'search_body': fold_text(body)[:_BODY_LIMIT],
+    }
+
+
+def register_search_index(model):
+    """Gắn DDL index theo dialect vào create_all / drop_all của bảng (dev, test, benchmark)"""
+    model_table = model.__table__
+
+    @event.listens_for(model_table, 'after_create')
+    def _create_search_index(target, connection, **kw):
+        for statement in search_index_ddl(target.name, connection.dialect.name):
+            connection.execute(text(statement))
+
+    @event.listens_for(model_table, 'before_drop')
+    def _drop_search_index(target, connection, **kw):
+        for statement in drop_search_index_ddl(target.name, connection.dialect.name):
+            connection.execute(text(statement))
+
+    return model
+
+
+def search_index_ddl(table_name, dialect):
+    """Các câu DDL tạo index tìm kiếm (migration có bản sao riêng)"""
+    if dialect == 'postgresql':
+        return [
+            f"CREATE INDEX IF NOT EXISTS ix_{table_name}_search ON {table_name} "
+            f"USING gin (({_pg_vector_sql()}))"
+        ]
+    if dialect == 'sqlite':
+        fts = f'{table_name}_search'
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"search_title, search_body, content='{table_name}', content_rowid='id')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+            f"INSERT INTO {fts}(rowid, search_title, search_body) "
+            f"VALUES (new.id, new.search_title, new.search_body); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, search_title, search_body) "
+            f"VALUES ('delete', old.id, old.search_title, old.search_body); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF search_title, search_body ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, search_title, search_body) "
+            f"VALUES ('delete', old.id, old.search_title, old.search_body); "
+            f"INSERT INTO {fts}(rowid, search_title, search_body) "
+            f"VALUES (new.id, new.search_title, new.search_body); END",
+        ]
+    return []
+
+
+def drop_search_index_ddl(table_name, dialect):
+    if dialect == 'postgresql':
+        return [f'DROP INDEX IF EXISTS ix_{table_name}_search']
+    if dialect == 'sqlite':
+        fts = f'{table_name}_search'
+        return [f'DROP TRIGGER IF EXISTS {fts}_{suffix}' for suffix in ('ai', 'ad', 'au')] + \
+               [f'DROP TABLE IF EXISTS {fts}']
+    return []
+
+
+def _pg_vector_sql(table_name=None):
+    """Biểu thức tsvector - query phải dùng đúng biểu thức này thì GIN index mới được chọn"""
+    prefix = f'{table_name}.' if table_name else ''
+    return (f"setweight(to_tsvector('simple', coalesce({prefix}search_title, '')), 'A') || "
+            f"setweight(to_tsvector('simple', coalesce({prefix}search_body, '')), 'B')")
+
+
+# ==================== ĐỌC (TÌM KIẾM) ====================
+def search_tokens(keyword):
+    """Từ khóa → danh sách token đã bỏ dấu (chỉ a-z0-9)"""
+    return fold_text(keyword).split()
+
+
+def apply_search(query, model, keyword, ranked=True):
+    """
+    Lọc query theo từ khóa (không dấu), ranked=True → sắp xếp theo độ liên quan
+
+    Args:
+        query: Query của model (đã có filter khác, chưa phân trang)
+        model: Product / Blog (có search_title, search_body)
+        keyword: Chuỗi người dùng nhập
+        ranked: False khi người dùng chọn kiểu sắp xếp khác (giá, mới nhất...)
+    """
+    tokens = search_tokens(keyword)
+    if not tokens:
+        # Chỉ có ký tự đặc biệt → không khớp gì (giống ilike cũ)
+        return query.filter(false())
+
+    backend = search_backend(model)
+    if backend == 'postgresql':
+        vector = literal_column(_pg_vector_sql(model.__tablename__))
+        terms = [*tokens[:-1], f'{tokens[-1]}:*']
+        tsquery = func.to_tsquery('simple', ' & '.join(terms))
+        query = query.filter(vector.op('@@')(tsquery))
+        if ranked:
+            query = query.order_by(func.ts_rank(vector, tsquery).desc())
+        return query
+
+    if backend == 'fts5':
+        fts_name = f'{model.__tablename__}_search'
+        fts = table(fts_name, column('rowid'))
+        match = ' '.join([*(f'"{token}"' for token in tokens[:-1]), f'"{tokens[-1]}"*'])
+        hits = (select(fts.c.rowid.label('id'),
+                       func.bm25(literal_column(fts_name), *_FTS_WEIGHTS).label('rank'))
+                .where(literal_column(fts_name).op('MATCH')(match))
+                .subquery())
+        query = query.join(hits, hits.c.id == model.id)
+        if ranked:
+            query = query.order_by(hits.c.rank)
+        return query
+
+    # LIKE: mọi token phải xuất hiện ở tiêu đề hoặc nội dung
+    for token in tokens:
+        pattern = f'%{token}%'
+        query = query.filter(or_(model.search_title.like(pattern), model.search_body.like(pattern)))
+    if ranked:
+        phrase = ' '.join(tokens)
+        query = query.order_by(case(
+            (model.search_title.like(f'{phrase}%'), 0),
+            (model.search_title.like(f'%{phrase}%'), 1),
+            else_=2,
+        ))
+    return query
+
+
+def search_backend(model):
+    """'postgresql' | 'fts5' | 'like' theo dialect của engine hiện tại"""
+    engine = db.engine
+    dialect = engine.dialect.name
+    if dialect == 'postgresql':
+        return 'postgresql'
+    if dialect != 'sqlite':
+        return 'like'
+
+    key = (str(engine.url), model.__tablename__)
+    available = _FTS_AVAILABLE.get(key)
+    if available is None:
+        with engine.connect() as connection:
+            available = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': f'{model.__tablename__}_search'},
+            ).first() is not None
+        _FTS_AVAILABLE[key] = available
+    return 'fts5' if available else 'like'
@@ -0,0 +1,458 @@
+"""
+Inverted index trong RAM cho tìm kiếm không dấu (không cần extension / full-text index của DB)
+
+- Nguồn: products (name, description, technical_specs), blogs (title, excerpt, content),
+  projects (title, client, location, description), jobs (title, department, location, description),
+  media (original_filename, title, alt_text) - chỉ index bản ghi đang hiển thị (is_active)
+- Build nền ở lần dùng đầu tiên: 1 query bulk / nguồn, text chuẩn hóa bằng search_fields()
+  (giống app/search.py); chưa build xong → ranked_search() query DB như cũ
+- Cập nhật từng bản ghi theo session event: after_flush chụp giá trị, after_commit mới ghi vào index
+  (rollback → bỏ); bulk UPDATE/DELETE hoặc hết SEARCH_MEMORY_INDEX_TTL → rebuild nền, vẫn phục vụ index cũ
+- Xếp hạng BM25 (tiêu đề nặng hơn nội dung), mọi từ phải khớp, từ cuối match theo tiền tố
+
+SEARCH_MEMORY_INDEX:
+    auto  → chỉ dùng cho bảng không có full-text index trong DB (search_backend == 'like',
+            projects / jobs / media)
+    true  → dùng cho mọi nguồn
+    false → tắt (luôn query DB)
+
+Usage:
+    products = ranked_search(Product.query.filter_by(is_active=True), Product, 'keo dan gach', 10)
+"""
+import bisect
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app import db
+from app.search import apply_search, search_fields, search_tokens
+
+logger = logging.getLogger(__name__)
+
+_TITLE_WEIGHT = 5       # 1 lần xuất hiện ở tiêu đề = 5 lần ở nội dung
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_MAX_PREFIX_TERMS = 50  # từ cuối quá ngắn ("a") → chỉ lấy các term phổ biến nhất
+_MAX_CANDIDATES = 1000  # số id tối đa đưa vào IN (...) khi query có thêm filter
+_RETRY_AFTER = 60       # giây chờ trước khi build lại sau lỗi
+
+_PENDING_KEY = 'search_index_pending'
+
+
+class InvertedIndex:
+    """Posting list {term: {doc_id: tf có trọng số}} + danh sách term đã sắp xếp (tra tiền tố)"""
+
+    def __init__(self):
+        self.postings = {}
+        self.terms = []
+        self.doc_terms = {}    # {doc_id: (term, ...)} để gỡ doc khi sửa / xóa
+        self.doc_lengths = {}
+        self.total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add(self, doc_id, title, body, _sorted=True):
+        """Thêm / thay doc (title, body đã fold_text)"""
+        counts = Counter(body.split())
+        for term in title.split():
+            counts[term] += _TITLE_WEIGHT
+
+        with self._lock:
+            self.remove(doc_id)
+            if not counts:
+                return
+            for term, tf in counts.items():
+                docs = self.postings.get(term)
+                if docs is None:
+                    docs = self.postings[term] = {}
+                    if _sorted:
+                        bisect.insort(self.terms, term)
+                docs[doc_id] = tf
+            length = sum(counts.values())
+            self.doc_terms[doc_id] = tuple(counts)
+            self.doc_lengths[doc_id] = length
+            self.total_length += length
+
+    def remove(self, doc_id):
+        with self._lock:
+            terms = self.doc_terms.pop(doc_id, None)
+            if terms is None:
+                return
+            self.total_length -= self.doc_lengths.pop(doc_id)
+            for term in terms:
+                docs = self.postings[term]
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+                    position = bisect.bisect_left(self.terms, term)
+                    if position < len(self.terms) and self.terms[position] == term:
+                        del self.terms[position]
+
+    def finish_bulk(self):
+        """Sắp xếp term 1 lần sau khi add(..., _sorted=False) hàng loạt"""
+        with self._lock:
+            self.terms = sorted(self.postings)
+
+    def _prefix_terms(self, prefix):
+        position = bisect.bisect_left(self.terms, prefix)
+        matched = []
+        while position < len(self.terms) and self.terms[position].startswith(prefix):
+            matched.append(self.terms[position])
+            position += 1
+        if len(matched) > _MAX_PREFIX_TERMS:
+            matched = heapq.nlargest(_MAX_PREFIX_TERMS, matched, key=lambda term: len(self.postings[term]))
+        return matched
+
+    def search(self, tokens, limit=None):
+        """
+        [(doc_id, score)] xếp theo BM25 giảm dần
+
+        Args:
+            tokens: Token đã fold (search_tokens), token cuối match theo tiền tố
+            limit: Số kết quả tối đa (None → tất cả)
+        """
+        if not tokens:
+            return []
+
+        with self._lock:
+            total_docs = len(self.doc_lengths)
+            if not total_docs:
+                return []
+            average_length = self.total_length / total_docs
+
+            groups = [[token] if token in self.postings else [] for token in tokens[:-1]]
+            groups.append(self._prefix_terms(tokens[-1]))
+            if not all(groups):
+                return []
+            # Nhóm hiếm trước → tập ứng viên nhỏ ngay từ đầu
+            groups.sort(key=lambda terms: sum(len(self.postings[term]) for term in terms))
+
+            scores = None
+            for terms in groups:
+                group_scores = {}
+                for term in terms:
+                    docs = self.postings[term]
+                    df = len(docs)
+                    idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                    if scores is None:
+                        items = docs.items()
+                    else:
+                        items = ((doc_id, docs[doc_id]) for doc_id in scores if doc_id in docs)
+                    for doc_id, tf in items:
+                        norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * self.doc_lengths[doc_id] / average_length)
+                        score = idf * tf * (_BM25_K1 + 1) / (tf + norm)
+                        # Nhiều term cùng tiền tố trong 1 doc → lấy term khớp tốt nhất
+                        if score > group_scores.get(doc_id, 0.0):
+                            group_scores[doc_id] = score
+
+                if scores is None:
+                    scores = group_scores
+                else:
+                    scores = {doc_id: scores[doc_id] + score for doc_id, score in group_scores.items()}
+                if not scores:
+                    return []
+
+        ranked = scores.items()
+        key = lambda item: (item[1], item[0])  # cùng điểm → id lớn (mới hơn) trước
+        if limit:
+            return heapq.nlargest(limit, ranked, key=key)
+        return sorted(ranked, key=key, reverse=True)
+
+    def stats(self):
+        return {'documents': len(self.doc_lengths), 'terms': len(self.postings)}
+
+
+# ==================== NGUỒN DỮ LIỆU ====================
+class SearchSource:
+    """1 bảng được index: cột tiêu đề, các cột nội dung, cột lọc hiển thị"""
+
+    def __init__(self, name, model, title_column, body_columns=(), active_column=None):
+        self.name = name
+        self.model = model
+        self.title_column = title_column
+        self.body_columns = tuple(body_columns)
+        self.active_column = active_column
+
+        self.index = None
+        self.built_at = None      # time.monotonic()
+        self.build_ms = None
+        self.stale = False
+        self.rebuilding = False
+        self.failed_at = None
+        self.replay = None        # thay đổi commit trong lúc build nền
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+
+    @property
+    def tracking(self):
+        """Đã có index hoặc đang build → cần ghi nhận thay đổi"""
+        return self.index is not None or self.replay is not None
+
+    @property
+    def columns(self):
+        return (self.title_column, *self.body_columns)
+
+    def document(self, values):
+        """values: {cột: giá trị} → (title, body) đã fold, None nếu không hiển thị"""
+        if self.active_column and not values.get(self.active_column):
+            return None
+        fields = search_fields(_as_text(values.get(self.title_column)),
+                               *(_as_text(values.get(name)) for name in self.body_columns))
+        return fields['search_title'], fields['search_body']
+
+    def apply(self, changes):
+        """changes: [(doc_id, (title, body) | None)] - đã commit"""
+        with self.lock:
+            if self.replay is not None:
+                self.replay.extend(changes)
+            if self.index is None:
+                return
+            for doc_id, document in changes:
+                if document is None:
+                    self.index.remove(doc_id)
+                else:
+                    self.index.add(doc_id, *document)
+
+
+def _as_text(value):
+    """Cột JSON (technical_specs: dict / list) → chuỗi để index"""
+    if isinstance(value, dict):
+        return ' '.join(f'{key} {_as_text(item)}' for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_as_text(item) for item in value)
+    return '' if value is None else str(value)
+
+
+_SOURCES = {}
+_SOURCES_LOCK = threading.Lock()
+
+
+def _sources():
+    """{tên bảng: SearchSource} (import model lazy - tránh import vòng)"""
+    if _SOURCES:
+        return _SOURCES
+    from app.models.product import Product
+    from app.models.content import Blog
+    from app.models.media import Media, Project
+    from app.models.job import Job
+
+    with _SOURCES_LOCK:
+        if not _SOURCES:
+            for source in (
+                SearchSource('products', Product, 'name', ('description', 'technical_specs'), 'is_active'),
+                SearchSource('blogs', Blog, 'title', ('excerpt', 'content'), 'is_active'),
+                SearchSource('projects', Project, 'title', ('client', 'location', 'description'), 'is_active'),
+                SearchSource('jobs', Job, 'title', ('department', 'location', 'description'), 'is_active'),
+                SearchSource('media', Media, 'original_filename', ('title', 'alt_text')),
+            ):
+                _SOURCES[source.name] = source
+    return _SOURCES
+
+
+def _build(source):
+    """1 query bulk → index mới, thay index cũ (thay đổi commit trong lúc build được replay)"""
+    with source.build_lock:
+        started = time.perf_counter()
+        with source.lock:
+            source.replay = []
+            source.stale = False
+
+        model = source.model
+        columns = [model.id, *(getattr(model, name) for name in source.columns)]
+        if source.active_column:
+            columns.append(getattr(model, source.active_column))
+        names = ['id', *source.columns] + ([source.active_column] if source.active_column else [])
+
+        index = InvertedIndex()
+        with db.engine.connect() as connection:
+            result = connection.execution_options(yield_per=2000).execute(select(*columns))
+            for row in result:
+                document = source.document(dict(zip(names, row)))
+                if document is not None:
+                    index.add(row[0], *document, _sorted=False)
+        index.finish_bulk()
+
+        with source.lock:
+            for doc_id, document in source.replay or ():
+                if document is None:
+                    index.remove(doc_id)
+                else:
+                    index.add(doc_id, *document)
+            source.index = index
+            source.replay = None
+            source.failed_at = None
+            source.built_at = time.monotonic()
+            source.build_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info('search index %s: %d docs, %d terms, %.0fms', source.name,
+                    len(index), len(index.postings), source.build_ms)
+
+
+def _build_in_background(source, app):
+    def _run():
+        try:
+            with app.app_context():
+                _build(source)
+        except Exception:
+            logger.exception('Build search index %s thất bại', source.name)
+            with source.lock:
+                source.replay = None
+                source.failed_at = time.monotonic()
+        finally:
+            source.rebuilding = False
+
+    source.rebuilding = True
+    threading.Thread(target=_run, name=f'search-index-{source.name}', daemon=True).start()
+
+
+def _ready_index(source):
+    """
+    Index hiện có (None nếu chưa build xong → caller query DB)
+    Chưa có / cũ / stale → build nền, không bắt request chờ
+    """
+    from flask import current_app
+
+    now = time.monotonic()
+    if source.rebuilding or (source.failed_at and now - source.failed_at < _RETRY_AFTER):
+        return source.index
+
+    ttl = current_app.config.get('SEARCH_MEMORY_INDEX_TTL', 600)
+    expired = source.index is not None and ttl > 0 and now - source.built_at > ttl
+    if source.index is None or source.stale or expired:
+        with _SOURCES_LOCK:
+            if not source.rebuilding:
+                _build_in_background(source, current_app._get_current_object())
+    return source.index
+
+
+# ==================== ĐỌC ====================
+def memory_index_enabled(model):
+    """Theo SEARCH_MEMORY_INDEX (auto / true / false), xem docstring module"""
+    from flask import current_app
+    from app.search import search_backend
+
+    mode = str(current_app.config.get('SEARCH_MEMORY_INDEX', 'auto')).lower()
+    if mode in ('false', '0', 'off'):
+        return False
+    if model.__tablename__ not in _sources():
+        return False
+    if mode in ('true', '1', 'on'):
+        return True
+    return not hasattr(model, 'search_title') or search_backend(model) == 'like'
+
+
+def memory_search(model, keyword, limit=None):
+    """[id] xếp theo độ liên quan từ index trong RAM, None nếu index đang build lần đầu"""
+    index = _ready_index(_sources()[model.__tablename__])
+    if index is None:
+        return None
+    return [doc_id for doc_id, _ in index.search(search_tokens(keyword), limit)]
+
+
+def ranked_search(query, model, keyword, limit, candidates=None):
+    """
+    Tìm + xếp hạng, trả về list object (tối đa `limit`)
+
+    Args:
+        query: Query của model với các filter khác (is_active, album...)
+        model: Model có trong _sources()
+        keyword: Chuỗi người dùng nhập
+        limit: Số kết quả
+        candidates: Số id lấy từ index trước khi áp filter của query
+                    (mặc định limit * 2 - dư ra phòng index chưa kịp đồng bộ)
+    """
+    ids = None
+    if memory_index_enabled(model):
+        ids = memory_search(model, keyword, limit=min(candidates or limit * 2, _MAX_CANDIDATES))
+    if ids is not None:
+        if not ids:
+            return []
+        found = {obj.id: obj for obj in query.filter(model.id.in_(ids)).all()}
+        return [found[doc_id] for doc_id in ids if doc_id in found][:limit]
+
+    if hasattr(model, 'search_title'):
+        return apply_search(query, model, keyword).limit(limit).all()
+
+    # Bảng không có cột tìm kiếm → LIKE trên cột tiêu đề như trước
+    title_column = getattr(model, _sources()[model.__tablename__].title_column)
+    return query.filter(title_column.ilike(f'%{keyword}%')).limit(limit).all()
+
+
+def search_index_stats():
+    """Thống kê các index đã build (trang /admin/performance)"""
+    now = time.monotonic()
+    rows = []
+    for name, source in sorted(_sources().items()):
+        if source.index is None:
+            continue
+        rows.append({
+            'name': name,
+            **source.index.stats(),
+            'build_ms': source.build_ms,
+            'age': int(now - source.built_at),
+            'stale': source.stale or source.rebuilding,
+        })
+    return rows
+
+
+# ==================== CẬP NHẬT THEO SESSION EVENT ====================
+def _text_changed(obj, source):
+    state = inspect(obj)
+    names = (*source.columns, *((source.active_column,) if source.active_column else ()))
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    if not _SOURCES:
+        return
+    by_table = {}
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        source = _SOURCES.get(getattr(obj, '__tablename__', None))
+        if source is None or not source.tracking:
+            continue
+        if obj in session.deleted:
+            change = (obj.id, None)
+        elif obj in session.new or _text_changed(obj, source):
+            values = {name: getattr(obj, name) for name in source.columns}
+            if source.active_column:
+                values[source.active_column] = getattr(obj, source.active_column)
+            change = (obj.id, source.document(values))
+        else:
+            continue
+        by_table.setdefault(source.name, []).append(change)
+
+    if by_table:
+        pending = session.info.setdefault(_PENDING_KEY, {})
+        for name, changes in by_table.items():
+            pending.setdefault(name, []).extend(changes)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_bulk_stale(orm_execute_state):
+    """Query.update / delete hàng loạt không đi qua after_flush → rebuild lần dùng sau"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    source = _SOURCES.get(mapper.local_table.name) if mapper is not None else None
+    if source is not None and source.tracking:
+        source.stale = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    for name, changes in (pending or {}).items():
+        _SOURCES[name].apply(changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop(_PENDING_KEY, None)
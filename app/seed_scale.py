@@ -0,0 +1,349 @@
+"""
+Sinh dữ liệu giả lập số lượng lớn để test hiệu năng (flask seed-scale)
+
+- INSERT theo batch (executemany của Core insert()) thay vì session.add từng object
+- Sinh row bằng generator → không giữ cả triệu dict trong RAM
+- Tự cấp id nối tiếp MAX(id) hiện có (cần để gắn question → answer → user answer),
+  Postgres: đồng bộ lại sequence sau khi insert
+- Nội dung tiếng Việt, ảnh sản phẩm / bài viết trỏ tới media vừa sinh (url_key có sẵn),
+  cột tìm kiếm (search_title / search_body) điền sẵn vì insert Core không qua mapper event
+
+Usage:
+    from app.seed_scale import seed_scale
+    seed_scale({'products': 100000, 'blogs': 20000, 'media': 50000, 'attempts': 200000})
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+
+from sqlalchemy import func, select, text
+
+from app import db
+from app.search import search_fields
+
+DEFAULT_COUNTS = {
+    'categories': 20,
+    'products': 1000,
+    'blogs': 500,
+    'media': 1000,
+    'projects': 100,
+    'jobs': 50,
+    'quizzes': 50,
+    'questions_per_quiz': 10,
+    'attempts': 1000,
+}
+
+DEFAULT_BATCH_SIZE = 1000
+BASE_TIME = datetime(2024, 1, 1)
+
+# ==================== TỪ VỰNG ====================
+_PRODUCT_TYPES = ['Keo dán gạch', 'Keo chà ron', 'Vữa chống thấm', 'Sơn chống thấm', 'Vữa tự san phẳng',
+                  'Keo dán đá', 'Màng chống thấm', 'Vữa sửa chữa', 'Phụ gia bê tông', 'Keo epoxy']
+_ADJECTIVES = ['cao cấp', 'siêu dính', 'chịu nhiệt', 'gốc xi măng', 'đàn hồi', 'hai thành phần',
+               'ngoại thất', 'nội thất', 'chống nấm mốc', 'đóng rắn nhanh', 'không co ngót']
+_TOPICS = ['Hướng dẫn thi công', 'Cách chọn', 'Kinh nghiệm sử dụng', 'So sánh', 'Lưu ý khi mua',
+           'Quy trình xử lý', 'Mẹo bảo trì', 'Top 5 sai lầm khi dùng']
+_PLACES = ['Hà Nội', 'TP.HCM', 'Đà Nẵng', 'Hải Phòng', 'Cần Thơ', 'Bình Dương', 'Nha Trang', 'Huế']
+_SURFACES = ['sàn nhà tắm', 'tường ngoài trời', 'sân thượng', 'bể bơi', 'ban công', 'tầng hầm',
+             'mặt tiền', 'nhà xưởng', 'phòng khách', 'bếp']
+_SENTENCES = [
+    'Sản phẩm có độ bám dính cao, phù hợp cho cả gạch khổ lớn và đá tự nhiên.',
+    'Thi công đơn giản, chỉ cần trộn với nước sạch theo đúng tỷ lệ khuyến nghị.',
+    'Khả năng chống thấm vượt trội giúp bảo vệ công trình trước thời tiết khắc nghiệt.',
+    'Bề mặt cần được làm sạch bụi bẩn, dầu mỡ trước khi thi công.',
+    'Thời gian thao tác kéo dài, thuận tiện cho các hạng mục diện tích lớn.',
+    'Đạt tiêu chuẩn TCVN và được kiểm định bởi đơn vị độc lập.',
+    'Không chứa dung môi độc hại, an toàn cho người sử dụng.',
+    'Bảo quản nơi khô ráo, tránh ánh nắng trực tiếp.',
+]
+_NAMES = ['Nguyễn Văn An', 'Trần Thị Bình', 'Lê Hoàng Cường', 'Phạm Minh Đức', 'Hoàng Thị Hà',
+          'Vũ Quốc Huy', 'Đặng Thu Lan', 'Bùi Thanh Long', 'Đỗ Ngọc Mai', 'Ngô Gia Phúc']
+
+
+# ==================== ENTRY POINT ====================
+def seed_scale(counts=None, batch_size=DEFAULT_BATCH_SIZE, seed=42, echo=print):
+    """
+    Sinh dữ liệu theo số lượng cho từng bảng (0 → bỏ qua bảng đó)
+
+    Args:
+        counts: Dict như DEFAULT_COUNTS (thiếu key → dùng mặc định)
+        batch_size: Số row mỗi lần executemany
+        seed: Seed random (cùng seed + DB rỗng → cùng dữ liệu)
+        echo: Hàm in tiến độ (None → im lặng)
+
+    Returns:
+        dict: Số row đã insert mỗi bảng
+    """
+    from app.models import (Category, Product, Blog, Media, Project, Job,
+                            Quiz, Question, Answer, QuizAttempt, UserAnswer)
+    from app.models.media import media_url_key
+
+    counts = {**DEFAULT_COUNTS, **(counts or {})}
+    rng = random.Random(seed)
+    inserted = {}
+    echo = echo or (lambda *_args: None)
+
+    def run(model, rows):
+        started = time.perf_counter()
+        total = _insert_batches(model.__table__, rows, batch_size)
+        if total:
+            _sync_sequence(model.__table__)
+            db.session.commit()
+            echo(f'  ✓ {model.__tablename__}: {total:,} rows ({time.perf_counter() - started:.1f}s)')
+        inserted[model.__tablename__] = total
+        return total
+
+    # ----- Danh mục -----
+    start = _next_id(Category)
+    run(Category, ({
+        'id': start + i, 'name': f'{_PRODUCT_TYPES[i % len(_PRODUCT_TYPES)]} {start + i}',
+        'slug': f'danh-muc-{start + i}', 'description': rng.choice(_SENTENCES), 'is_active': True,
+        'created_at': _stamp(i),
+    } for i in range(counts['categories'])))
+    category_ids = db.session.scalars(select(Category.id)).all()
+
+    # ----- Media (ảnh cho các bảng nội dung) -----
+    media_start = _next_id(Media)
+
+    def media_rows():
+        for i in range(counts['media']):
+            media_id = media_start + i
+            filepath = f'/static/uploads/seed/anh-{media_id}.jpg'
+            yield {
+                'id': media_id, 'filename': f'anh-{media_id}.jpg', 'original_filename': f'IMG_{media_id}.JPG',
+                'filepath': filepath, 'url_key': media_url_key(filepath), 'file_type': 'image/jpeg',
+                'file_size': rng.randint(20_000, 900_000), 'width': 1200, 'height': 800,
+                'alt_text': f'{rng.choice(_PRODUCT_TYPES)} {rng.choice(_ADJECTIVES)}',
+                'title': f'{rng.choice(_PRODUCT_TYPES)} cho {rng.choice(_SURFACES)}',
+                'caption': rng.choice(_SENTENCES), 'album': f'album-{i % 12}',
+                'created_at': _stamp(i), 'updated_at': _stamp(i),
+            }
+    media_count = run(Media, media_rows())
+
+    def image_for(i):
+        if not media_count:
+            return None
+        return f'/static/uploads/seed/anh-{media_start + i % media_count}.jpg'
+
+    # ----- Sản phẩm -----
+    start = _next_id(Product)
+
+    def product_rows():
+        for i in range(counts['products']):
+            product_id = start + i
+            price = rng.randint(50, 2000) * 1000
+            discount = rng.choice([0, 0, 50_000, 100_000])
+            name = f'{rng.choice(_PRODUCT_TYPES)} {rng.choice(_ADJECTIVES)} BR-{product_id}'
+            description = _paragraph(rng, 3)
+            yield {
+                'id': product_id, 'name': name, 'slug': f'san-pham-seed-{product_id}', 'description': description,
+                **search_fields(name, description),
+                'price': price, 'old_price': price + discount if discount else None,
+                'image': image_for(i), 'is_featured': i % 50 == 0, 'is_active': i % 20 != 19,
+                'views': rng.randint(0, 5000),
+                'category_id': rng.choice(category_ids) if category_ids else None,
+                'packaging': rng.choice(['Bao 25kg', 'Thùng 20kg', 'Lon 5 lít', 'Bao 40kg']),
+                'created_at': _stamp(i), 'updated_at': _stamp(i),
+            }
+    run(Product, product_rows())
+
+    # ----- Bài viết -----
+    start = _next_id(Blog)
+
+    def blog_rows():
+        for i in range(counts['blogs']):
+            blog_id = start + i
+            title = f'{rng.choice(_TOPICS)} {rng.choice(_PRODUCT_TYPES).lower()} cho {rng.choice(_SURFACES)}'
+            excerpt = _paragraph(rng, 2)
+            content = ''.join(f'<p>{_paragraph(rng, 4)}</p>' for _ in range(5))
+            yield {
+                'id': blog_id, 'title': title, 'slug': f'bai-viet-seed-{blog_id}',
+                'excerpt': excerpt, 'content': content, **search_fields(title, excerpt, content),
+                'image': image_for(i + 7), 'author': rng.choice(_NAMES), 'is_featured': i % 40 == 0,
+                'is_active': i % 25 != 24, 'views': rng.randint(0, 8000),
+                'created_at': _stamp(i), 'updated_at': _stamp(i),
+            }
+    run(Blog, blog_rows())
+
+    # ----- Dự án -----
+    start = _next_id(Project)
+    run(Project, ({
+        'id': start + i, 'title': f'Công trình {rng.choice(_SURFACES)} {rng.choice(_PLACES)} {start + i}',
+        'slug': f'du-an-seed-{start + i}', 'client': f'Công ty {rng.choice(_NAMES).split()[-1]} {i % 30}',
+        'location': rng.choice(_PLACES), 'year': 2015 + i % 10, 'description': _paragraph(rng, 2),
+        'content': _paragraph(rng, 8), 'image': image_for(i + 13),
+        'project_type': rng.choice(['Nhà ở', 'Văn phòng', 'Khách sạn', 'Nhà xưởng']),
+        'area': f'{rng.randint(50, 5000)} m²',
+        'products_used': '\n'.join(rng.choice(_PRODUCT_TYPES) for _ in range(3)),
+        'is_featured': i % 30 == 0, 'is_active': True, 'created_at': _stamp(i), 'updated_at': _stamp(i),
+    } for i in range(counts['projects'])))
+
+    # ----- Tuyển dụng -----
+    start = _next_id(Job)
+    run(Job, ({
+        'id': start + i, 'title': f'Nhân viên {rng.choice(["kinh doanh", "kỹ thuật", "kho", "marketing"])} '
+                                  f'{rng.choice(_PLACES)}',
+        'slug': f'tuyen-dung-seed-{start + i}', 'department': rng.choice(['Kinh doanh', 'Kỹ thuật', 'Hành chính']),
+        'location': rng.choice(_PLACES), 'job_type': 'Full-time', 'salary': 'Thỏa thuận',
+        'description': _paragraph(rng, 4), 'requirements': _paragraph(rng, 2), 'benefits': _paragraph(rng, 2),
+        'deadline': BASE_TIME + timedelta(days=3650), 'is_active': True,
+        'created_at': _stamp(i), 'updated_at': _stamp(i),
+    } for i in range(counts['jobs'])))
+
+    # ----- Quiz: câu hỏi + 4 đáp án / câu (đáp án ngẫu nhiên là đúng) -----
+    per_quiz = counts['questions_per_quiz']
+    quiz_start = _next_id(Quiz)
+    question_start = _next_id(Question)
+    answer_start = _next_id(Answer)
+
+    run(Quiz, ({
+        'id': quiz_start + i, 'title': f'Kiểm tra kiến thức vật liệu {quiz_start + i}',
+        'slug': f'de-thi-seed-{quiz_start + i}', 'description': rng.choice(_SENTENCES),
+        'total_questions': per_quiz, 'is_active': True, 'created_at': _stamp(i), 'updated_at': _stamp(i),
+    } for i in range(counts['quizzes'])))
+
+    quiz_total = counts['quizzes'] if inserted.get('quizzes') else 0
+    run(Question, ({
+        'id': question_start + i, 'quiz_id': quiz_start + i // per_quiz, 'order': i % per_quiz,
+        'question_text': f'{rng.choice(_PRODUCT_TYPES)} nào phù hợp cho {rng.choice(_SURFACES)}?',
+        'points': 1,
+    } for i in range(quiz_total * per_quiz)))
+
+    correct_choice = {}
+
+    def answer_rows():
+        for i in range(quiz_total * per_quiz * 4):
+            question_index, order = divmod(i, 4)
+            if order == 0:
+                correct_choice[question_index] = rng.randrange(4)
+            yield {
+                'id': answer_start + i, 'question_id': question_start + question_index, 'order': order,
+                'answer_text': f'{rng.choice(_PRODUCT_TYPES)} {rng.choice(_ADJECTIVES)}',
+                'is_correct': correct_choice[question_index] == order,
+            }
+    run(Answer, answer_rows())
+
+    # ----- Lượt làm bài + câu trả lời -----
+    quiz_structure = _load_quiz_structure(Quiz, Question, Answer)
+    if counts['attempts'] and not quiz_structure:
+        echo('  ⚠ Bỏ qua attempts: chưa có quiz nào')
+        return inserted
+
+    attempt_start = _next_id(QuizAttempt)
+    quiz_ids = sorted(quiz_structure)
+    attempt_answers = []
+
+    def attempt_rows():
+        for i in range(counts['attempts']):
+            attempt_id = attempt_start + i
+            quiz_id = quiz_ids[i % len(quiz_ids)]
+            questions = quiz_structure[quiz_id]
+            correct = 0
+            started = _stamp(i)
+            for question_id, answer_ids, correct_id in questions:
+                answer_id = rng.choice(answer_ids)
+                correct += answer_id == correct_id
+                attempt_answers.append((attempt_id, question_id, answer_id, answer_id == correct_id, started))
+            score = round(correct * 100 / len(questions), 1) if questions else 0
+            yield {
+                'id': attempt_id, 'quiz_id': quiz_id, 'user_name': rng.choice(_NAMES),
+                'user_email': f'ungvien{attempt_id}@example.com', 'started_at': started,
+                'completed_at': started + timedelta(seconds=rng.randint(60, 1800)), 'is_completed': True,
+                'time_spent_seconds': rng.randint(60, 1800), 'score': score,
+                'total_questions': len(questions), 'correct_answers': correct,
+                'wrong_answers': len(questions) - correct, 'passed': score >= 70,
+            }
+
+    def attempt_batches():
+        # Mỗi batch attempt kèm các câu trả lời của nó (RAM chỉ giữ 1 batch)
+        user_answer_id = _next_id(UserAnswer)
+        for chunk in _chunks(attempt_rows(), batch_size):
+            yield ('attempts', chunk)
+            rows = [{
+                'id': user_answer_id + index, 'attempt_id': attempt_id, 'question_id': question_id,
+                'answer_id': answer_id, 'is_correct': is_correct, 'answered_at': answered_at,
+            } for index, (attempt_id, question_id, answer_id, is_correct, answered_at) in enumerate(attempt_answers)]
+            user_answer_id += len(rows)
+            attempt_answers.clear()
+            yield ('answers', rows)
+
+    started = time.perf_counter()
+    totals = {'attempts': 0, 'answers': 0}
+    for kind, rows in attempt_batches():
+        table = QuizAttempt.__table__ if kind == 'attempts' else UserAnswer.__table__
+        totals[kind] += _insert_batches(table, iter(rows), batch_size)
+    if totals['attempts']:
+        _sync_sequence(QuizAttempt.__table__)
+        _sync_sequence(UserAnswer.__table__)
+        db.session.commit()
+        echo(f'  ✓ quiz_attempts: {totals["attempts"]:,} rows, user_answers: {totals["answers"]:,} rows '
+             f'({time.perf_counter() - started:.1f}s)')
+    inserted['quiz_attempts'] = totals['attempts']
+    inserted['user_answers'] = totals['answers']
+    return inserted
+
+
+# ==================== HELPERS ====================
+def _stamp(index):
+    return BASE_TIME + timedelta(minutes=index * 7)
+
+
+def _paragraph(rng, sentences):
+    return ' '.join(rng.choice(_SENTENCES) for _ in range(sentences))
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _insert_batches(table, rows, batch_size):
+    """executemany theo từng batch, trả về tổng số row"""
+    total = 0
+    statement = table.insert()
+    for chunk in _chunks(rows, batch_size):
+        db.session.execute(statement, chunk)
+        total += len(chunk)
+    return total
+
+
+def _next_id(model):
+    return (db.session.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def _sync_sequence(table):
+    """Insert với id tự cấp → Postgres cần kéo sequence lên MAX(id)"""
+    if db.engine.dialect.name != 'postgresql':
+        return
+    db.session.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+        f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+    ))
+
+
+def _load_quiz_structure(Quiz, Question, Answer):
+    """{quiz_id: [(question_id, [answer_id...], correct_answer_id), ...]} của các quiz active"""
+    rows = db.session.execute(
+        select(Question.quiz_id, Question.id, Answer.id, Answer.is_correct)
+        .join(Answer, Answer.question_id == Question.id)
+        .join(Quiz, Quiz.id == Question.quiz_id)
+        .where(Quiz.is_active == True)  # noqa: E712
+        .order_by(Question.quiz_id, Question.order, Question.id, Answer.order)
+    ).all()
+
+    questions = {}
+    for quiz_id, question_id, answer_id, is_correct in rows:
+        entry = questions.setdefault((quiz_id, question_id), [[], None])
+        entry[0].append(answer_id)
+        if is_correct:
+            entry[1] = answer_id
+
+    structure = {}
+    for (quiz_id, question_id), (answer_ids, correct_id) in questions.items():
+        structure.setdefault(quiz_id, []).append((question_id, answer_ids, correct_id))
+    return structure
@@ -2,7 +2,7 @@
  * ============================================================================
  * BRICON - Main JavaScript Build
  * ============================================================================
- * Generated: 25/10/2025 18:06:06
+ * Generated: 18/10/2026 10:25:56
  * Modules: 13 files
  * Description: Auto-generated optimized JavaScript
  * DO NOT EDIT THIS FILE DIRECTLY - Edit individual modules instead
@@ -72,6 +72,87 @@ document.addEventListener("DOMContentLoaded", function () {
     });
   });
 });
+document.addEventListener("DOMContentLoaded", function () {
+  const TYPE_LABELS = { category: "Danh mục", product: "Sản phẩm", blog: "Bài viết", project: "Dự án" };
+  const memo = new Map();
+  document.querySelectorAll("input[data-suggest]").forEach((input) => {
+    const wrapper = input.closest("form") || input.parentElement;
+    const menu = document.createElement("ul");
+    menu.className = "dropdown-menu w-100 shadow-sm";
+    menu.style.top = "100%";
+    menu.style.left = "0";
+    menu.setAttribute("role", "listbox");
+    wrapper.classList.add("position-relative");
+    wrapper.appendChild(menu);
+    input.setAttribute("autocomplete", "off");
+    let timer = null;
+    let controller = null;
+    let active = -1;
+    const close = () => {
+      menu.classList.remove("show");
+      active = -1;
+    };
+    const render = (items) => {
+      menu.innerHTML = "";
+      items.forEach((item) => {
+        const li = document.createElement("li");
+        const link = document.createElement("a");
+        link.className = "dropdown-item d-flex justify-content-between gap-3";
+        link.href = item.url;
+        const text = document.createElement("span");
+        text.className = "text-truncate";
+        text.textContent = item.text;
+        const type = document.createElement("small");
+        type.className = "text-muted";
+        type.textContent = TYPE_LABELS[item.type] || "";
+        link.append(text, type);
+        li.appendChild(link);
+        menu.appendChild(li);
+      });
+      active = -1;
+      menu.classList.toggle("show", items.length > 0);
+    };
+    const fetchSuggestions = (keyword) => {
+      if (memo.has(keyword)) {
+        render(memo.get(keyword));
+        return;
+      }
+      if (controller) controller.abort();
+      controller = new AbortController();
+      fetch("/api/suggest?q=" + encodeURIComponent(keyword), { signal: controller.signal })
+        .then((response) => (response.ok ? response.json() : { suggestions: [] }))
+        .then((data) => {
+          memo.set(keyword, data.suggestions);
+          if (input.value.trim() === keyword) render(data.suggestions);
+        })
+        .catch(() => {});
+    };
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      const keyword = input.value.trim();
+      if (keyword.length < 2) {
+        close();
+        return;
+      }
+      timer = setTimeout(() => fetchSuggestions(keyword), 150);
+    });
+    input.addEventListener("keydown", (e) => {
+      const links = menu.querySelectorAll(".dropdown-item");
+      if (!menu.classList.contains("show") || !links.length) return;
+      if (e.key === "ArrowDown" || e.key === "ArrowUp") {
+        e.preventDefault();
+        active = (active + (e.key === "ArrowDown" ? 1 : -1) + links.length) % links.length;
+        links.forEach((link, i) => link.classList.toggle("active", i === active));
+      } else if (e.key === "Enter" && active >= 0) {
+        e.preventDefault();
+        window.location.href = links[active].href;
+      } else if (e.key === "Escape") {
+        close();
+      }
+    });
+    input.addEventListener("blur", () => setTimeout(close, 150));
+  });
+});
 if ("loading" in HTMLImageElement.prototype) {
   const images = document.querySelectorAll("img[data-src]");
   images.forEach((img) => {
@@ -0,0 +1,227 @@
+"""
+Gợi ý tìm kiếm khi đang gõ (/api/suggest)
+
+- Nguồn: tên danh mục, tên sản phẩm, tiêu đề bài viết, tiêu đề dự án (chỉ bản ghi is_active)
+- Mỗi bảng 1 mảng key đã sắp xếp + bisect (thay cho trie: ít object Python, build = 1 lần sort)
+  key = tiêu đề đã fold_text, bắt đầu từ mỗi từ → "tham" khớp "Vữa chống thấm", "br 12" khớp mã SP
+- Top-k: tiền tố có khoảng key lớn (> _DIRECT_SCAN) được tính sẵn lúc build (như node trie,
+  gộp từ các tiền tố con), còn lại nlargest trên ≤ _DIRECT_SCAN key → lookup < 1ms dù bảng lớn
+- Build ở nền (lần đầu chưa xong → trả về rỗng); commit ghi vào bảng nguồn → bảng đó được build lại
+  (vẫn trả lời bằng mảng cũ), worker khác tự đồng bộ sau SUGGEST_INDEX_TTL giây
+- Kết quả theo từng tiền tố được memo trong cache registry ('search_suggest')
+
+Usage:
+    suggestions = suggest('keo da', limit=8)   # [{'text', 'type', 'slug'}]
+"""
+import bisect
+import heapq
+import logging
+import threading
+import time
+from array import array
+
+from sqlalchemy import select
+
+from app import db
+from app.cache_registry import on_tables_committed, register_cache
+from app.utils import fold_text
+
+logger = logging.getLogger(__name__)
+
+MIN_PREFIX_LENGTH = 2
+_MAX_WORD_STARTS = 8  # số vị trí từ được làm key / tiêu đề
+_KEY_END = '\x7f'     # lớn hơn mọi ký tự của key (fold_text chỉ giữ a-z0-9 và space)
+_DIRECT_SCAN = 512    # khoảng key lớn hơn → top-k tính sẵn
+_TOP_K = 20           # limit tối đa của /api/suggest
+
+# {type: (bảng, model, cột tiêu đề, cột trọng số, ưu tiên)} - ưu tiên cao hiện trước khi cùng mức khớp
+_SOURCES = {
+    'category': ('categories', 'app.models.product.Category', 'name', None, 3),
+    'product': ('products', 'app.models.product.Product', 'name', 'views', 2),
+    'blog': ('blogs', 'app.models.content.Blog', 'title', 'views', 1),
+    'project': ('projects', 'app.models.media.Project', 'title', 'view_count', 1),
+}
+
+_TABLES = {}          # {type: SuggestTable}
+_STATE = {'built_at': {}, 'dirty': set(), 'building': set()}
+_LOCK = threading.Lock()
+
+_result_cache = register_cache('search_suggest', ttl=300, max_size=1024,
+                               models=tuple(source[0] for source in _SOURCES.values()))
+
+
+class SuggestTable:
+    """
+    Mảng key đã sắp xếp của 1 bảng
+        keys[i]     key (tiêu đề đã fold, bắt đầu từ 1 từ)
+        item_of[i]  vị trí item trong items
+        scores[i]   điểm: khớp từ đầu tiêu đề > ưu tiên loại > trọng số (lượt xem)
+        top         {tiền tố có > _DIRECT_SCAN key: [(điểm, item)] tốt nhất}
+    """
+
+    def __init__(self, items, priority):
+        self.items = items  # [(tiêu đề, slug, trọng số)]
+        pairs = []
+        for item_index, (title, _, weight) in enumerate(items):
+            base = (priority << 40) | min(max(weight, 0), (1 << 40) - 1)
+            words = fold_text(title).split()
+            for position in range(min(len(words), _MAX_WORD_STARTS)):
+                score = base | (1 << 50) if position == 0 else base
+                pairs.append((' '.join(words[position:]), item_index, score))
+        pairs.sort()
+        self.keys = [pair[0] for pair in pairs]
+        self.item_of = array('l', (pair[1] for pair in pairs))
+        self.scores = array('q', (pair[2] for pair in pairs))
+        self.top = {}
+        if self.keys:
+            self._precompute('', 0, len(self.keys))
+
+    def __len__(self):
+        return len(self.items)
+
+    def lookup(self, prefix, limit):
+        """[(điểm, item)] tốt nhất, mỗi item 1 lần"""
+        top = self.top.get(prefix)
+        if top is None:
+            start = bisect.bisect_left(self.keys, prefix)
+            end = bisect.bisect_left(self.keys, prefix + _KEY_END, start)
+            top = self._collect(start, end)
+        return [(score, self.items[item_index]) for score, item_index in top[:limit]]
+
+    def _collect(self, start, end):
+        # Mỗi item có tối đa _MAX_WORD_STARTS key → chừng này vị trí chắc chắn đủ _TOP_K item
+        positions = heapq.nlargest(_TOP_K * _MAX_WORD_STARTS, range(start, end), key=self.scores.__getitem__)
+        return _distinct((self.scores[position], self.item_of[position]) for position in positions)
+
+    def _precompute(self, prefix, start, end):
+        """Top-k của `prefix` (khoảng [start, end)), lưu lại nếu khoảng lớn - đệ quy theo ký tự tiếp theo"""
+        if end - start <= _DIRECT_SCAN:
+            return self._collect(start, end)
+
+        depth = len(prefix)
+        children = []
+        position = start
+        while position < end and len(self.keys[position]) == depth:
+            position += 1  # key đúng bằng tiền tố
+        if position > start:
+            children.append(self._collect(start, position))
+        while position < end:
+            child = prefix + self.keys[position][depth]
+            child_end = bisect.bisect_left(self.keys, child + _KEY_END, position, end)
+            children.append(self._precompute(child, position, child_end))
+            position = child_end
+
+        top = _distinct(heapq.merge(*children, reverse=True))
+        self.top[prefix] = top
+        return top
+
+
+def _distinct(candidates):
+    """(điểm, item) đã sắp giảm dần → tối đa _TOP_K, mỗi item 1 lần (giữ điểm cao nhất)"""
+    top, seen = [], set()
+    for score, item_index in candidates:
+        if item_index not in seen:
+            seen.add(item_index)
+            top.append((score, item_index))
+            if len(top) == _TOP_K:
+                break
+    return top
+
+
+def _load_table(kind):
+    import importlib
+
+    _, model_path, title_column, weight_column, priority = _SOURCES[kind]
+    module_name, model_name = model_path.rsplit('.', 1)
+    model = getattr(importlib.import_module(module_name), model_name)
+    weight = getattr(model, weight_column) if weight_column else None
+    columns = [getattr(model, title_column), model.slug]
+    if weight is not None:
+        columns.append(weight)
+
+    started = time.perf_counter()
+    with db.engine.connect() as connection:
+        rows = connection.execute(select(*columns).where(model.is_active == True)).all()
+    table = SuggestTable([(row[0], row[1], (row[2] or 0) if weight is not None else 0) for row in rows],
+                         priority)
+    logger.info('suggest %s: %d items, %d keys, %.0fms', kind, len(table), len(table.keys),
+                (time.perf_counter() - started) * 1000)
+    return table
+
+
+def _build(kinds):
+    for kind in kinds:
+        with _LOCK:
+            _STATE['dirty'].discard(kind)
+        table = _load_table(kind)
+        with _LOCK:
+            _TABLES[kind] = table
+            _STATE['built_at'][kind] = time.monotonic()
+    _result_cache.invalidate()
+
+
+def _build_in_background(kinds, app):
+    def _run():
+        try:
+            with app.app_context():
+                _build(kinds)
+        except Exception:
+            logger.exception('Build suggest index thất bại: %s', ', '.join(kinds))
+            with _LOCK:
+                _STATE['dirty'].update(kinds)
+        finally:
+            with _LOCK:
+                _STATE['building'].difference_update(kinds)
+
+    threading.Thread(target=_run, name='suggest-index', daemon=True).start()
+
+
+def _ensure_tables():
+    """Chưa có / bảng đổi / hết TTL → build ở nền, không bắt request chờ"""
+    from flask import current_app
+
+    ttl = current_app.config.get('SUGGEST_INDEX_TTL', 600)
+    now = time.monotonic()
+    with _LOCK:
+        stale = {kind for kind in _SOURCES
+                 if kind not in _TABLES or kind in _STATE['dirty']
+                 or (ttl > 0 and now - _STATE['built_at'][kind] > ttl)}
+        stale -= _STATE['building']
+        _STATE['building'].update(stale)
+    if stale:
+        _build_in_background(sorted(stale), current_app._get_current_object())
+
+
+@on_tables_committed
+def _mark_dirty(tables):
+    kinds = {kind for kind, source in _SOURCES.items() if source[0] in tables}
+    if kinds:
+        with _LOCK:
+            _STATE['dirty'].update(kinds)
+
+
+# ==================== ĐỌC ====================
+def suggest(keyword, limit=8):
+    """
+    Gợi ý theo tiền tố (không dấu), tối đa `limit`
+
+    Returns:
+        list[dict]: [{'text': 'Keo dán gạch', 'type': 'category', 'slug': 'keo-dan-gach'}, ...]
+    """
+    prefix = fold_text(keyword)
+    if len(prefix) < MIN_PREFIX_LENGTH:
+        return []
+
+    _ensure_tables()
+    if not _TABLES:
+        return []
+    return _result_cache.get_or_load((prefix, limit), lambda: _lookup(prefix, limit))
+
+
+def _lookup(prefix, limit):
+    candidates = []
+    for kind, table in list(_TABLES.items()):
+        for score, (title, slug, _) in table.lookup(prefix, limit):
+            candidates.append((score, kind, title, slug))
+    top = heapq.nlargest(limit, candidates, key=lambda candidate: candidate[0])
+    return [{'text': title, 'type': kind, 'slug': slug} for _, kind, title, slug in top]
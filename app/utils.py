@@ -1,5 +1,6 @@
 import os
 import re
+import unicodedata
 from datetime import datetime
 from PIL import Image
 from werkzeug.utils import secure_filename
@@ -85,6 +86,38 @@ def allowed_file(filename):
         filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+# Bảng thay thế 1 lượt (str.translate) thay cho 7 lần re.sub
+_ACCENT_GROUPS = {
+    'a': 'àáạảãâầấậẩẫăằắặẳẵ',
+    'e': 'èéẹẻẽêềếệểễ',
+    'i': 'ìíịỉĩ',
+    'o': 'òóọỏõôồốộổỗơờớợởỡ',
+    'u': 'ùúụủũưừứựửữ',
+    'y': 'ỳýỵỷỹ',
+    'd': 'đ',
+}
+_ACCENT_TABLE = str.maketrans({char: base for base, chars in _ACCENT_GROUPS.items() for char in chars})
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+
+def remove_accents(text):
+    """
+    Chuyển tiếng Việt có dấu về không dấu (text đã lowercase)
+    - Chuẩn hóa NFC trước (chữ gõ kiểu tổ hợp dấu rời → ký tự dựng sẵn)
+    """
+    return unicodedata.normalize('NFC', text).translate(_ACCENT_TABLE)
+
+
+def fold_text(text):
+    """
+    Chuẩn hóa text để tìm kiếm: lowercase, bỏ dấu, chỉ giữ chữ/số, cách nhau 1 space
+    VD: "Keo dán gạch C2-TE" → "keo dan gach c2 te"
+    """
+    if not text:
+        return ''
+    return _NON_ALNUM_RE.sub(' ', remove_accents(text.lower())).strip()
+
+
 def slugify(text):
     """
     Chuyển text thành dạng slug-friendly
@@ -92,13 +125,7 @@ def slugify(text):
     """
     text = text.lower()
     # Chuyển tiếng Việt không dấu
-    text = re.sub(r'[àáạảãâầấậẩẫăằắặẳẵ]', 'a', text)
-    text = re.sub(r'[èéẹẻẽêềếệểễ]', 'e', text)
-    text = re.sub(r'[ìíịỉĩ]', 'i', text)
-    text = re.sub(r'[òóọỏõôồốộổỗơờớợởỡ]', 'o', text)
-    text = re.sub(r'[ùúụủũưừứựửữ]', 'u', text)
-    text = re.sub(r'[ỳýỵỷỹ]', 'y', text)
-    text = re.sub(r'[đ]', 'd', text)
+    text = remove_accents(text)
     # Xóa ký tự đặc biệt
     text = re.sub(r'[^a-z0-9\s-]', '', text)
     # Thay space bằng dash
@@ -248,26 +275,10 @@ def delete_file(filepath):
         return False
 
 def get_albums():
-    """Lấy danh sách albums với số lượng file"""
-    from app.models.media import Media
-    from sqlalchemy import func
-
-    # Lấy albums từ DB
-    album_counts = db.session.query(
-        Media.album,
-        func.count(Media.id).label('count')
-    ).filter(
-        Media.album.isnot(None),
-        Media.album != ''
-    ).group_by(Media.album).all()
-
-    albums_dict = {album_name: count for album_name, count in album_counts}
-
-    # Convert sang list và sort
-    albums = [{'name': name, 'count': count} for name, count in albums_dict.items()]
-    albums.sort(key=lambda x: x['name'])
-
-    return albums
+    """Lấy danh sách albums với số lượng file (từ thống kê media trong RAM)"""
+    from app.media_stats import media_stats
+
+    return media_stats()['albums']
 
 
 def handle_image_upload(form_field, field_name, folder='general', alt_text=None):
@@ -72,7 +72,7 @@ JS_MODULES = {
         'description': 'KIỂM TRA FORM TÌM KIẾM',
         'details': '''
         📍 Vị trí: Thanh tìm kiếm navbar và trang search
-        🎯 Chức năng: Ngăn submit form tìm kiếm khi input rỗng
+        🎯 Chức năng: Ngăn submit form tìm kiếm khi input rỗng + gợi ý khi gõ
         📄 Sử dụng tại:
            - layouts/base.html (form search trong navbar)
            - public/search.html (trang tìm kiếm chính)
@@ -81,6 +81,7 @@ JS_MODULES = {
            - Kiểm tra input[name="q"] hoặc input[name="search"]
            - preventDefault() nếu value.trim() === ""
            - Hiện alert "Vui lòng nhập từ khóa tìm kiếm"
+           - input[data-suggest]: gọi /api/suggest?q= (debounce 150ms), dropdown Bootstrap
         '''
     },
     '05-lazy-loading.js': {
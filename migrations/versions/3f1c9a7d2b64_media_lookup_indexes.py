@@ -0,0 +1,69 @@
+"""media lookup indexes + url_key
+
+Revision ID: 3f1c9a7d2b64
+Revises: 8cb2d9fc991a
+Create Date: 2026-10-18 10:05:12.418203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b64'
+down_revision = '8cb2d9fc991a'
+branch_labels = None
+depends_on = None
+
+
+def _url_key(filepath):
+    """Bản sao của app.models.media.media_url_key (migration không import app)"""
+    if not filepath:
+        return None
+    filepath = filepath.strip()
+    if filepath.startswith('http://') or filepath.startswith('https://'):
+        return filepath
+    if not filepath.startswith('/'):
+        filepath = '/' + filepath
+    if not filepath.startswith('/static/'):
+        if filepath.startswith('/uploads/'):
+            filepath = '/static' + filepath
+        else:
+            filepath = '/static/' + filepath.lstrip('/')
+    return filepath
+
+
+def upgrade():
+    with op.batch_alter_table('media', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('url_key', sa.String(length=500), nullable=True))
+        batch_op.create_index(batch_op.f('ix_media_url_key'), ['url_key'], unique=False)
+        batch_op.create_index(batch_op.f('ix_media_filepath'), ['filepath'], unique=False)
+        batch_op.create_index(batch_op.f('ix_media_filename'), ['filename'], unique=False)
+        batch_op.create_index(batch_op.f('ix_media_album'), ['album'], unique=False)
+        batch_op.create_index(batch_op.f('ix_media_created_at'), ['created_at'], unique=False)
+
+    # Backfill url_key cho media đã có
+    media = sa.table('media',
+                     sa.column('id', sa.Integer),
+                     sa.column('filepath', sa.String),
+                     sa.column('url_key', sa.String))
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(media.c.id, media.c.filepath)).fetchall()
+    updates = [{'media_id': row.id, 'url_key': _url_key(row.filepath)} for row in rows]
+    if updates:
+        bind.execute(
+            media.update()
+            .where(media.c.id == sa.bindparam('media_id'))
+            .values(url_key=sa.bindparam('url_key')),
+            updates
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('media', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_media_created_at'))
+        batch_op.drop_index(batch_op.f('ix_media_album'))
+        batch_op.drop_index(batch_op.f('ix_media_filename'))
+        batch_op.drop_index(batch_op.f('ix_media_filepath'))
+        batch_op.drop_index(batch_op.f('ix_media_url_key'))
+        batch_op.drop_column('url_key')
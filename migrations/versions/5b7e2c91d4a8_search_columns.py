@@ -0,0 +1,143 @@
+"""search columns + full-text index (products, blogs)
+
+Revision ID: 5b7e2c91d4a8
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 11:02:37.512940
+
+"""
+import html
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2c91d4a8'
+down_revision = '3f1c9a7d2b64'
+branch_labels = None
+depends_on = None
+
+
+# {bảng: (cột tiêu đề, cột nội dung...)}
+SEARCH_SOURCES = {
+    'products': ('name', 'description'),
+    'blogs': ('title', 'excerpt', 'content'),
+}
+BATCH_SIZE = 1000
+_BODY_LIMIT = 2000
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+# ==================== BẢN SAO app.utils.fold_text / app.search (migration không import app) ====================
+def _fold_text(text):
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFC', text.lower())
+    text = re.sub(r'[àáạảãâầấậẩẫăằắặẳẵ]', 'a', text)
+    text = re.sub(r'[èéẹẻẽêềếệểễ]', 'e', text)
+    text = re.sub(r'[ìíịỉĩ]', 'i', text)
+    text = re.sub(r'[òóọỏõôồốộổỗơờớợởỡ]', 'o', text)
+    text = re.sub(r'[ùúụủũưừứựửữ]', 'u', text)
+    text = re.sub(r'[ỳýỵỷỹ]', 'y', text)
+    text = re.sub(r'[đ]', 'd', text)
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text).split())
+
+
+def _search_fields(title, *bodies):
+    body = ' '.join(html.unescape(_TAG_RE.sub(' ', part)) for part in bodies if part)
+    return _fold_text(title)[:255], _fold_text(body)[:_BODY_LIMIT]
+
+
+def _pg_vector_sql():
+    return ("setweight(to_tsvector('simple', coalesce(search_title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(search_body, '')), 'B')")
+
+
+def _create_index_sql(table_name, dialect):
+    if dialect == 'postgresql':
+        return [f"CREATE INDEX IF NOT EXISTS ix_{table_name}_search ON {table_name} "
+                f"USING gin (({_pg_vector_sql()}))"]
+    if dialect == 'sqlite':
+        fts = f'{table_name}_search'
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"search_title, search_body, content='{table_name}', content_rowid='id')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+            f"INSERT INTO {fts}(rowid, search_title, search_body) "
+            f"VALUES (new.id, new.search_title, new.search_body); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, search_title, search_body) "
+            f"VALUES ('delete', old.id, old.search_title, old.search_body); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF search_title, search_body ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, search_title, search_body) "
+            f"VALUES ('delete', old.id, old.search_title, old.search_body); "
+            f"INSERT INTO {fts}(rowid, search_title, search_body) "
+            f"VALUES (new.id, new.search_title, new.search_body); END",
+            # Đánh index toàn bộ dữ liệu đã backfill
+            f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        ]
+    return []
+
+
+def _drop_index_sql(table_name, dialect):
+    if dialect == 'postgresql':
+        return [f'DROP INDEX IF EXISTS ix_{table_name}_search']
+    if dialect == 'sqlite':
+        fts = f'{table_name}_search'
+        return [f'DROP TRIGGER IF EXISTS {fts}_{suffix}' for suffix in ('ai', 'ad', 'au')] + \
+               [f'DROP TABLE IF EXISTS {fts}']
+    return []
+
+
+# ==================== MIGRATION ====================
+def _backfill(bind, table_name, source_columns):
+    columns = [sa.column('id', sa.Integer), sa.column('search_title', sa.String),
+               sa.column('search_body', sa.Text)]
+    columns += [sa.column(name, sa.Text) for name in source_columns]
+    target = sa.table(table_name, *columns)
+
+    update = (target.update()
+              .where(target.c.id == sa.bindparam('row_id'))
+              .values(search_title=sa.bindparam('new_title'), search_body=sa.bindparam('new_body')))
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(target.c.id, *(target.c[name] for name in source_columns))
+            .where(target.c.id > last_id)
+            .order_by(target.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            title, body = _search_fields(*row[1:])
+            updates.append({'row_id': row[0], 'new_title': title, 'new_body': body})
+        bind.execute(update, updates)
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    for table_name in SEARCH_SOURCES:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('search_title', sa.String(length=255), nullable=True))
+            batch_op.add_column(sa.Column('search_body', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    for table_name, source_columns in SEARCH_SOURCES.items():
+        _backfill(bind, table_name, source_columns)
+        for statement in _create_index_sql(table_name, bind.dialect.name):
+            op.execute(statement)
+
+
+def downgrade():
+    bind = op.get_bind()
+    for table_name in SEARCH_SOURCES:
+        for statement in _drop_index_sql(table_name, bind.dialect.name):
+            op.execute(statement)
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column('search_body')
+            batch_op.drop_column('search_title')
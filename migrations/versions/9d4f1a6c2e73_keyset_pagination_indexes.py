@@ -0,0 +1,37 @@
+"""keyset pagination indexes (products, blogs, contacts, quiz_attempts)
+
+Revision ID: 9d4f1a6c2e73
+Revises: 5b7e2c91d4a8
+Create Date: 2026-10-18 13:20:44.108516
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f1a6c2e73'
+down_revision = '5b7e2c91d4a8'
+branch_labels = None
+depends_on = None
+
+
+# {tên index: (bảng, [cột / biểu thức])} - khớp __table_args__ của model
+INDEXES = {
+    'ix_products_created_at_id': ('products', ['created_at', 'id']),
+    'ix_products_price_id': ('products', [sa.text('coalesce(price, 0)'), 'id']),
+    'ix_products_views_id': ('products', [sa.text('coalesce(views, 0)'), 'id']),
+    'ix_blogs_created_at_id': ('blogs', ['created_at', 'id']),
+    'ix_contacts_created_at_id': ('contacts', ['created_at', 'id']),
+    'ix_quiz_attempts_completed_at_id': ('quiz_attempts', ['completed_at', 'id']),
+}
+
+
+def upgrade():
+    for name, (table, columns) in INDEXES.items():
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, (table, _) in INDEXES.items():
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,46 @@
+"""quiz stats summary table + quiz_id indexes (questions, quiz_attempts)
+
+Revision ID: c3a8e5f17b42
+Revises: 9d4f1a6c2e73
+Create Date: 2026-10-18 15:02:17.530281
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a8e5f17b42'
+down_revision = '9d4f1a6c2e73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_questions_quiz_id'), ['quiz_id'], unique=False)
+
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_quiz_attempts_quiz_id'), ['quiz_id'], unique=False)
+
+    op.create_table('quiz_stats',
+    sa.Column('quiz_id', sa.Integer(), nullable=False),
+    sa.Column('total_questions', sa.Integer(), nullable=True),
+    sa.Column('total_attempts', sa.Integer(), nullable=True),
+    sa.Column('completed_attempts', sa.Integer(), nullable=True),
+    sa.Column('passed_attempts', sa.Integer(), nullable=True),
+    sa.Column('avg_score', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('quiz_id')
+    )
+
+
+def downgrade():
+    op.drop_table('quiz_stats')
+
+    with op.batch_alter_table('quiz_attempts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_quiz_attempts_quiz_id'))
+
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_questions_quiz_id'))
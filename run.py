@@ -1,4 +1,8 @@
 import os
+import time
+
+import click
+
 from app import create_app, db
 from app.models import User, Category, Product, Banner, Blog, FAQ, Contact
 
@@ -31,6 +35,40 @@ def init_db():
     print("ℹ Để seed dữ liệu mẫu, chạy: python seed/seed_data.py")
 
 
+@app.cli.command('seed-scale')
+@click.option('--categories', default=20, show_default=True, help='Số danh mục')
+@click.option('--products', default=1000, show_default=True, help='Số sản phẩm')
+@click.option('--blogs', default=500, show_default=True, help='Số bài viết')
+@click.option('--media', default=1000, show_default=True, help='Số media')
+@click.option('--projects', default=100, show_default=True, help='Số dự án')
+@click.option('--jobs', default=50, show_default=True, help='Số tin tuyển dụng')
+@click.option('--quizzes', default=50, show_default=True, help='Số đề thi')
+@click.option('--questions', default=10, show_default=True, help='Số câu hỏi / đề thi (4 đáp án / câu)')
+@click.option('--attempts', default=1000, show_default=True, help='Số lượt làm bài (kèm câu trả lời)')
+@click.option('--batch-size', default=1000, show_default=True, help='Số row mỗi lần executemany')
+@click.option('--seed', default=42, show_default=True, help='Seed random')
+def seed_scale_command(categories, products, blogs, media, projects, jobs, quizzes, questions,
+                       attempts, batch_size, seed):
+    """Sinh dữ liệu giả lập số lượng lớn (batch insert) để test hiệu năng"""
+    from app.seed_scale import seed_scale
+
+    print("Đang sinh dữ liệu...")
+    started = time.perf_counter()
+    db.create_all()
+    inserted = seed_scale({
+        'categories': categories,
+        'products': products,
+        'blogs': blogs,
+        'media': media,
+        'projects': projects,
+        'jobs': jobs,
+        'quizzes': quizzes,
+        'questions_per_quiz': questions,
+        'attempts': attempts,
+    }, batch_size=batch_size, seed=seed)
+    print(f"✓ Đã insert {sum(inserted.values()):,} rows trong {time.perf_counter() - started:.1f}s")
+
+
 # 🔥 TỐI ƯU: Chỉ chạy dev server khi chạy trực tiếp
 # Gunicorn sẽ import app object, không chạy phần này
 if __name__ == '__main__':
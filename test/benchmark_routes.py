@@ -0,0 +1,305 @@
+"""
+Benchmark các route public trên database SQLite sinh sẵn (không cần server chạy)
+
+- create_app() với SQLite tạm, seed hàng nghìn sản phẩm / bài viết / media,
+  hàng trăm quiz + lượt làm bài bằng app/seed_scale.py (cố định seed random → cùng dữ liệu)
+- Gọi mọi route GET public qua Flask test client
+- Đo p50 / p95 latency, số query SQL / request, bộ nhớ cấp phát (tracemalloc peak) / request
+- Lưu baseline JSON và so sánh với lần chạy trước
+
+Chạy:
+    python test/benchmark_routes.py
+    python test/benchmark_routes.py --scale 0.2 --iterations 10
+    python test/benchmark_routes.py --save test/benchmark_baseline.json
+    python test/benchmark_routes.py --compare test/benchmark_baseline.json
+    python test/benchmark_routes.py --page-cache   # đo khi bật full-page cache
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event, insert  # noqa: E402
+
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    END = '\033[0m'
+
+
+# Số bản ghi ở scale = 1.0 (sinh bằng app/seed_scale.py - giống flask seed-scale)
+SEED_COUNTS = {
+    'categories': 20,
+    'products': 3000,
+    'blogs': 2000,
+    'media': 3000,
+    'projects': 300,
+    'jobs': 100,
+    'quizzes': 200,
+    'questions_per_quiz': 10,
+    'attempts': 2000,
+}
+
+RANDOM_SEED = 42
+
+# Biến thể query string của các trang danh sách
+EXTRA_URLS = [
+    '/san-pham?page=2',
+    '/san-pham?sort=price_asc',
+    '/san-pham?search=keo',
+    '/tin-tuc?page=5',
+    '/tin-tuc?search=gạch',
+    '/du-an?page=2',
+    '/tim-kiem?q=keo',
+    '/tim-kiem?q=chống thấm',
+    '/api/suggest?q=keo d',
+]
+
+# Route không đo (cần POST / session trước)
+SKIPPED_ENDPOINTS = {'main.quiz_take', 'main.old_search'}
+
+
+# ==================== SEED ====================
+def seed_database(db, scale=1.0):
+    """Sinh dữ liệu (batch INSERT) + vài bảng nhỏ dùng chung, trả về số bản ghi mỗi bảng"""
+    from app.models import FAQ, Banner, Settings
+    from app.seed_scale import seed_scale
+
+    counts = {key: max(1, int(value * scale)) for key, value in SEED_COUNTS.items()}
+    counts['questions_per_quiz'] = SEED_COUNTS['questions_per_quiz']
+    inserted = seed_scale(counts, seed=RANDOM_SEED, echo=None)
+
+    db.session.execute(insert(FAQ), [
+        {'question': f'Câu hỏi thường gặp số {i}?', 'answer': 'Nội dung trả lời.', 'order': i, 'is_active': True}
+        for i in range(1, 51)
+    ])
+    db.session.execute(insert(Banner), [
+        {'title': f'Banner {i}', 'image': f'/static/uploads/seed/anh-{i}.jpg', 'is_active': True, 'order': i}
+        for i in range(1, 4)
+    ])
+    db.session.execute(insert(Settings), [
+        {'key': 'website_name', 'value': 'BRICON', 'group': 'general'},
+        {'key': 'hotline', 'value': '0900000000', 'group': 'contact'},
+    ])
+    db.session.commit()
+    return inserted
+
+
+# ==================== ROUTES ====================
+def collect_urls(app):
+    """Mọi route GET public của blueprint main (+ biến thể query string)"""
+    from flask import url_for
+
+    samples = {
+        'main.products': {'category_slug': 'danh-muc-1'},
+        'main.product_detail': {'slug': 'san-pham-seed-1'},
+        'main.blog_detail': {'slug': 'bai-viet-seed-1'},
+        'main.project_detail': {'slug': 'du-an-seed-1'},
+        'main.job_detail': {'slug': 'tuyen-dung-seed-1'},
+        'main.quiz_start': {'slug': 'de-thi-seed-1'},
+        'main.quiz_result': {'attempt_id': 1},
+    }
+
+    urls, skipped = [], []
+    with app.test_request_context():
+        for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+            if not rule.endpoint.startswith('main.') or 'GET' not in rule.methods:
+                continue
+            if rule.endpoint in SKIPPED_ENDPOINTS:
+                skipped.append(rule.rule)
+                continue
+            if rule.arguments:
+                values = samples.get(rule.endpoint)
+                if values is None or set(values) != set(rule.arguments):
+                    skipped.append(rule.rule)
+                    continue
+                urls.append(url_for(rule.endpoint, **values))
+            else:
+                urls.append(rule.rule)
+    return list(dict.fromkeys(urls + EXTRA_URLS)), skipped
+
+
+# ==================== MEASURE ====================
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def benchmark_url(client, url, query_counter, iterations, warmup):
+    for _ in range(warmup):
+        client.get(url)
+
+    timings, queries, status = [], [], None
+    for _ in range(iterations):
+        query_counter['n'] = 0
+        started = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+        queries.append(query_counter['n'])
+        status = response.status_code
+
+    # Đo cấp phát riêng (tracemalloc làm chậm → không tính vào latency)
+    alloc_peaks = []
+    for _ in range(min(3, iterations)):
+        tracemalloc.start()
+        client.get(url)
+        alloc_peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+
+    return {
+        'status': status,
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+        'max_ms': round(max(timings), 2),
+        'queries': round(statistics.mean(queries), 1),
+        'alloc_peak_kb': round(statistics.median(alloc_peaks), 1),
+    }
+
+
+def build_app(db_path, page_cache):
+    from app import create_app
+    from app.config import Config
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + db_path
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        WTF_CSRF_ENABLED = False
+        PAGE_CACHE_ENABLED = page_cache
+        CONDITIONAL_GET_ENABLED = page_cache
+        SERVER_TIMING_ENABLED = False
+        SLOW_QUERY_MS = 0
+        SLOW_REQUEST_MS = 0
+        VIEW_COUNTER_FLUSH_INTERVAL = 3600  # không flush giữa chừng
+
+    app = create_app(BenchmarkConfig)
+    app.config['SESSION_COOKIE_SECURE'] = False
+    return app
+
+
+# ==================== REPORT ====================
+def print_results(results, baseline=None):
+    header = f"{'URL':<42} {'status':>6} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} {'alloc KB':>9}"
+    if baseline:
+        header += f" {'Δp50':>8} {'Δqueries':>9}"
+    print(header)
+    print('-' * len(header))
+
+    for url, row in results.items():
+        line = (f"{url[:42]:<42} {row['status']:>6} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+                f"{row['queries']:>8} {row['alloc_peak_kb']:>9.1f}")
+        previous = (baseline or {}).get(url)
+        if previous:
+            delta_ms = row['p50_ms'] - previous['p50_ms']
+            delta_pct = delta_ms * 100 / previous['p50_ms'] if previous['p50_ms'] else 0
+            delta_queries = row['queries'] - previous['queries']
+            color = Colors.RED if delta_pct > 10 or delta_queries > 0 else (
+                Colors.GREEN if delta_pct < -10 or delta_queries < 0 else '')
+            line += f" {color}{delta_pct:>+7.0f}% {delta_queries:>+9.1f}{Colors.END if color else ''}"
+        elif baseline is not None:
+            line += f" {Colors.YELLOW}{'mới':>8}{Colors.END}"
+        status_color = Colors.RED if row['status'] >= 500 else ''
+        print(f"{status_color}{line}{Colors.END if status_color else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark route public trên SQLite seed sẵn')
+    parser.add_argument('--scale', type=float, default=1.0, help='Hệ số số lượng bản ghi (mặc định 1.0)')
+    parser.add_argument('--iterations', type=int, default=30, help='Số request đo / URL')
+    parser.add_argument('--warmup', type=int, default=3, help='Số request làm nóng / URL')
+    parser.add_argument('--page-cache', action='store_true', help='Bật full-page cache + conditional GET')
+    parser.add_argument('--save', metavar='PATH', help='Lưu kết quả thành baseline JSON')
+    parser.add_argument('--compare', metavar='PATH', help='So sánh với baseline JSON')
+    args = parser.parse_args()
+
+    os.environ.setdefault('FLASK_ENV', 'development')
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    db_path = os.path.join(workdir, 'benchmark.db')
+
+    print("\n" + "=" * 80)
+    print(f"{Colors.BLUE}⏱️  BENCHMARK PUBLIC ROUTES{Colors.END}")
+    print("=" * 80 + "\n")
+
+    app = None
+    try:
+        app = build_app(db_path, args.page_cache)
+        from app import db
+
+        with app.app_context():
+            started = time.perf_counter()
+            db.create_all()
+            counts = seed_database(db, args.scale)
+            print(f"🌱 Seed xong trong {time.perf_counter() - started:.1f}s: "
+                  f"{counts['products']} sản phẩm, {counts['blogs']} bài viết, {counts['media']} media, "
+                  f"{counts['quizzes']} quiz, {counts['quiz_attempts']} lượt làm bài\n")
+
+            # Chỉ đếm query của thread đang benchmark (bỏ thread nền)
+            query_counter = {'n': 0}
+            main_thread = threading.get_ident()
+
+            @event.listens_for(db.engine, 'before_cursor_execute')
+            def _count_query(*_args, **_kwargs):
+                if threading.get_ident() == main_thread:
+                    query_counter['n'] += 1
+
+        urls, skipped = collect_urls(app)
+        client = app.test_client()
+        results = {}
+        for url in urls:
+            results[url] = benchmark_url(client, url, query_counter, args.iterations, args.warmup)
+
+        baseline = None
+        if args.compare:
+            with open(args.compare, encoding='utf-8') as f:
+                baseline = json.load(f)['results']
+
+        print_results(results, baseline)
+        if skipped:
+            print(f"\n{Colors.YELLOW}⏭️  Bỏ qua: {', '.join(skipped)}{Colors.END}")
+
+        if args.save:
+            with open(args.save, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'created_at': datetime.now().isoformat(timespec='seconds'),
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'scale': args.scale,
+                    'iterations': args.iterations,
+                    'page_cache': args.page_cache,
+                    'counts': counts,
+                    'results': results,
+                }, f, ensure_ascii=False, indent=2)
+            print(f"\n💾 Đã lưu baseline: {Colors.CYAN}{args.save}{Colors.END}")
+
+        errors = [url for url, row in results.items() if row['status'] >= 500]
+        if errors:
+            print(f"\n{Colors.RED}❌ {len(errors)} URL lỗi 500{Colors.END}")
+            sys.exit(1)
+    finally:
+        if app is not None:
+            # Ghi nốt lượt xem đang chờ trước khi xóa DB (tránh flush atexit vào file đã xóa)
+            from app import db
+            from app.models.view_counter import flush_view_counts
+            flush_view_counts(app)
+            with app.app_context():
+                db.engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -59,6 +59,7 @@ ADMIN_ROUTES = [
 
     # Contacts
     ("/admin/contacts", "📧 Liên hệ", "GET"),
+    ("/admin/contacts?page=2&cursor=WyJhZnRlciIsWyJ4IiwieSJdXQ", "🧪 Liên hệ - cursor hỏng", "GET"),
 
     # Media
     ("/admin/media", "🖼️ Thư viện Media", "GET"),
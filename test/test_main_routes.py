@@ -30,11 +30,15 @@ PUBLIC_ROUTES = [
     ("/san-pham?search=test", "🔍 Tìm kiếm sản phẩm"),
     ("/san-pham?sort=price_asc", "📊 Sắp xếp sản phẩm theo giá"),
     ("/san-pham?sort=latest", "🆕 Sản phẩm mới nhất"),
+    # Cursor bị sửa tay (base64 của ["after",["x","y"]]) → bỏ qua, phân trang OFFSET, không 500
+    ("/san-pham?page=2&cursor=WyJhZnRlciIsWyJ4IiwieSJdXQ", "🧪 Cursor hỏng - sản phẩm"),
+    ("/san-pham?sort=price_asc&page=2&cursor=WyJhZnRlciIsWyJ4IiwieSJdXQ", "🧪 Cursor hỏng - sản phẩm theo giá"),
 
     # Blog
     ("/tin-tuc", "📰 Danh sách blog"),
     ("/tin-tuc?search=test", "🔍 Tìm kiếm blog"),
     ("/tin-tuc?page=1", "📄 Phân trang blog"),
+    ("/tin-tuc?page=2&cursor=WyJhZnRlciIsWyJ4IiwieSJdXQ", "🧪 Cursor hỏng - blog"),
 
     # Contact
     ("/lien-he", "📧 Liên hệ"),
@@ -42,6 +46,7 @@ PUBLIC_ROUTES = [
     # Projects
     ("/du-an", "🏗️ Danh sách dự án"),
     ("/du-an?page=1", "📄 Phân trang dự án"),
+    ("/du-an?page=2&cursor=not-a-cursor", "🧪 Cursor hỏng - dự án"),
 
     # Careers
     ("/tuyen-dung", "💼 Tuyển dụng"),